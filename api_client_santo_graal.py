@@ -0,0 +1,121 @@
+"""
+Cliente HTTP para API-Football - Santo Graal Bot EV+
+Sessão única com pool de conexões keep-alive, retry/backoff e timeout uniforme
+"""
+
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config_santo_graal import Config
+from rate_limiter_santo_graal import TokenBucketRateLimiter
+
+
+class APIFootballClient:
+    """
+    Cliente compartilhado por todos os métodos get_* do bot
+
+    - Reutiliza conexões TLS (keep-alive) via requests.Session
+    - Pool de conexões dimensionado por Config.API_POOL_SIZE
+    - Retry com backoff exponencial em 429/5xx (respeita Retry-After),
+      feito em get(): cada tentativa consome um token do bucket
+    - Config.API_TIMEOUT aplicado em todas as requisições
+    - Todas as requisições passam pelo token bucket, corrigido pelos
+      headers x-ratelimit-* de cada resposta
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://v3.football.api-sports.io",
+        rate_limiter: Optional[TokenBucketRateLimiter] = None
+    ):
+        """
+        Inicializa o cliente
+
+        Args:
+            api_key: Chave da API-Football
+            base_url: URL base da API
+            rate_limiter: Limitador compartilhado (default: Config.API_RATE_LIMIT/min)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = Config.API_TIMEOUT
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(Config.API_RATE_LIMIT)
+
+        # No adaptador, só falhas de conexão (a requisição não chegou à API);
+        # retries por status ficam em get() para passar pelo token bucket
+        retry = Retry(
+            total=Config.API_MAX_RETRIES,
+            connect=Config.API_MAX_RETRIES,
+            read=0,
+            status=0,
+            backoff_factor=Config.API_RETRY_BACKOFF,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=Config.API_POOL_SIZE,
+            pool_maxsize=Config.API_POOL_SIZE,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({'x-apisports-key': api_key})
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None, stream: bool = False) -> requests.Response:
+        """
+        Executa GET em um endpoint da API
+
+        Args:
+            endpoint: Caminho do endpoint (ex: '/fixtures')
+            params: Parâmetros da query string
+            stream: Não baixar o corpo antecipadamente (ler via response.raw
+                e fechar a resposta ao final)
+
+        Returns:
+            Resposta HTTP (a última, se todas as tentativas falharem)
+        """
+        for attempt in range(Config.API_MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(
+                f"{self.base_url}{endpoint}",
+                params=params,
+                timeout=self.timeout,
+                stream=stream
+            )
+            if stream:
+                response.raw.decode_content = True  # Descompactar gzip na leitura
+
+            if response.status_code == 429:
+                self.rate_limiter.throttled()
+            self.rate_limiter.update_from_headers(response.headers)
+
+            if response.status_code not in self.RETRY_STATUS_CODES or attempt == Config.API_MAX_RETRIES:
+                return response
+
+            response.close()
+            time.sleep(self._retry_delay(response, attempt))
+
+        return response
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> float:
+        """Espera antes da próxima tentativa: Retry-After ou backoff exponencial"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return Config.API_RETRY_BACKOFF * (2 ** attempt)
+
+    def close(self):
+        """Fecha as conexões do pool"""
+        self.session.close()
@@ -0,0 +1,436 @@
+"""
+Backtest Histórico - Santo Graal Bot EV+
+Reproduz ProbabilityCalculator + EVDetector sobre jogos arquivados
+
+Formato do arquivo (JSONL, opcionalmente .gz): um jogo por linha
+    {
+        "fixture":    jogo de /fixtures (league, teams, score.halftime, score.fulltime),
+        "home_stats": /teams/statistics do mandante antes do jogo,
+        "away_stats": /teams/statistics do visitante antes do jogo,
+        "h2h":        /fixtures/headtohead antes do jogo,
+        "odds":       item de /odds capturado no intervalo
+    }
+
+Uso:
+    python backtest_santo_graal.py arquivos/2023/ --workers 8 --output resultado.json
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config_santo_graal import Config
+from ev_detector_santo_graal import EVDetector
+from odds_santo_graal import OddsBook
+from probability_calculator_santo_graal import ProbabilityCalculator
+from team_features_santo_graal import TeamFeatures
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Leitura dos arquivos
+# ============================================================
+
+def find_archives(paths: List[str]) -> List[str]:
+    """
+    Expande arquivos e diretórios em uma lista ordenada de arquivos JSONL
+
+    Args:
+        paths: Arquivos .jsonl/.jsonl.gz ou diretórios que os contêm
+
+    Returns:
+        Lista de caminhos
+    """
+    archives = []
+    for path in paths:
+        if os.path.isdir(path):
+            archives.extend(glob(os.path.join(path, '**', '*.jsonl'), recursive=True))
+            archives.extend(glob(os.path.join(path, '**', '*.jsonl.gz'), recursive=True))
+        else:
+            archives.append(path)
+    return sorted(set(archives))
+
+
+def iter_records(path: str, shard_index: int = 0, shard_count: int = 1) -> Iterator[Dict]:
+    """
+    Lê um arquivo linha a linha (streaming), decodificando apenas as linhas do shard
+
+    Args:
+        path: Arquivo .jsonl ou .jsonl.gz
+        shard_index: Shard deste worker (0 ≤ shard_index < shard_count)
+        shard_count: Total de shards do arquivo
+
+    Yields:
+        Registros do arquivo
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line_number, line in enumerate(f):
+            if line_number % shard_count != shard_index or not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"⚠️ Linha {line_number + 1} inválida em {path}: {e}")
+
+
+# ============================================================
+# Regras do bot
+# ============================================================
+
+def is_halftime_0x0(fixture: Dict) -> bool:
+    """Jogo terminou o 1º tempo em 0-0 (mesmo critério do bot, pelo placar arquivado)"""
+    halftime = fixture.get('score', {}).get('halftime', {})
+    return halftime.get('home') == 0 and halftime.get('away') == 0
+
+
+def passes_draw_rate(features: TeamFeatures) -> bool:
+    """Taxa de empate ≤ Config.MAX_DRAW_RATE (mesmo critério de check_0x0_draw_rate)"""
+    played = features.played or 0
+    if played == 0:
+        return False
+    return (features.draws / played) * 100 <= Config.MAX_DRAW_RATE
+
+
+def final_score(fixture: Dict) -> Tuple[Optional[int], Optional[int]]:
+    """Placar final do tempo normal (score.fulltime, ou goals se ausente)"""
+    fulltime = fixture.get('score', {}).get('fulltime') or {}
+    if fulltime.get('home') is not None and fulltime.get('away') is not None:
+        return fulltime['home'], fulltime['away']
+    goals = fixture.get('goals', {})
+    return goals.get('home'), goals.get('away')
+
+
+def settle(market: str, home_goals: int, away_goals: int) -> Optional[bool]:
+    """
+    Resultado de uma aposta pelo placar final
+
+    Args:
+        market: Mercado ('Over 1.5', 'Under 2.5', 'BTTS Yes', ...)
+        home_goals: Gols do mandante
+        away_goals: Gols do visitante
+
+    Returns:
+        True (green), False (red) ou None se o mercado não é liquidável
+    """
+    total = home_goals + away_goals
+
+    if market.startswith('Over '):
+        return total > float(market[5:])
+    if market.startswith('Under '):
+        return total < float(market[6:])
+    if market == 'BTTS Yes':
+        return home_goals > 0 and away_goals > 0
+    if market == 'BTTS No':
+        return not (home_goals > 0 and away_goals > 0)
+
+    return None
+
+
+# ============================================================
+# Worker (um processo por shard)
+# ============================================================
+
+def run_shard(task: Tuple[str, int, int, float, List[str]]) -> Dict:
+    """
+    Processa um shard de um arquivo em lotes vetorizados
+
+    Args:
+        task: (caminho, shard_index, shard_count, bankroll, mercados)
+
+    Returns:
+        {'bets': [(timestamp, league_id, market, odds, stake, profit)], 'counts': {...}}
+    """
+    path, shard_index, shard_count, bankroll, markets = task
+
+    calculator = ProbabilityCalculator()
+    detector = EVDetector()
+    detector.bankroll = bankroll
+
+    bets = []
+    counts = {'fixtures': 0, 'ht_0x0': 0, 'analysed': 0}
+    chunk = []
+
+    for record in iter_records(path, shard_index, shard_count):
+        counts['fixtures'] += 1
+        fixture = record.get('fixture') or {}
+
+        if not is_halftime_0x0(fixture):
+            continue
+        counts['ht_0x0'] += 1
+
+        home_stats = TeamFeatures.from_stats(record.get('home_stats') or {})
+        away_stats = TeamFeatures.from_stats(record.get('away_stats') or {})
+        if not (passes_draw_rate(home_stats) and passes_draw_rate(away_stats)):
+            continue
+
+        chunk.append((record, {
+            'home_stats': home_stats,
+            'away_stats': away_stats,
+            'h2h': record.get('h2h') or [],
+            'is_ht_0x0': True,
+        }))
+
+        if len(chunk) >= Config.BACKTEST_CHUNK_SIZE:
+            counts['analysed'] += len(chunk)
+            bets.extend(_evaluate_chunk(chunk, calculator, detector, markets))
+            chunk = []
+
+    if chunk:
+        counts['analysed'] += len(chunk)
+        bets.extend(_evaluate_chunk(chunk, calculator, detector, markets))
+
+    return {'bets': bets, 'counts': counts}
+
+
+def _evaluate_chunk(
+    chunk: List[Tuple[Dict, Dict]],
+    calculator: ProbabilityCalculator,
+    detector: EVDetector,
+    markets: List[str]
+) -> List[Tuple]:
+    """Probabilidades do lote em uma passada vetorizada, depois EV+ e liquidação jogo a jogo"""
+    prob_over_05, prob_over_15 = calculator.calculate_probabilities_batch([match for _, match in chunk])
+    needs_matrix = any(market not in ('Over 0.5', 'Over 1.5') for market in markets)
+
+    bets = []
+    for i, (record, match_data) in enumerate(chunk):
+        fixture = record['fixture']
+        home_goals, away_goals = final_score(fixture)
+        if home_goals is None or away_goals is None:
+            continue
+
+        if needs_matrix:
+            probabilities = calculator.calculate_market_probabilities(match_data)
+        else:
+            probabilities = {'Over 0.5': float(prob_over_05[i]), 'Over 1.5': float(prob_over_15[i])}
+
+        opportunities = detector.detect_book_opportunities(
+            probabilities=probabilities,
+            odds_book=OddsBook.from_payload(record.get('odds'), markets),
+            markets=markets
+        )
+
+        for opp in opportunities:
+            won = settle(opp['market'], home_goals, away_goals)
+            if not opp['is_ev_positive'] or won is None or opp['kelly_stake'] <= 0:
+                continue
+
+            stake = opp['kelly_stake']
+            profit = stake * (opp['odds'] - 1) if won else -stake
+            bets.append((
+                fixture.get('fixture', {}).get('timestamp') or 0,
+                fixture.get('league', {}).get('id'),
+                opp['market'],
+                opp['odds'],
+                stake,
+                profit,
+            ))
+
+    return bets
+
+
+# ============================================================
+# Métricas
+# ============================================================
+
+def summarize(bets: List[Tuple], bankroll: float) -> Dict:
+    """
+    Hit rate, ROI, yield e drawdown
+
+    - Yield: lucro / total apostado
+    - ROI: lucro / banca inicial
+    - Drawdown: maior queda do lucro acumulado (ordem cronológica)
+
+    Args:
+        bets: Tuplas (timestamp, league_id, market, odds, stake, profit)
+        bankroll: Banca de referência
+
+    Returns:
+        Dicionário de métricas
+    """
+    wins = 0
+    staked = 0.0
+    cumulative = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+    odds_sum = 0.0
+
+    for _, _, _, odds, stake, profit in sorted(bets, key=lambda bet: bet[0]):
+        wins += profit > 0
+        staked += stake
+        odds_sum += odds
+        cumulative += profit
+        peak = max(peak, cumulative)
+        max_drawdown = max(max_drawdown, peak - cumulative)
+
+    count = len(bets)
+
+    return {
+        'bets': count,
+        'wins': wins,
+        'hit_rate': wins / count * 100 if count else 0.0,
+        'avg_odds': odds_sum / count if count else 0.0,
+        'staked': staked,
+        'profit': cumulative,
+        'yield': cumulative / staked * 100 if staked else 0.0,
+        'roi': cumulative / bankroll * 100 if bankroll else 0.0,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_percent': max_drawdown / bankroll * 100 if bankroll else 0.0,
+    }
+
+
+def build_report(bets: List[Tuple], bankroll: float) -> Dict:
+    """
+    Métricas por liga × mercado, por mercado e gerais
+
+    Returns:
+        {'overall': {...}, 'by_market': {market: {...}}, 'by_league': {league_id: {market: {...}}}}
+    """
+    by_market: Dict[str, List[Tuple]] = {}
+    by_league: Dict[int, Dict[str, List[Tuple]]] = {}
+
+    for bet in bets:
+        league_id, market = bet[1], bet[2]
+        by_market.setdefault(market, []).append(bet)
+        by_league.setdefault(league_id, {}).setdefault(market, []).append(bet)
+
+    return {
+        'overall': summarize(bets, bankroll),
+        'by_market': {market: summarize(group, bankroll) for market, group in sorted(by_market.items())},
+        'by_league': {
+            league_id: {market: summarize(group, bankroll) for market, group in sorted(markets.items())}
+            for league_id, markets in sorted(by_league.items(), key=lambda item: str(item[0]))
+        },
+    }
+
+
+# ============================================================
+# Execução
+# ============================================================
+
+def run_backtest(
+    paths: List[str],
+    workers: Optional[int] = None,
+    bankroll: float = Config.DEFAULT_BANKROLL,
+    markets: Optional[List[str]] = None
+) -> Dict:
+    """
+    Executa o backtest distribuindo os arquivos em shards por um pool de processos
+
+    Cada arquivo é dividido em shards (linhas intercaladas) para manter
+    todos os processos ocupados mesmo com poucos arquivos grandes.
+
+    Args:
+        paths: Arquivos ou diretórios com o histórico
+        workers: Processos (default: Config.BACKTEST_WORKERS ou nº de CPUs)
+        bankroll: Banca usada no Kelly e nas métricas
+        markets: Mercados avaliados (default: Config.HT_MARKETS)
+
+    Returns:
+        Relatório de build_report com 'counts' e 'elapsed' (segundos)
+    """
+    start = time.perf_counter()
+    archives = find_archives(paths)
+    workers = workers or Config.BACKTEST_WORKERS or os.cpu_count() or 1
+    markets = list(markets or Config.HT_MARKETS)
+
+    shards_per_file = max(1, math.ceil(workers / max(1, len(archives))))
+    tasks = [
+        (path, shard_index, shards_per_file, bankroll, markets)
+        for path in archives
+        for shard_index in range(shards_per_file)
+    ]
+
+    logger.info(f"📂 {len(archives)} arquivos, {len(tasks)} shards, {workers} processos")
+
+    if workers == 1:
+        results = list(map(run_shard, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_shard, tasks))
+
+    bets = []
+    counts = {'fixtures': 0, 'ht_0x0': 0, 'analysed': 0}
+    for result in results:
+        bets.extend(result['bets'])
+        for key, value in result['counts'].items():
+            counts[key] += value
+
+    report = build_report(bets, bankroll)
+    report['counts'] = counts
+    report['elapsed'] = time.perf_counter() - start
+
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Relatório em texto (tabela por liga e mercado)"""
+    header = f"{'Liga':<28} {'Mercado':<10} {'Apostas':>7} {'Hit %':>7} {'Odd méd':>8} {'Lucro':>10} {'Yield %':>8} {'ROI %':>7} {'DD %':>6}"
+
+    def row(name: str, market: str, m: Dict) -> str:
+        return (
+            f"{name:<28} {market:<10} {m['bets']:>7} {m['hit_rate']:>7.1f} {m['avg_odds']:>8.2f} "
+            f"{m['profit']:>10.2f} {m['yield']:>8.1f} {m['roi']:>7.1f} {m['max_drawdown_percent']:>6.1f}"
+        )
+
+    counts = report['counts']
+    lines = [
+        "=" * len(header),
+        "📈 BACKTEST SANTO GRAAL EV+",
+        "=" * len(header),
+        f"Jogos: {counts['fixtures']} | HT 0-0: {counts['ht_0x0']} | "
+        f"Analisados: {counts['analysed']} | Tempo: {report['elapsed']:.1f}s",
+        "",
+        header,
+        "-" * len(header),
+    ]
+
+    for league_id, markets in report['by_league'].items():
+        name = Config.get_league_name(league_id)[:28]
+        for market, metrics in markets.items():
+            lines.append(row(name, market, metrics))
+
+    lines.append("-" * len(header))
+    for market, metrics in report['by_market'].items():
+        lines.append(row('TOTAL', market, metrics))
+    lines.append(row('TOTAL', 'Todos', report['overall']))
+
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Executa o backtest pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Backtest histórico do Santo Graal Bot EV+")
+    parser.add_argument('paths', nargs='+', help="Arquivos .jsonl/.jsonl.gz ou diretórios")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (default: nº de CPUs)")
+    parser.add_argument('--bankroll', type=float, default=Config.DEFAULT_BANKROLL, help="Banca de referência")
+    parser.add_argument('--markets', nargs='+', default=None, help="Mercados (default: Config.HT_MARKETS)")
+    parser.add_argument('--output', default=None, help="Salvar relatório em JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+
+    report = run_backtest(args.paths, args.workers, args.bankroll, args.markets)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Relatório salvo em {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
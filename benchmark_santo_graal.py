@@ -0,0 +1,424 @@
+"""
+Micro-benchmarks dos Caminhos Críticos - Santo Graal Bot EV+
+Mede ops/s e memória por chamada e compara com a baseline versionada
+
+Os payloads seguem a estrutura das respostas gravadas da API-Football
+(/fixtures, /teams/statistics, /fixtures/headtohead, /odds) em três
+tamanhos: small (1 casa de apostas), medium (10) e large (30).
+
+Uso:
+    python benchmark_santo_graal.py                    # compara com a baseline
+    python benchmark_santo_graal.py --update-baseline  # grava nova baseline
+    python benchmark_santo_graal.py --filter odds      # só benchmarks com 'odds' no nome
+
+Ops/s dependem da máquina: a comparação usa o valor relativo a uma carga de
+referência em Python puro, medida em rodadas intercaladas com cada benchmark.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from config_santo_graal import Config
+from ev_detector_santo_graal import EVDetector
+from odds_santo_graal import parse_odds_stream
+from portfolio_santo_graal import allocate_kelly
+from probability_calculator_santo_graal import ProbabilityCalculator
+from santo_graal_bot_ev import SantoGraalBot
+
+
+PAYLOAD_SIZES = {
+    # tamanho: (casas de apostas nas odds, confrontos H2H)
+    'small': (1, 5),
+    'medium': (10, 10),
+    'large': (30, 20),
+}
+
+
+# ============================================================
+# Payloads (estrutura das respostas da API-Football)
+# ============================================================
+
+def build_fixture(rng: random.Random, status: str = 'HT', score: Tuple[int, int] = (0, 0)) -> Dict:
+    """Jogo de /fixtures"""
+    return {
+        'fixture': {
+            'id': rng.randint(1_000_000, 9_999_999),
+            'referee': 'Michael Oliver, England',
+            'timezone': 'UTC',
+            'date': '2024-03-02T15:00:00+00:00',
+            'timestamp': 1709391600,
+            'periods': {'first': 1709391600, 'second': None},
+            'venue': {'id': 556, 'name': 'Old Trafford', 'city': 'Manchester'},
+            'status': {'long': 'Halftime', 'short': status, 'elapsed': 45},
+        },
+        'league': {
+            'id': 39, 'name': 'Premier League', 'country': 'England',
+            'logo': 'https://media.api-sports.io/football/leagues/39.png',
+            'flag': 'https://media.api-sports.io/flags/gb.svg', 'season': 2023, 'round': 'Regular Season - 27',
+        },
+        'teams': {
+            'home': {'id': 33, 'name': 'Manchester United', 'logo': 'https://media.api-sports.io/football/teams/33.png', 'winner': None},
+            'away': {'id': 50, 'name': 'Manchester City', 'logo': 'https://media.api-sports.io/football/teams/50.png', 'winner': None},
+        },
+        'goals': {'home': score[0], 'away': score[1]},
+        'score': {
+            'halftime': {'home': score[0], 'away': score[1]},
+            'fulltime': {'home': None, 'away': None},
+            'extratime': {'home': None, 'away': None},
+            'penalty': {'home': None, 'away': None},
+        },
+    }
+
+
+def build_team_stats(rng: random.Random) -> Dict:
+    """Resposta de /teams/statistics"""
+    def split(total):
+        home = rng.randint(0, total)
+        return {'home': home, 'away': total - home, 'total': total}
+
+    played = rng.randint(20, 38)
+    goals_for = rng.randint(20, 80)
+    goals_against = rng.randint(20, 80)
+    minutes = {
+        f"{start}-{start + 15}": {'total': rng.randint(0, 12), 'percentage': f"{rng.uniform(0, 25):.2f}%"}
+        for start in range(0, 106, 15)
+    }
+
+    return {
+        'league': {'id': 39, 'name': 'Premier League', 'season': 2023, 'rank': rng.randint(1, 20)},
+        'team': {'id': 33, 'name': 'Manchester United'},
+        'form': ''.join(rng.choice('WDL') for _ in range(played)),
+        'fixtures': {
+            'played': split(played),
+            'wins': split(rng.randint(0, played // 2)),
+            'draws': split(rng.randint(0, played // 10)),
+            'loses': split(rng.randint(0, played // 2)),
+        },
+        'goals': {
+            'for': {
+                'total': split(goals_for),
+                'average': {
+                    'home': f"{rng.uniform(0.8, 2.5):.1f}",
+                    'away': f"{rng.uniform(0.6, 2.2):.1f}",
+                    'total': f"{goals_for / played:.1f}",
+                },
+                'minute': minutes,
+            },
+            'against': {
+                'total': split(goals_against),
+                'average': {'home': '1.2', 'away': '1.4', 'total': f"{goals_against / played:.1f}"},
+                'minute': minutes,
+            },
+        },
+        'biggest': {'streak': {'wins': 4, 'draws': 2, 'loses': 3}},
+        'clean_sheet': split(rng.randint(0, 12)),
+        'failed_to_score': split(rng.randint(0, 8)),
+        'lineups': [{'formation': '4-2-3-1', 'played': played}],
+    }
+
+
+def build_h2h(rng: random.Random, size: int) -> List[Dict]:
+    """Resposta de /fixtures/headtohead"""
+    matches = []
+    for _ in range(size):
+        match = build_fixture(rng, status='FT', score=(rng.randint(0, 2), rng.randint(0, 2)))
+        match['score']['fulltime'] = {'home': rng.randint(0, 4), 'away': rng.randint(0, 4)}
+        matches.append(match)
+    return matches
+
+
+def build_odds(rng: random.Random, bookmakers: int) -> Dict:
+    """Item de /odds com várias casas e mercados (Over 0.5/1.5 no meio da lista)"""
+    def price(low, high):
+        return f"{rng.uniform(low, high):.2f}"
+
+    def bets():
+        return [
+            {'id': 1, 'name': 'Match Winner', 'values': [
+                {'value': side, 'odd': price(1.5, 6.0)} for side in ('Home', 'Draw', 'Away')
+            ]},
+            {'id': 12, 'name': 'Double Chance', 'values': [
+                {'value': side, 'odd': price(1.1, 2.5)} for side in ('Home/Draw', 'Home/Away', 'Draw/Away')
+            ]},
+            {'id': 5, 'name': 'Goals Over/Under', 'values': [
+                {'value': f"{side} {line}", 'odd': price(1.05, 4.0)}
+                for line in (0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5)
+                for side in ('Over', 'Under')
+            ]},
+            {'id': 8, 'name': 'Both Teams Score', 'values': [
+                {'value': side, 'odd': price(1.6, 2.3)} for side in ('Yes', 'No')
+            ]},
+            {'id': 10, 'name': 'Exact Score', 'values': [
+                {'value': f"{h}:{a}", 'odd': price(6.0, 80.0)} for h in range(5) for a in range(5)
+            ]},
+        ]
+
+    return {
+        'league': {'id': 39, 'name': 'Premier League', 'season': 2023},
+        'fixture': {'id': 1035000, 'timestamp': 1709391600},
+        'update': '2024-03-02T15:47:05+00:00',
+        'bookmakers': [
+            {'id': 8 + i, 'name': f"Bookmaker {i}", 'bets': bets()}
+            for i in range(bookmakers)
+        ],
+    }
+
+
+def build_payloads(size: str, seed: int = 7) -> Dict:
+    """Conjunto de payloads de um tamanho"""
+    rng = random.Random(seed)
+    bookmakers, h2h = PAYLOAD_SIZES[size]
+    return {
+        'fixture': build_fixture(rng),
+        'match_data': {
+            'home_stats': build_team_stats(rng),
+            'away_stats': build_team_stats(rng),
+            'h2h': build_h2h(rng, h2h),
+            'is_ht_0x0': True,
+        },
+        'odds': build_odds(rng, bookmakers),
+    }
+
+
+# ============================================================
+# Benchmarks
+# ============================================================
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Nome → função sem argumentos a medir"""
+    calculator = ProbabilityCalculator()
+    detector = EVDetector()
+    # Métodos sem estado: evita abrir caches/cliente HTTP no __init__
+    bot = SantoGraalBot.__new__(SantoGraalBot)
+
+    opportunity = detector.detect_ev_opportunities(82.0, 64.0, 1.45, 2.10)[0]
+    negative = dict(opportunity, ev=-0.08, ev_percent=-8.0, is_ev_positive=False)
+
+    benchmarks = {}
+
+    for size in PAYLOAD_SIZES:
+        payloads = build_payloads(size)
+        match_data, fixture, odds = payloads['match_data'], payloads['fixture'], payloads['odds']
+
+        benchmarks[f"calculate_probabilities[{size}]"] = lambda match_data=match_data: (
+            calculator.calculate_probabilities(match_data)
+        )
+        benchmarks[f"extract_market_odds[{size}]"] = lambda odds=odds: bot.extract_market_odds(odds)
+        raw_odds = json.dumps({'response': [odds]}).encode('utf-8')
+        benchmarks[f"parse_odds_stream[{size}]"] = lambda raw_odds=raw_odds: (
+            parse_odds_stream(io.BytesIO(raw_odds), Config.HT_MARKETS)
+        )
+        benchmarks[f"is_halftime_0x0[{size}]"] = lambda fixture=fixture: bot.is_halftime_0x0(fixture)
+
+    fixture = build_payloads('medium')['fixture']
+    benchmarks['detect_ev_opportunities'] = lambda: detector.detect_ev_opportunities(82.0, 64.0, 1.45, 2.10)
+    benchmarks['calculate_kelly_stake'] = lambda: detector.calculate_kelly_stake(82.0, 1.45)
+    rng = random.Random(3)
+    batch_probabilities = [[rng.uniform(50, 95), rng.uniform(30, 80)] for _ in range(1000)]
+    batch_odds = [[rng.uniform(1.05, 1.8), rng.uniform(1.4, 3.5)] for _ in range(1000)]
+    benchmarks['evaluate_batch[1000x2]'] = lambda: detector.evaluate_batch(
+        batch_probabilities, batch_odds, markets=['Over 0.5', 'Over 1.5']
+    )
+    portfolio_probabilities = [rng.uniform(60, 90) for _ in range(50)]
+    portfolio_odds = [100 / p * rng.uniform(0.98, 1.08) for p in portfolio_probabilities]
+    benchmarks['allocate_kelly[50]'] = lambda: allocate_kelly(
+        portfolio_probabilities, portfolio_odds, groups=[i // 2 for i in range(50)]
+    )
+    benchmarks['format_ev_message'] = lambda: detector.format_ev_message(fixture, opportunity)
+    benchmarks['format_ev_negative_message'] = lambda: detector.format_ev_negative_message(fixture, negative)
+
+    return benchmarks
+
+
+def calibrate_loops(function: Callable[[], object], min_time: float) -> int:
+    """Número de chamadas para uma rodada durar cerca de `min_time` segundos"""
+    loops = 1
+    while True:
+        elapsed = time_loops(function, loops) * loops
+        if elapsed >= min_time / 5:
+            break
+        loops *= 4
+
+    return max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+
+def time_loops(function: Callable[[], object], loops: int) -> float:
+    """Segundos por chamada em uma rodada de `loops` chamadas"""
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return (time.perf_counter() - start) / loops
+
+
+def measure_memory(function: Callable[[], object]) -> Tuple[float, int]:
+    """
+    Memória alocada por chamada (tracemalloc)
+
+    Returns:
+        Tuple (pico em KB acima do estado inicial, blocos alocados e ainda vivos após a chamada)
+    """
+    function()  # Aquecimento (caches, imports tardios)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_before = tracemalloc.take_snapshot()
+
+        result = function()
+
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    del result
+    blocks = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename') if stat.count_diff > 0)
+
+    return (peak - before) / 1024, blocks
+
+
+def reference_workload() -> Callable[[], object]:
+    """Carga fixa em Python puro (normaliza entre máquinas e variações de carga)"""
+    values = [random.Random(0).random() for _ in range(256)]
+
+    def workload():
+        total = 0.0
+        for value in values:
+            total += value * value
+        return {'total': total, 'label': f"{total:.3f}"}
+
+    return workload
+
+
+def run_benchmarks(name_filter: str = '', min_time: float = 0.2, repeats: int = 7) -> Dict:
+    """
+    Executa os benchmarks
+
+    Returns:
+        {'reference_ops': float, 'benchmarks': {nome: {'ops_per_sec', 'relative', 'peak_kb', 'blocks'}}}
+    """
+    reference = reference_workload()
+    reference_loops = calibrate_loops(reference, min_time)
+    reference_times = []
+    results = {}
+
+    for name, function in build_benchmarks().items():
+        if name_filter not in name:
+            continue
+
+        # Rodadas intercaladas com a referência: ruído da máquina afeta as duas
+        loops = calibrate_loops(function, min_time)
+        times, ratios = [], []
+        for _ in range(repeats):
+            reference_time = time_loops(reference, reference_loops)
+            elapsed = time_loops(function, loops)
+            reference_times.append(reference_time)
+            times.append(elapsed)
+            ratios.append(reference_time / elapsed)
+
+        peak_kb, blocks = measure_memory(function)
+        results[name] = {
+            'ops_per_sec': 1 / min(times),
+            'relative': statistics.median(ratios),
+            'peak_kb': peak_kb,
+            'blocks': blocks,
+        }
+
+    reference = 1 / min(reference_times) if reference_times else 0.0
+    return {'reference_ops': reference, 'benchmarks': results}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Benchmarks mais lentos que a baseline além do limite
+
+    Args:
+        results: Saída de run_benchmarks
+        baseline: Baseline gravada (mesmo formato)
+        threshold: Queda relativa tolerada (0.25 = 25%)
+
+    Returns:
+        Lista de descrições das regressões
+    """
+    regressions = []
+
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+
+        change = current['relative'] / previous['relative'] - 1
+        if change < -threshold:
+            regressions.append(f"{name}: {change * 100:+.1f}% (limite -{threshold * 100:.0f}%)")
+
+    return regressions
+
+
+def format_results(results: Dict, baseline: Dict) -> str:
+    """Tabela de resultados com variação em relação à baseline"""
+    header = f"{'Benchmark':<42} {'ops/s':>12} {'vs base':>9} {'pico KB':>9} {'blocos':>7}"
+    lines = [header, "-" * len(header)]
+
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        change = f"{(current['relative'] / previous['relative'] - 1) * 100:+.1f}%" if previous else "novo"
+        lines.append(
+            f"{name:<42} {current['ops_per_sec']:>12,.0f} {change:>9} "
+            f"{current['peak_kb']:>9.1f} {current['blocks']:>7}"
+        )
+
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Executa os benchmarks pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do Santo Graal Bot EV+")
+    parser.add_argument('--filter', default='', help="Só benchmarks cujo nome contém o texto")
+    parser.add_argument('--baseline', default=Config.BENCHMARK_BASELINE_FILE, help="Arquivo de baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="Gravar os resultados como nova baseline")
+    parser.add_argument('--threshold', type=float, default=Config.BENCHMARK_REGRESSION_THRESHOLD,
+                        help="Queda de desempenho tolerada (0.25 = 25%%)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Segundos mínimos por rodada")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("⏱️ Executando benchmarks...\n")
+    results = run_benchmarks(args.filter, args.min_time)
+    print(format_results(results, baseline))
+
+    if args.update_baseline:
+        merged = {
+            'reference_ops': results['reference_ops'],
+            'benchmarks': {**baseline.get('benchmarks', {}), **results['benchmarks']},
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline atualizada em {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\n❌ REGRESSÕES DE DESEMPENHO:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+
+    print("\n✅ Nenhuma regressão acima do limite")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
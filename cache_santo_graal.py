@@ -0,0 +1,388 @@
+"""
+Cache persistente para Santo Graal Bot EV+
+Armazena dados da API em SQLite (Config.DB_PATH) para sobreviver a reinícios
+e resultados de cálculos em memória (LRU)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from config_santo_graal import Config
+from team_features_santo_graal import TeamFeatures
+
+
+class TeamStatsCache:
+    """
+    Cache de estatísticas de times por (time, liga, temporada)
+
+    Armazena TeamFeatures (alguns floats) em vez do JSON de vários KB.
+
+    - Camada em memória: leituras repetidas em microssegundos
+    - Camada SQLite: persiste entre reinícios do bot
+    - TTL: entradas expiram após Config.TEAM_STATS_CACHE_TTL segundos
+    - Eviction: mantém no máximo Config.TEAM_STATS_CACHE_MAX_ENTRIES
+      (remove as mais antigas primeiro)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            db_path: Caminho do banco SQLite (default: Config.DB_PATH)
+            ttl: Validade das entradas em segundos
+            max_entries: Máximo de entradas armazenadas
+        """
+        self.ttl = Config.TEAM_STATS_CACHE_TTL if ttl is None else ttl
+        self.max_entries = Config.TEAM_STATS_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+        self._memory: Dict[Tuple[int, int, int], Tuple[float, TeamFeatures]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path or Config.DB_PATH, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS team_features (
+                team_id INTEGER NOT NULL,
+                league_id INTEGER NOT NULL,
+                season INTEGER NOT NULL,
+                features TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (team_id, league_id, season)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, team_id: int, league_id: int, season: int) -> Optional[TeamFeatures]:
+        """
+        Busca estatísticas válidas (não expiradas)
+
+        Args:
+            team_id: ID do time
+            league_id: ID da liga
+            season: Temporada
+
+        Returns:
+            Features do time ou None se ausente/expirado
+        """
+        key = (team_id, league_id, season)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT fetched_at, features FROM team_features "
+                    "WHERE team_id = ? AND league_id = ? AND season = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = (row[0], TeamFeatures.from_tuple(json.loads(row[1])))
+                self._memory[key] = entry
+
+            fetched_at, features = entry
+            if now - fetched_at > self.ttl:
+                self._delete(key)
+                return None
+
+            return features
+
+    def set(self, team_id: int, league_id: int, season: int, features: TeamFeatures):
+        """
+        Armazena estatísticas de um time
+
+        Args:
+            team_id: ID do time
+            league_id: ID da liga
+            season: Temporada
+            features: Features extraídas de /teams/statistics
+        """
+        key = (team_id, league_id, season)
+        now = time.time()
+
+        with self._lock:
+            self._memory[key] = (now, features)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO team_features "
+                "(team_id, league_id, season, features, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(features.to_tuple()), now)
+            )
+            self._conn.commit()
+            self._evict()
+
+    def purge_expired(self) -> int:
+        """
+        Remove todas as entradas expiradas
+
+        Returns:
+            Número de entradas removidas
+        """
+        cutoff = time.time() - self.ttl
+
+        with self._lock:
+            self._memory = {k: v for k, v in self._memory.items() if v[0] >= cutoff}
+            cursor = self._conn.execute("DELETE FROM team_features WHERE fetched_at < ?", (cutoff,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, key: Tuple[int, int, int]):
+        """Remove uma entrada (chamar com lock adquirido)"""
+        self._memory.pop(key, None)
+        self._conn.execute(
+            "DELETE FROM team_features WHERE team_id = ? AND league_id = ? AND season = ?",
+            key
+        )
+        self._conn.commit()
+
+    def _evict(self):
+        """Remove as entradas mais antigas acima do limite (chamar com lock adquirido)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM team_features").fetchone()[0]
+        excess = count - self.max_entries
+
+        if excess <= 0:
+            return
+
+        oldest = self._conn.execute(
+            "SELECT team_id, league_id, season FROM team_features ORDER BY fetched_at LIMIT ?",
+            (excess,)
+        ).fetchall()
+        for key in oldest:
+            self._memory.pop(tuple(key), None)
+        self._conn.executemany(
+            "DELETE FROM team_features WHERE team_id = ? AND league_id = ? AND season = ?",
+            oldest
+        )
+        self._conn.commit()
+
+
+class H2HStore:
+    """
+    Histórico de confrontos diretos em SQLite, por par de times (não ordenado)
+
+    Jogos finalizados nunca mudam, então o histórico é apenas incrementado:
+    cada sincronização com a API insere somente os confrontos finalizados
+    ainda não armazenados. Leituras são servidas do disco/memória.
+    """
+
+    FINISHED_STATUSES = ('FT', 'AET', 'PEN')
+
+    def __init__(self, db_path: Optional[str] = None, sync_interval: Optional[float] = None):
+        """
+        Inicializa o store
+
+        Args:
+            db_path: Caminho do banco SQLite (default: Config.DB_PATH)
+            sync_interval: Segundos entre sincronizações com a API
+        """
+        self.sync_interval = Config.H2H_SYNC_INTERVAL if sync_interval is None else sync_interval
+
+        self._memory: Dict[Tuple[int, int], List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path or Config.DB_PATH, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS h2h_matches (
+                team_a INTEGER NOT NULL,
+                team_b INTEGER NOT NULL,
+                fixture_id INTEGER NOT NULL,
+                timestamp INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (team_a, team_b, fixture_id)
+            );
+            CREATE TABLE IF NOT EXISTS h2h_sync (
+                team_a INTEGER NOT NULL,
+                team_b INTEGER NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (team_a, team_b)
+            );
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def pair_key(team1_id: int, team2_id: int) -> Tuple[int, int]:
+        """Chave do par independente da ordem casa/fora"""
+        return (min(team1_id, team2_id), max(team1_id, team2_id))
+
+    def get(self, team1_id: int, team2_id: int, last_n: int = 10) -> List[Dict]:
+        """
+        Retorna os últimos confrontos armazenados (mais recentes primeiro)
+
+        Args:
+            team1_id: ID do primeiro time
+            team2_id: ID do segundo time
+            last_n: Número máximo de jogos
+
+        Returns:
+            Lista de confrontos no formato da API
+        """
+        key = self.pair_key(team1_id, team2_id)
+
+        with self._lock:
+            matches = self._memory.get(key)
+            if matches is None:
+                rows = self._conn.execute(
+                    "SELECT payload FROM h2h_matches WHERE team_a = ? AND team_b = ? "
+                    "ORDER BY timestamp DESC",
+                    key
+                ).fetchall()
+                matches = [json.loads(row[0]) for row in rows]
+                self._memory[key] = matches
+
+            return matches[:last_n]
+
+    def needs_sync(self, team1_id: int, team2_id: int) -> bool:
+        """
+        Verifica se o par nunca foi sincronizado ou se a sincronização expirou
+
+        Args:
+            team1_id: ID do primeiro time
+            team2_id: ID do segundo time
+
+        Returns:
+            True se é preciso consultar a API
+        """
+        key = self.pair_key(team1_id, team2_id)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM h2h_sync WHERE team_a = ? AND team_b = ?",
+                key
+            ).fetchone()
+
+        return row is None or time.time() - row[0] > self.sync_interval
+
+    def append(self, team1_id: int, team2_id: int, matches: List[Dict]) -> int:
+        """
+        Acrescenta confrontos finalizados ainda não armazenados
+
+        Args:
+            team1_id: ID do primeiro time
+            team2_id: ID do segundo time
+            matches: Confrontos retornados pela API
+
+        Returns:
+            Número de confrontos novos inseridos
+        """
+        key = self.pair_key(team1_id, team2_id)
+        rows = [
+            (
+                *key,
+                match['fixture']['id'],
+                match['fixture'].get('timestamp') or 0,
+                json.dumps(match)
+            )
+            for match in matches
+            if match.get('fixture', {}).get('status', {}).get('short') in self.FINISHED_STATUSES
+        ]
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO h2h_matches "
+                "(team_a, team_b, fixture_id, timestamp, payload) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            inserted = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT OR REPLACE INTO h2h_sync (team_a, team_b, synced_at) VALUES (?, ?, ?)",
+                (*key, time.time())
+            )
+            self._conn.commit()
+
+            if inserted:
+                self._memory.pop(key, None)
+
+        return inserted
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """
+    Cache LRU em memória para resultados de cálculos
+
+    - Limitado a max_entries (descarta o menos usado recentemente)
+    - Contadores de hits/misses para ajuste do tamanho
+    - Thread-safe (jogos processados em paralelo)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Inicializa o cache
+
+        Args:
+            max_entries: Máximo de entradas (default: Config.RESULT_CACHE_MAX_ENTRIES)
+        """
+        self.max_entries = max_entries or Config.RESULT_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """
+        Busca um resultado
+
+        Returns:
+            Valor armazenado ou None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value):
+        """Armazena um resultado (descartando o menos usado se cheio)"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, taxa de acerto (%) e tamanho atual"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total * 100 if total else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def clear(self):
+        """Remove todas as entradas e zera os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -3,6 +3,7 @@ Configurações do Bot Santo Graal com Detecção de Valor EV+
 Versão CORRIGIDA com UEFA Champions League + 23 ligas totais
 """
 
+import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -147,7 +148,16 @@ class Config:
     MIN_ODDS_RANGE = 1.10
     MAX_ODDS_RANGE = 3.00
     ANALYZE_HT_0X0 = True
+    # Mercados avaliados no HT. Over 0.5/1.5 vêm do modelo de 9 indicadores;
+    # os demais ('Over 2.5', 'Under 1.5', 'BTTS Yes', 'Next Goal Home', ...)
+    # da matriz de placar (score_matrix_santo_graal.MARKETS)
     HT_MARKETS = ['Over 0.5', 'Over 1.5']
+    MIN_PROBABILITY_BY_MARKET = {
+        'Over 0.5': MIN_PROBABILITY_OVER_05,
+        'Over 1.5': MIN_PROBABILITY_OVER_15,
+    }
+    MIN_PROBABILITY_DEFAULT = 55.0  # Mercados sem mínimo específico
+    SCORE_MATRIX_MAX_GOALS = 10  # Gols por time no 2º tempo considerados
     
     PROBABILITY_WEIGHTS = {
         'poisson': 0.25,
@@ -164,6 +174,61 @@ class Config:
     HT_0X0_MULTIPLIER_OVER_05 = 1.05
     HT_0X0_MULTIPLIER_OVER_15 = 1.15
     
+    RESULT_CACHE_MAX_ENTRIES = 1024  # Probabilidades pré-jogo por (jogo, conteúdo dos dados)
+    
+    # ===== MODELO IN-PLAY (estatísticas ao vivo do 1º tempo) =====
+    IN_PLAY_ENABLED = True  # Ajustar probabilidades do HT por /fixtures/statistics
+    # Snapshots durante o 1º tempo (sem eles não há ajuste in-play). Custo extra:
+    # 1 /fixtures/statistics por jogo 0-0 a cada IN_PLAY_POLL_INTERVAL, do minuto
+    # IN_PLAY_WINDOW_START_MINUTE à janela de HT (defaults: até 7 por jogo), mais
+    # 1 /fixtures?ids= por FIXTURE_IDS_PER_REQUEST jogos da janela in-play em cada
+    # snapshot (com o agendador; sem ele, reusa a consulta ao vivo).
+    # False: nenhuma requisição extra (e nenhum ajuste in-play)
+    IN_PLAY_POLL_LIVE_STATS = True
+    IN_PLAY_WINDOW_START_MINUTE = 10  # Início do acompanhamento (minutos após o kickoff)
+    IN_PLAY_POLL_INTERVAL = 300  # Segundos entre snapshots
+    IN_PLAY_XG_WEIGHTS = {  # Proxy de xG quando a API não envia expected_goals
+        'Shots on Goal': 0.30,
+        'Shots off Goal': 0.07,
+        'Blocked Shots': 0.05,
+        'Corner Kicks': 0.03,
+    }
+    IN_PLAY_XG_PER_MINUTE = 2.7 / 90  # Ritmo médio de xG (dois times)
+    IN_PLAY_EWMA_MINUTES = 15  # Constante de tempo da média móvel do ritmo
+    IN_PLAY_PRIOR_MINUTES = 30  # Encolhimento do fator com poucos minutos observados
+    IN_PLAY_SENSITIVITY = 0.5
+    IN_PLAY_FACTOR_RANGE = (0.7, 1.4)
+    
+    # ===== ODDS AO VIVO (2º tempo dos jogos HT 0-0) =====
+    LIVE_ODDS_ENABLED = True  # Acompanhar /odds/live e reavaliar quando o preço muda
+    LIVE_ODDS_MARKETS = ['Over 0.5', 'Over 1.5']  # Reescalados pelo tempo restante
+    LIVE_ODDS_POLL_INTERVAL = 30  # Segundos entre consultas enquanto há jogos observados
+    LIVE_ODDS_MIN_CHANGE = 0.01  # Variação mínima de odds que dispara reavaliação
+    LIVE_ODDS_MAX_MINUTE = 80  # Parar de observar a partir deste minuto
+    LIVE_ODDS_WATCH_SECONDS = 75 * 60  # Limite de observação por jogo
+    
+    # ===== BACKTEST =====
+    BACKTEST_WORKERS = None  # Processos (None: nº de CPUs)
+    BACKTEST_CHUNK_SIZE = 2000  # Jogos por lote vetorizado em cada processo
+    
+    # ===== OTIMIZADOR (pesos, multiplicadores de HT e limites) =====
+    CALIBRATION_FILE = os.getenv('CALIBRATION_FILE', '')  # JSON gerado por optimizer_santo_graal.py
+    OPTIMIZER_OBJECTIVE = 'log_loss'  # 'log_loss' ou 'brier'
+    OPTIMIZER_RANDOM_SAMPLES = 20000
+    OPTIMIZER_COORDINATE_ROUNDS = 4
+    OPTIMIZER_MULTIPLIER_RANGE = (0.8, 1.6)
+    OPTIMIZER_CANDIDATES_PER_TASK = 256  # Candidatos avaliados por tarefa do pool
+    OPTIMIZER_MIN_BETS = 50  # Apostas mínimas por mercado ao escolher limites
+    OPTIMIZER_HOLDOUT_FRACTION = 0.3  # Jogos mais recentes fora da calibração (validação)
+    
+    # ===== BENCHMARKS =====
+    BENCHMARK_BASELINE_FILE = 'benchmark_baseline_santo_graal.json'
+    BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Falha se ops/s cair mais de 25%
+    
+    # ===== TABELA DE POISSON =====
+    POISSON_LAMBDA_MAX = 10.0
+    POISSON_LAMBDA_STEP = 0.001
+    
     SEND_START = True
     SEND_HT_0X0 = True
     SEND_EV_OPPORTUNITIES = True
@@ -172,17 +237,51 @@ class Config:
     SEND_ERRORS = True
     
     MINUTES_BEFORE_MATCH = 30
-    CHECK_INTERVAL = 300  # 5 minutos
-    HT_CHECK_INTERVAL = 60
+    PREFETCH_HOURS_AHEAD = 2  # Preparar stats/H2H/probabilidades antes do kickoff
+    CHECK_INTERVAL = 300  # 5 minutos (varredura ao vivo sem o agendador)
+    CALENDAR_REFRESH_INTERVAL = 3600  # Calendário de 24h (/fixtures por liga): horários quase não mudam
+    PRE_KICKOFF_CHECK_MINUTES = 10  # Confirmar horário/status por ID pouco antes do kickoff
+    PRE_KICKOFF_CONFIRM_RETRY = 60  # Segundos até repetir uma confirmação que falhou
+    PRE_KICKOFF_CONFIRM_MAX_TRIES = 3  # Depois disso, manter o horário do calendário
+    HT_CHECK_INTERVAL = 60  # Consulta dos jogos na janela de HT
+    
+    # ===== AGENDADOR DE HT =====
+    USE_HT_SCHEDULER = True  # False: varredura de todas as ligas a cada CHECK_INTERVAL
+    HT_WINDOW_START_MINUTE = 43  # Minutos após o kickoff
+    HT_WINDOW_END_MINUTE = 70  # 45' + acréscimos + 15' de intervalo + margem
+    FIXTURE_IDS_PER_REQUEST = 20  # Limite da API para ids=
+    MAX_ANALYSIS_WORKERS = 8  # Jogos HT 0-0 analisados em paralelo
     
     KELLY_FRACTION = 0.25
     MAX_STAKE_PERCENT = 5.0
     DEFAULT_BANKROLL = 1000.0
     
-    API_RATE_LIMIT = 100
+    # ===== KELLY DE PORTFÓLIO (apostas simultâneas) =====
+    PORTFOLIO_KELLY_ENABLED = True  # Dimensionar em conjunto com as apostas abertas
+    MAX_TOTAL_EXPOSURE_PERCENT = 15.0  # Soma dos stakes abertos (% da banca)
+    PORTFOLIO_KELLY_SCENARIOS = 1000  # Cenários simulados do crescimento log
+    PORTFOLIO_KELLY_MAX_ITERATIONS = 100
+    PORTFOLIO_KELLY_TIME_BUDGET = 0.005  # Segundos: o solver devolve o melhor ponto até aqui
+    PORTFOLIO_OPEN_BET_SECONDS = 60 * 60  # Aposta notificada conta na exposição até o fim do jogo
+    
+    API_RATE_LIMIT = 100  # Requisições por minuto
     API_TIMEOUT = 10
-    BOOKMAKER_ID = 8
+    API_POOL_SIZE = 10  # Conexões keep-alive reutilizadas
+    API_MAX_RETRIES = 3  # Retries em 429/5xx
+    API_RETRY_BACKOFF = 0.5  # Backoff exponencial: 0.5s, 1s, 2s...
+    
+    # ===== BUSCA DE JOGOS AO VIVO =====
+    # 'batch': 1 requisição para todas as ligas (economiza quota)
+    # 'concurrent': ligas em paralelo | 'sequential': uma liga por vez
+    LIVE_FETCH_MODE = 'batch'
+    LIVE_BATCH_BY_LEAGUE_IDS = True  # live=39-140-... em vez de live=all
+    MAX_CONCURRENT_REQUESTS = 8
+    ODDS_BOOKMAKER_IDS = []  # Casas consideradas no livro de odds (vazio = todas; ex: [8] = Bet365)
+    ODDS_STREAM_BUFFER_SIZE = 16 * 1024  # Bytes lidos por vez no parse incremental de /odds (ijson)
     DB_PATH = 'santo_graal_ev.db'
+    TEAM_STATS_CACHE_TTL = 6 * 3600  # 6 horas
+    TEAM_STATS_CACHE_MAX_ENTRIES = 2000
+    H2H_SYNC_INTERVAL = 24 * 3600  # Confrontos finalizados não mudam
     LOG_LEVEL = 'INFO'
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
@@ -199,6 +298,24 @@ class Config:
             raise ValueError(f"Configurações inválidas: {', '.join(errors)}")
         return True
     
+    @classmethod
+    def load_calibration(cls, path: str) -> dict:
+        """Aplica pesos, multiplicadores e limites calibrados (JSON do otimizador)"""
+        with open(path, encoding='utf-8') as f:
+            calibration = json.load(f)
+        
+        for key in ('PROBABILITY_WEIGHTS', 'HT_0X0_MULTIPLIER_OVER_05', 'HT_0X0_MULTIPLIER_OVER_15',
+                    'MIN_PROBABILITY_OVER_05', 'MIN_PROBABILITY_OVER_15', 'MIN_EV_PERCENT'):
+            if key in calibration:
+                setattr(cls, key, calibration[key])
+        
+        cls.MIN_PROBABILITY_BY_MARKET = {
+            **cls.MIN_PROBABILITY_BY_MARKET,
+            'Over 0.5': cls.MIN_PROBABILITY_OVER_05,
+            'Over 1.5': cls.MIN_PROBABILITY_OVER_15,
+        }
+        return calibration
+    
     @classmethod
     def get_league_name(cls, league_id: int) -> str:
         return cls.LEAGUE_NAMES.get(league_id, f"Liga {league_id}")
@@ -4,7 +4,23 @@ Calcula EV, Kelly Criterion e formata notificações
 """
 
 from typing import Dict, List, Optional
+
+import numpy as np
+
 from config_santo_graal import Config
+from odds_santo_graal import OddsBook
+
+
+# Resultado de EVDetector.evaluate_batch (um registro por jogo × mercado)
+EV_BATCH_DTYPE = np.dtype([
+    ('probability', 'f8'),      # %
+    ('odds', 'f8'),
+    ('ev', 'f8'),               # Decimal (0.05 = +5%)
+    ('kelly_fraction', 'f8'),   # Fração da banca (já com KELLY_FRACTION e MAX_STAKE_PERCENT)
+    ('stake', 'f8'),
+    ('eligible', '?'),          # Odds no range e probabilidade mínima atingida
+    ('is_ev_positive', '?'),
+])
 
 
 class EVDetector:
@@ -104,49 +120,161 @@ class EVDetector:
         Returns:
             Lista de oportunidades com detalhes
         """
-        opportunities = []
+        return self.detect_market_opportunities(
+            probabilities={'Over 0.5': prob_over_05, 'Over 1.5': prob_over_15},
+            market_odds={'Over 0.5': over_05_odds, 'Over 1.5': over_15_odds}
+        )
+    
+    def detect_market_opportunities(
+        self,
+        probabilities: Dict[str, float],
+        market_odds: Dict[str, float],
+        markets: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Detecta oportunidades EV+ em qualquer conjunto de mercados
         
-        # Validar odds no range permitido
-        if not (Config.MIN_ODDS_RANGE <= over_05_odds <= Config.MAX_ODDS_RANGE):
-            over_05_odds = None
+        Args:
+            probabilities: Mercado → probabilidade (%)
+            market_odds: Mercado → odds decimal
+            markets: Mercados a avaliar (default: todos com odds)
         
-        if not (Config.MIN_ODDS_RANGE <= over_15_odds <= Config.MAX_ODDS_RANGE):
-            over_15_odds = None
+        Returns:
+            Lista de oportunidades com detalhes
+        """
+        opportunities = []
         
-        # Analisar Over 0.5
-        if over_05_odds and prob_over_05 >= Config.MIN_PROBABILITY_OVER_05:
-            ev_05 = self.calculate_ev(prob_over_05, over_05_odds)
-            stake_05 = self.calculate_kelly_stake(prob_over_05, over_05_odds)
+        for market in markets or list(market_odds):
+            odds = market_odds.get(market)
+            probability = probabilities.get(market)
             
-            opportunities.append({
-                'market': 'Over 0.5',
-                'probability': prob_over_05,
-                'odds': over_05_odds,
-                'ev': ev_05,
-                'ev_percent': ev_05 * 100,
-                'is_ev_positive': ev_05 >= self.min_ev,
-                'kelly_stake': stake_05,
-                'stake_percent': (stake_05 / self.bankroll) * 100
-            })
-        
-        # Analisar Over 1.5
-        if over_15_odds and prob_over_15 >= Config.MIN_PROBABILITY_OVER_15:
-            ev_15 = self.calculate_ev(prob_over_15, over_15_odds)
-            stake_15 = self.calculate_kelly_stake(prob_over_15, over_15_odds)
+            if odds is None or probability is None:
+                continue
+            
+            # Validar odds no range permitido
+            if not (Config.MIN_ODDS_RANGE <= odds <= Config.MAX_ODDS_RANGE):
+                continue
+            
+            min_probability = Config.MIN_PROBABILITY_BY_MARKET.get(market, Config.MIN_PROBABILITY_DEFAULT)
+            if probability < min_probability:
+                continue
+            
+            ev = self.calculate_ev(probability, odds)
+            stake = self.calculate_kelly_stake(probability, odds)
             
             opportunities.append({
-                'market': 'Over 1.5',
-                'probability': prob_over_15,
-                'odds': over_15_odds,
-                'ev': ev_15,
-                'ev_percent': ev_15 * 100,
-                'is_ev_positive': ev_15 >= self.min_ev,
-                'kelly_stake': stake_15,
-                'stake_percent': (stake_15 / self.bankroll) * 100
+                'market': market,
+                'probability': probability,
+                'odds': odds,
+                'ev': ev,
+                'ev_percent': ev * 100,
+                'is_ev_positive': ev >= self.min_ev,
+                'kelly_stake': stake,
+                'stake_percent': (stake / self.bankroll) * 100
             })
         
         return opportunities
     
+    def evaluate_batch(
+        self,
+        probabilities: np.ndarray,
+        odds: np.ndarray,
+        markets: Optional[List[str]] = None,
+        bankroll: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        EV e Kelly de N jogos × M mercados em uma passada vetorizada
+        
+        Mesmos valores de calculate_ev/calculate_kelly_stake e dos filtros de
+        detect_market_opportunities, aplicados como máscaras: registros fora
+        do range de odds, abaixo da probabilidade mínima ou com NaN ficam com
+        eligible=False, kelly_fraction=0 e stake=0.
+        
+        Args:
+            probabilities: Probabilidades em % (N × M, ou broadcast com odds)
+            odds: Odds decimais (N × M; NaN = sem preço)
+            markets: Nome dos M mercados (probabilidade mínima por coluna;
+                default: Config.MIN_PROBABILITY_DEFAULT)
+            bankroll: Banca disponível (default: Config.DEFAULT_BANKROLL)
+        
+        Returns:
+            Array estruturado (EV_BATCH_DTYPE) no formato do broadcast
+        """
+        if bankroll is None:
+            bankroll = self.bankroll
+        
+        probability, odds = np.broadcast_arrays(
+            np.asarray(probabilities, dtype=float), np.asarray(odds, dtype=float)
+        )
+        
+        if markets is None:
+            min_probability = Config.MIN_PROBABILITY_DEFAULT
+        else:
+            min_probability = np.array([
+                Config.MIN_PROBABILITY_BY_MARKET.get(market, Config.MIN_PROBABILITY_DEFAULT)
+                for market in markets
+            ])
+        
+        p = probability / 100
+        b = odds - 1
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ev = p * odds - 1
+            kelly = (b * p - (1 - p)) / b * self.kelly_fraction
+            eligible = (
+                (odds >= Config.MIN_ODDS_RANGE) & (odds <= Config.MAX_ODDS_RANGE)
+                & (probability >= min_probability)
+            )
+        
+        kelly = np.where(eligible, np.clip(kelly, 0, self.max_stake), 0.0)
+        
+        result = np.empty(probability.shape, dtype=EV_BATCH_DTYPE)
+        result['probability'] = probability
+        result['odds'] = odds
+        result['ev'] = ev
+        result['kelly_fraction'] = kelly
+        result['stake'] = bankroll * kelly
+        result['eligible'] = eligible
+        result['is_ev_positive'] = eligible & (ev >= self.min_ev)
+        
+        return result
+    
+    def detect_book_opportunities(
+        self,
+        probabilities: Dict[str, float],
+        odds_book: OddsBook,
+        markets: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Detecta oportunidades EV+ usando o melhor preço entre todas as casas
+        
+        Preços acima de Config.MAX_ODDS_RANGE são ignorados, para que uma
+        casa fora do range não esconda o melhor preço válido.
+        
+        Args:
+            probabilities: Mercado → probabilidade (%)
+            odds_book: Livro de odds do jogo
+            markets: Mercados a avaliar (default: todos do livro)
+        
+        Returns:
+            Lista de oportunidades, com 'bookmaker' e 'bookmaker_id' do melhor preço
+        """
+        best = {
+            market: odds_book.best(market, max_odds=Config.MAX_ODDS_RANGE)
+            for market in markets or odds_book.markets()
+        }
+        
+        opportunities = self.detect_market_opportunities(
+            probabilities=probabilities,
+            market_odds={market: price[0] for market, price in best.items() if price},
+            markets=list(best)
+        )
+        
+        for opportunity in opportunities:
+            _, opportunity['bookmaker_id'], opportunity['bookmaker'] = best[opportunity['market']]
+        
+        return opportunities
+    
     def format_ev_message(self, fixture: Dict, opportunity: Dict) -> str:
         """
         Formata mensagem Telegram para oportunidade EV+
@@ -168,6 +296,7 @@ class EVDetector:
         ev_percent = opportunity['ev_percent']
         stake = opportunity['kelly_stake']
         stake_percent = opportunity['stake_percent']
+        bookmaker = opportunity.get('bookmaker')
         
         # Escapar caracteres especiais para MarkdownV2
         def escape_md(text):
@@ -179,6 +308,7 @@ class EVDetector:
         home_escaped = escape_md(home_team)
         away_escaped = escape_md(away_team)
         league_escaped = escape_md(league)
+        bookmaker_escaped = f" \\({escape_md(bookmaker)}\\)" if bookmaker else ""
         
         message = (
             f"🚨 *OPORTUNIDADE EV\\+* 🚨\n\n"
@@ -188,7 +318,7 @@ class EVDetector:
             f"━━━━━━━━━━━━━━━━━━━━\n"
             f"💰 *Mercado:* {escape_md(market)}\n"
             f"📈 *Probabilidade:* {probability:.1f}%\n"
-            f"💵 *Odds:* {odds:.2f}\n"
+            f"💵 *Odds:* {odds:.2f}{bookmaker_escaped}\n"
             f"⚡ *Expected Value:* \\+{ev_percent:.1f}%\n"
             f"━━━━━━━━━━━━━━━━━━━━\n\n"
             f"🎯 *RECOMENDAÇÃO KELLY:*\n"
@@ -0,0 +1,225 @@
+"""
+Modelo In-Play Incremental - Santo Graal Bot EV+
+Ajusta os gols esperados do 2º tempo pelas estatísticas ao vivo do 1º tempo
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config_santo_graal import Config
+from poisson_santo_graal import POISSON_TABLE
+
+
+class InPlayState:
+    """
+    Estado in-play de um jogo, atualizado a cada snapshot de /fixtures/statistics
+
+    Guarda apenas os totais acumulados do último snapshot e uma média móvel
+    exponencial (EWMA) do ritmo de xG por minuto. Cada atualização usa só a
+    diferença para o snapshot anterior: O(1), sem reprocessar o histórico.
+
+    xG por time: 'expected_goals' da API quando disponível; senão um proxy
+    ponderado por Config.IN_PLAY_XG_WEIGHTS (finalizações, escanteios...).
+    """
+
+    __slots__ = ('fixture_id', 'minute', 'home_xg', 'away_xg', 'rate', 'snapshots')
+
+    def __init__(self, fixture_id: int):
+        self.fixture_id = fixture_id
+        self.minute: Optional[float] = None
+        self.home_xg = 0.0
+        self.away_xg = 0.0
+        self.rate = 0.0  # xG (dois times) por minuto, EWMA
+        self.snapshots = 0
+
+    def update(self, statistics: List[Dict], minute: Optional[float], home_team_id: Optional[int] = None) -> bool:
+        """
+        Incorpora um novo snapshot
+
+        Args:
+            statistics: Resposta de /fixtures/statistics (uma entrada por time)
+            minute: Minuto do jogo (status.elapsed)
+            home_team_id: ID do mandante (default: primeira entrada)
+
+        Returns:
+            True se o estado mudou
+        """
+        if not minute or minute <= 0:
+            return False
+
+        totals = team_xg(statistics, home_team_id)
+        if totals is None:
+            return False
+
+        home_xg, away_xg = totals
+        total = home_xg + away_xg
+
+        if self.minute is None:
+            self.rate = total / minute
+            self.minute = minute
+        else:
+            if (home_xg, away_xg) == (self.home_xg, self.away_xg) and minute <= self.minute:
+                return False  # Consulta repetida (ex: várias no intervalo)
+
+            # Totais corrigidos no mesmo minuto contam como 1 minuto de jogo
+            elapsed = max(minute - self.minute, 1.0)
+            instant = max(0.0, total - self.home_xg - self.away_xg) / elapsed
+            alpha = 1 - math.exp(-elapsed / Config.IN_PLAY_EWMA_MINUTES)
+            self.rate += alpha * (instant - self.rate)
+            self.minute = max(self.minute, minute)
+
+        self.home_xg, self.away_xg = home_xg, away_xg
+        self.snapshots += 1
+        return True
+
+    def expected_goals_factor(self) -> float:
+        """
+        Multiplicador dos gols esperados do 2º tempo
+
+        Ritmo observado / ritmo médio (Config.IN_PLAY_XG_PER_MINUTE), encolhido
+        em direção a 1 enquanto há poucos minutos observados.
+
+        Returns:
+            Fator limitado a Config.IN_PLAY_FACTOR_RANGE (1.0 sem dados)
+        """
+        if self.minute is None:
+            return 1.0
+
+        weight = self.minute / (self.minute + Config.IN_PLAY_PRIOR_MINUTES)
+        ratio = self.rate / Config.IN_PLAY_XG_PER_MINUTE
+        factor = 1 + weight * Config.IN_PLAY_SENSITIVITY * (ratio - 1)
+
+        low, high = Config.IN_PLAY_FACTOR_RANGE
+        return max(low, min(high, factor))
+
+    def adjust(self, prob_over_05: float, prob_over_15: float) -> Tuple[float, float]:
+        """
+        Aplica o fator às probabilidades do 2º tempo
+
+        Args:
+            prob_over_05: Probabilidade Over 0.5 (%)
+            prob_over_15: Probabilidade Over 1.5 (%)
+
+        Returns:
+            Tuple (prob_over_05, prob_over_15) ajustadas (0-100)
+        """
+        return scale_goal_probabilities(prob_over_05, prob_over_15, self.expected_goals_factor())
+
+
+class InPlayTracker:
+    """Estados in-play por fixture_id (thread-safe)"""
+
+    def __init__(self):
+        """Inicializa o tracker"""
+        self._states: Dict[int, InPlayState] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        fixture_id: int,
+        statistics: Optional[List[Dict]],
+        minute: Optional[float],
+        home_team_id: Optional[int] = None
+    ) -> InPlayState:
+        """
+        Incorpora um snapshot ao estado do jogo (criando-o se necessário)
+
+        Returns:
+            Estado atualizado
+        """
+        with self._lock:
+            state = self._states.get(fixture_id)
+            if state is None:
+                state = self._states[fixture_id] = InPlayState(fixture_id)
+            if statistics:
+                state.update(statistics, minute, home_team_id)
+            return state
+
+    def get(self, fixture_id: int) -> Optional[InPlayState]:
+        """Estado do jogo, se existir"""
+        with self._lock:
+            return self._states.get(fixture_id)
+
+    def remove(self, fixture_id: int):
+        """Descarta o estado (jogo saiu da lista ao vivo)"""
+        with self._lock:
+            self._states.pop(fixture_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+
+def scale_goal_probabilities(prob_over_05: float, prob_over_15: float, factor: float) -> Tuple[float, float]:
+    """
+    Multiplica os gols esperados implícitos nas probabilidades por um fator
+
+    λ implícito no Over 0.5 é multiplicado pelo fator; Over 1.5 varia na
+    mesma proporção que a cauda de Poisson P(X > 1) entre os dois λ.
+
+    Args:
+        prob_over_05: Probabilidade Over 0.5 (%)
+        prob_over_15: Probabilidade Over 1.5 (%)
+        factor: Multiplicador de λ (ex: ritmo in-play, fração do tempo restante)
+
+    Returns:
+        Tuple (prob_over_05, prob_over_15) ajustadas (0-100)
+    """
+    if factor == 1.0:
+        return prob_over_05, prob_over_15
+
+    expected_goals = -math.log(1 - min(max(prob_over_05 / 100, 0.0), 0.9999))
+    adjusted_goals = expected_goals * factor
+
+    adjusted_05 = (1 - math.exp(-adjusted_goals)) * 100
+
+    base_tail = POISSON_TABLE.over_scalar(expected_goals)[1]
+    adjusted_15 = prob_over_15
+    if base_tail > 0:
+        adjusted_15 = prob_over_15 * POISSON_TABLE.over_scalar(adjusted_goals)[1] / base_tail
+
+    return max(0, min(100, adjusted_05)), max(0, min(100, adjusted_15))
+
+
+def team_xg(statistics: List[Dict], home_team_id: Optional[int] = None) -> Optional[Tuple[float, float]]:
+    """
+    xG acumulado (mandante, visitante) de um snapshot
+
+    Args:
+        statistics: Resposta de /fixtures/statistics
+        home_team_id: ID do mandante (default: primeira entrada)
+
+    Returns:
+        Tuple (home_xg, away_xg) ou None se o snapshot não tem os dois times
+    """
+    if not statistics or len(statistics) < 2:
+        return None
+
+    if home_team_id is not None and statistics[1].get('team', {}).get('id') == home_team_id:
+        statistics = [statistics[1], statistics[0]]
+
+    values = []
+    for entry in statistics[:2]:
+        stats = {item.get('type'): _to_number(item.get('value')) for item in entry.get('statistics', [])}
+
+        expected_goals = stats.get('expected_goals')
+        if expected_goals is not None:
+            values.append(expected_goals)
+        else:
+            values.append(sum(
+                (stats.get(name) or 0.0) * weight
+                for name, weight in Config.IN_PLAY_XG_WEIGHTS.items()
+            ))
+
+    return values[0], values[1]
+
+
+def _to_number(value) -> Optional[float]:
+    """Converte valores da API (3, '55%', '1.23', None)"""
+    if value is None:
+        return None
+    try:
+        return float(str(value).rstrip('%'))
+    except ValueError:
+        return None
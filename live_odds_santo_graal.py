@@ -0,0 +1,272 @@
+"""
+Monitor de Odds Ao Vivo - Santo Graal Bot EV+
+Livro de preços por jogo observado, reavaliado só quando um preço relevante muda
+"""
+
+import json
+import threading
+import time
+from typing import BinaryIO, Dict, Iterable, List, Optional
+
+from config_santo_graal import Config
+from in_play_santo_graal import scale_goal_probabilities
+
+try:
+    import ijson  # Parse incremental (opcional)
+except ImportError:
+    ijson = None
+
+
+# Nome da aposta em /odds/live → prefixo do mercado
+# (valor 'Over' com handicap '1.5' → 'Over 1.5', 'Yes' → 'BTTS Yes')
+LIVE_BET_MARKET_PREFIXES = {
+    'Over/Under Line': '',
+    'Match Goals': '',
+    'Both Teams To Score': 'BTTS ',
+}
+
+
+def live_market_odds(item: Dict, markets: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Extrai mercado → odds de um item de /odds/live
+
+    Valores suspensos e jogos com apostas bloqueadas são ignorados; o mesmo
+    mercado em mais de uma aposta fica com o maior preço.
+
+    Args:
+        item: Item de /odds/live
+        markets: Mercados mantidos (default: todos os suportados)
+
+    Returns:
+        Dicionário mercado → odds
+    """
+    if item.get('status', {}).get('blocked'):
+        return {}
+
+    wanted = set(markets) if markets is not None else None
+    prices = {}
+
+    for bet in item.get('odds', []):
+        prefix = LIVE_BET_MARKET_PREFIXES.get(bet.get('name'))
+        if prefix is None:
+            continue
+
+        for value in bet.get('values', []):
+            if value.get('suspended'):
+                continue
+
+            handicap = value.get('handicap')
+            market = prefix + (f"{value['value']} {handicap}" if handicap else str(value['value']))
+            if wanted is not None and market not in wanted:
+                continue
+
+            try:
+                odds = float(value['odd'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if odds > prices.get(market, 0.0):
+                prices[market] = odds
+
+    return prices
+
+
+def parse_live_odds_stream(stream: BinaryIO, fixture_ids: Iterable[int]) -> List[Dict]:
+    """
+    Lê uma resposta de /odds/live mantendo apenas os jogos informados
+
+    Com ijson instalado cada item é descartado assim que lido se o jogo não
+    é observado; dos mantidos ficam só as apostas de LIVE_BET_MARKET_PREFIXES.
+    Sem ijson, a resposta é carregada inteira e filtrada (mesmo resultado).
+
+    Args:
+        stream: Arquivo binário com o JSON (ex: response.raw)
+        fixture_ids: IDs dos jogos observados
+
+    Returns:
+        Itens de /odds/live dos jogos pedidos
+    """
+    if ijson is None:
+        items = json.load(stream).get('response') or []
+    else:
+        items = ijson.items(stream, 'response.item', buf_size=Config.ODDS_STREAM_BUFFER_SIZE, use_float=True)
+
+    wanted = set(fixture_ids)
+    kept = []
+    for item in items:
+        if item.get('fixture', {}).get('id') not in wanted:
+            continue
+        item['odds'] = [bet for bet in item.get('odds', []) if bet.get('name') in LIVE_BET_MARKET_PREFIXES]
+        kept.append(item)
+
+    return kept
+
+
+class WatchedFixture:
+    """Jogo observado: probabilidades do HT e últimos preços vistos"""
+
+    __slots__ = ('fixture', 'probabilities', 'markets', 'prices', 'expires_at')
+
+    def __init__(self, fixture: Dict, probabilities: Dict[str, float], markets: List[str], expires_at: float):
+        self.fixture = fixture
+        self.probabilities = probabilities
+        self.markets = markets
+        self.prices: Dict[str, float] = {}
+        self.expires_at = expires_at
+
+    def probabilities_at(self, elapsed: Optional[float]) -> Dict[str, float]:
+        """
+        Probabilidades do HT reescaladas pelo tempo restante do 2º tempo
+
+        Com o jogo ainda 0-0, os gols esperados do 2º tempo caem na proporção
+        dos minutos que faltam (90 - elapsed) / 45.
+
+        Args:
+            elapsed: Minuto do jogo (None/≤ 45: probabilidades do intervalo)
+
+        Returns:
+            Dicionário mercado → probabilidade (%)
+        """
+        remaining = 1.0
+        if elapsed and elapsed > 45:
+            remaining = max(0.0, min(1.0, (90 - elapsed) / 45))
+
+        prob_over_05, prob_over_15 = scale_goal_probabilities(
+            self.probabilities['Over 0.5'], self.probabilities['Over 1.5'], remaining
+        )
+        return {**self.probabilities, 'Over 0.5': prob_over_05, 'Over 1.5': prob_over_15}
+
+
+class LiveOddsWatcher:
+    """
+    Jogos HT 0-0 acompanhados pelo 2º tempo via /odds/live (thread-safe)
+
+    update() compara cada consulta com os últimos preços de cada jogo e
+    devolve apenas os jogos em que algum mercado observado mudou pelo menos
+    Config.LIVE_ODDS_MIN_CHANGE: só esses são reavaliados pelo EVDetector.
+
+    Um jogo deixa de ser observado ao sair do 0-0, ao terminar, após
+    Config.LIVE_ODDS_MAX_MINUTE ou Config.LIVE_ODDS_WATCH_SECONDS.
+    """
+
+    def __init__(self):
+        """Inicializa o monitor"""
+        self._watched: Dict[int, WatchedFixture] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, fixture: Dict, probabilities: Dict[str, float]) -> bool:
+        """
+        Passa a observar um jogo
+
+        Args:
+            fixture: Dados do jogo (no HT)
+            probabilities: Probabilidades calculadas no HT (precisa de Over 0.5 e Over 1.5)
+
+        Returns:
+            True se há mercados a observar
+        """
+        markets = [market for market in Config.LIVE_ODDS_MARKETS if market in probabilities]
+        if not markets or 'Over 0.5' not in probabilities or 'Over 1.5' not in probabilities:
+            return False
+
+        watched = WatchedFixture(
+            fixture, dict(probabilities), markets, time.time() + Config.LIVE_ODDS_WATCH_SECONDS
+        )
+        with self._lock:
+            self._watched[fixture['fixture']['id']] = watched
+        return True
+
+    def unwatch(self, fixture_id: int):
+        """Deixa de observar um jogo"""
+        with self._lock:
+            self._watched.pop(fixture_id, None)
+
+    def fixture_ids(self) -> List[int]:
+        """IDs dos jogos observados"""
+        with self._lock:
+            return list(self._watched)
+
+    def queries(self) -> List[Dict]:
+        """
+        Parâmetros de /odds/live que cobrem os jogos observados
+
+        O filtro fica no servidor: fixture=ID para o único jogo observado de
+        uma liga, league=ID (uma consulta) para vários jogos da mesma liga.
+        O parâmetro bet aceita uma única aposta e as linhas de gols vêm em
+        duas (Over/Under Line e Match Goals), por isso não é usado.
+
+        Returns:
+            Lista de dicionários de parâmetros
+        """
+        by_league: Dict[Optional[int], List[int]] = {}
+        with self._lock:
+            for fixture_id, watched in self._watched.items():
+                league_id = (watched.fixture.get('league') or {}).get('id')
+                by_league.setdefault(league_id, []).append(fixture_id)
+
+        queries = []
+        for league_id, fixture_ids in by_league.items():
+            if league_id is None or len(fixture_ids) == 1:
+                queries.extend({'fixture': fixture_id} for fixture_id in fixture_ids)
+            else:
+                queries.append({'league': league_id})
+        return queries
+
+    def update(self, items: List[Dict]) -> List[Dict]:
+        """
+        Registra uma consulta de /odds/live
+
+        Args:
+            items: Itens de /odds/live (jogos não observados são ignorados)
+
+        Returns:
+            Um dicionário por jogo com preço relevante alterado:
+            {'fixture_id', 'fixture', 'elapsed', 'probabilities', 'prices', 'changed'}
+        """
+        changes = []
+        now = time.time()
+
+        with self._lock:
+            for fixture_id in [fid for fid, watched in self._watched.items() if now >= watched.expires_at]:
+                del self._watched[fixture_id]
+
+            for item in items:
+                fixture_id = item.get('fixture', {}).get('id')
+                watched = self._watched.get(fixture_id)
+                if watched is None:
+                    continue
+
+                elapsed = item['fixture'].get('status', {}).get('elapsed')
+                teams = item.get('teams', {})
+                goals = (teams.get('home', {}).get('goals'), teams.get('away', {}).get('goals'))
+
+                if (
+                    item.get('status', {}).get('finished')
+                    or any(goals)
+                    or (elapsed or 0) >= Config.LIVE_ODDS_MAX_MINUTE
+                ):
+                    del self._watched[fixture_id]
+                    continue
+
+                prices = live_market_odds(item, watched.markets)
+                changed = [
+                    market for market, odds in prices.items()
+                    if abs(odds - watched.prices.get(market, 0.0)) >= Config.LIVE_ODDS_MIN_CHANGE
+                ]
+                if not changed:
+                    continue
+
+                watched.prices.update(prices)
+                changes.append({
+                    'fixture_id': fixture_id,
+                    'fixture': watched.fixture,
+                    'elapsed': elapsed,
+                    'probabilities': watched.probabilities_at(elapsed),
+                    'prices': dict(watched.prices),
+                    'changed': changed,
+                })
+
+        return changes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._watched)
@@ -0,0 +1,113 @@
+"""
+Detector de Mudanças em Jogos ao Vivo - Santo Graal Bot EV+
+Compara cada consulta com a anterior e emite apenas os eventos (deltas)
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+
+class LiveSnapshotTracker:
+    """
+    Mantém o último snapshot dos jogos ao vivo indexado por fixture_id
+
+    A cada atualização emite apenas os eventos ocorridos:
+    - 'new': jogo apareceu pela primeira vez
+    - 'status_change': mudança de status (ex: 1H → HT)
+    - 'score_change': gol marcado/anulado
+    - 'removed': jogo não aparece mais na consulta
+
+    Cada evento é um dicionário:
+        {'type', 'fixture_id', 'fixture', 'status', 'previous_status',
+         'score', 'previous_score'}
+    """
+
+    def __init__(self):
+        """Inicializa o tracker"""
+        self._snapshot: Dict[int, Tuple[str, Tuple]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, fixtures: List[Dict]) -> List[Dict]:
+        """
+        Registra uma nova consulta e retorna os eventos desde a anterior
+
+        Só registrar consultas bem-sucedidas: uma lista vazia por erro da API
+        geraria 'removed' para todos os jogos.
+
+        Args:
+            fixtures: Jogos retornados pela consulta atual
+
+        Returns:
+            Lista de eventos (vazia se nada mudou)
+        """
+        events = []
+        current = {}
+
+        for fixture in fixtures:
+            fixture_id = fixture['fixture']['id']
+            status = fixture['fixture'].get('status', {}).get('short', '')
+            goals = fixture.get('goals', {})
+            score = (goals.get('home'), goals.get('away'))
+            current[fixture_id] = (status, score)
+
+        with self._lock:
+            previous = self._snapshot
+
+            for fixture in fixtures:
+                fixture_id = fixture['fixture']['id']
+                status, score = current[fixture_id]
+                before = previous.get(fixture_id)
+
+                if before is None:
+                    events.append(self._event('new', fixture_id, fixture, status, None, score, None))
+                    continue
+
+                previous_status, previous_score = before
+                if status != previous_status:
+                    events.append(self._event(
+                        'status_change', fixture_id, fixture, status, previous_status, score, previous_score
+                    ))
+                if score != previous_score:
+                    events.append(self._event(
+                        'score_change', fixture_id, fixture, status, previous_status, score, previous_score
+                    ))
+
+            for fixture_id, (previous_status, previous_score) in previous.items():
+                if fixture_id not in current:
+                    events.append(self._event(
+                        'removed', fixture_id, None, None, previous_status, None, previous_score
+                    ))
+
+            self._snapshot = current
+
+        return events
+
+    @staticmethod
+    def entered_status(events: List[Dict], status: str) -> List[Dict]:
+        """
+        Jogos que acabaram de entrar em um status (novos ou por transição)
+
+        Args:
+            events: Eventos retornados por update
+            status: Status curto da API (ex: 'HT')
+
+        Returns:
+            Lista de fixtures
+        """
+        return [
+            event['fixture'] for event in events
+            if event['type'] in ('new', 'status_change') and event['status'] == status
+        ]
+
+    @staticmethod
+    def _event(event_type, fixture_id, fixture, status, previous_status, score, previous_score) -> Dict:
+        """Monta um evento"""
+        return {
+            'type': event_type,
+            'fixture_id': fixture_id,
+            'fixture': fixture,
+            'status': status,
+            'previous_status': previous_status,
+            'score': score,
+            'previous_score': previous_score,
+        }
@@ -0,0 +1,327 @@
+"""
+Livro de Odds - Santo Graal Bot EV+
+Indexa o payload de /odds por (mercado, linha) com os preços de todas as casas
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from config_santo_graal import Config
+
+try:
+    import ijson  # Parse incremental (opcional)
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Nome da aposta na API → prefixo do mercado (valor 'Over 2.5' → 'Over 2.5', 'Yes' → 'BTTS Yes')
+# 'Team To Score First' precifica o próximo gol da ScoreMatrix: no HT 0-0 o
+# primeiro gol do jogo é o próximo gol
+BET_MARKET_PREFIXES = {
+    'Goals Over/Under': '',
+    'Both Teams Score': 'BTTS ',
+    'Team To Score First': 'Next Goal ',
+}
+
+# Valores renomeados por aposta ('Draw' = nenhum gol → 'Next Goal None')
+BET_VALUE_NAMES = {
+    'Team To Score First': {'Draw': 'None'},
+}
+
+# Preço de uma casa: (odds, bookmaker_id, nome da casa)
+Price = Tuple[float, int, str]
+
+
+@lru_cache(maxsize=256)
+def market_key(market: str) -> Tuple[str, Optional[float]]:
+    """
+    Converte o nome do mercado em (mercado, linha)
+
+    'Over 2.5' → ('Over', 2.5) | 'BTTS Yes' → ('BTTS Yes', None)
+    """
+    name, _, line = market.rpartition(' ')
+    try:
+        return name, float(line)
+    except ValueError:
+        return market, None
+
+
+def bet_market(bet_name: str, prefix: str, value) -> str:
+    """Mercado de um valor de aposta ('Team To Score First', 'Draw' → 'Next Goal None')"""
+    value = str(value)
+    return prefix + BET_VALUE_NAMES.get(bet_name, {}).get(value, value)
+
+
+def market_name(key: Tuple[str, Optional[float]]) -> str:
+    """Inverso de market_key"""
+    name, line = key
+    return name if line is None else f"{name} {line}"
+
+
+class OddsBook:
+    """
+    Odds de um jogo em todas as casas, montado uma vez por payload
+
+    - Índice (mercado, linha) → preços ordenados do maior para o menor,
+      no máximo um por casa
+    - best(): melhor preço disponível em O(1)
+    - Casas consideradas: Config.ODDS_BOOKMAKER_IDS (vazio = todas)
+    """
+
+    def __init__(self):
+        """Inicializa um livro vazio"""
+        self._index: Dict[Tuple[str, Optional[float]], List[Price]] = {}
+
+    @classmethod
+    def from_payload(cls, odds_data: Optional[Dict], markets: Optional[Iterable[str]] = None) -> 'OddsBook':
+        """
+        Monta o livro a partir de um item de /odds
+
+        Args:
+            odds_data: Dados de odds da API (ou None)
+            markets: Indexar apenas estes mercados (default: todos os suportados)
+
+        Returns:
+            OddsBook (vazio se o payload é inválido)
+        """
+        book = cls()
+
+        if not odds_data or 'bookmakers' not in odds_data:
+            return book
+
+        allowed = set(Config.ODDS_BOOKMAKER_IDS)
+        wanted = set(markets) if markets is not None else None
+        index = book._index
+
+        try:
+            for bookmaker in odds_data['bookmakers']:
+                if 'bets' not in bookmaker or (allowed and bookmaker.get('id') not in allowed):
+                    continue
+
+                bookmaker_id = bookmaker.get('id')
+                bookmaker_name = bookmaker.get('name', '')
+
+                for bet in bookmaker['bets']:
+                    prefix = BET_MARKET_PREFIXES.get(bet['name'])
+                    if prefix is None:
+                        continue
+
+                    for value in bet['values']:
+                        market = bet_market(bet['name'], prefix, value['value'])
+                        if wanted is not None and market not in wanted:
+                            continue
+                        key = market_key(market)
+                        price = (float(value['odd']), bookmaker_id, bookmaker_name)
+                        prices = index.get(key)
+                        if prices is None:
+                            index[key] = [price]
+                        else:
+                            prices.append(price)
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao extrair odds: {e}")
+
+        # Ordenar uma única vez por mercado (maior preço primeiro, um por casa)
+        for key, prices in index.items():
+            if len(prices) > 1:
+                prices.sort(key=_price_odds, reverse=True)
+                index[key] = _one_per_bookmaker(prices)
+
+        return book
+
+    def add(self, market: str, odds: float, bookmaker_id: int, bookmaker_name: str = ''):
+        """
+        Registra o preço de uma casa (mantém o maior por casa e a ordem decrescente)
+
+        Args:
+            market: Nome do mercado ('Over 1.5', 'BTTS Yes', ...)
+            odds: Odds decimal
+            bookmaker_id: ID da casa
+            bookmaker_name: Nome da casa
+        """
+        prices = self._index.setdefault(market_key(market), [])
+
+        for i, (price, existing_id, _) in enumerate(prices):
+            if existing_id == bookmaker_id:
+                if odds <= price:
+                    return
+                del prices[i]
+                break
+
+        position = len(prices)
+        for i, (price, _, _) in enumerate(prices):
+            if odds > price:
+                position = i
+                break
+        prices.insert(position, (odds, bookmaker_id, bookmaker_name))
+
+    def prices(self, market: str) -> List[Price]:
+        """Preços de todas as casas, do maior para o menor"""
+        return list(self._index.get(market_key(market), ()))
+
+    def best(self, market: str, max_odds: Optional[float] = None) -> Optional[Price]:
+        """
+        Melhor preço do mercado
+
+        Args:
+            market: Nome do mercado
+            max_odds: Ignorar preços acima deste valor (ex: Config.MAX_ODDS_RANGE)
+
+        Returns:
+            (odds, bookmaker_id, nome) ou None
+        """
+        prices = self._index.get(market_key(market))
+        if not prices:
+            return None
+        if max_odds is None:
+            return prices[0]
+        return next((price for price in prices if price[0] <= max_odds), None)
+
+    def best_odds(self, max_odds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Mercado → melhor odds (formato de detect_market_opportunities)
+
+        Args:
+            max_odds: Ignorar preços acima deste valor (mercado sem preço
+                válido fica de fora)
+        """
+        if max_odds is None:
+            return {market_name(key): prices[0][0] for key, prices in self._index.items() if prices}
+
+        best = {}
+        for key, prices in self._index.items():
+            odds = next((price[0] for price in prices if price[0] <= max_odds), None)
+            if odds is not None:
+                best[market_name(key)] = odds
+        return best
+
+    def markets(self) -> List[str]:
+        """Mercados com pelo menos um preço"""
+        return [market_name(key) for key, prices in self._index.items() if prices]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def _price_odds(price: Price) -> float:
+    """Chave de ordenação dos preços"""
+    return price[0]
+
+
+def _one_per_bookmaker(prices: List[Price]) -> List[Price]:
+    """Mantém o maior preço de cada casa (lista já ordenada)"""
+    seen = set()
+    unique = []
+    for price in prices:
+        if price[1] not in seen:
+            seen.add(price[1])
+            unique.append(price)
+    return unique
+
+
+def extract_market_odds(
+    odds_data: Optional[Dict],
+    markets: Optional[Iterable[str]] = None,
+    max_odds: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    Extrai a melhor odds de cada mercado suportado entre todas as casas
+
+    Mercados: 'Over X.5'/'Under X.5' (Goals Over/Under),
+    'BTTS Yes'/'BTTS No' (Both Teams Score) e
+    'Next Goal Home'/'Away'/'None' (Team To Score First)
+
+    Args:
+        odds_data: Dados de odds da API
+        markets: Mercados extraídos (default: todos os suportados)
+        max_odds: Ignorar preços acima deste valor (ex: Config.MAX_ODDS_RANGE)
+
+    Returns:
+        Dicionário mercado → odds (apenas mercados com preço)
+    """
+    return OddsBook.from_payload(odds_data, markets).best_odds(max_odds)
+
+
+# ============================================================
+# Parse do payload de /odds
+# ============================================================
+
+def _filter_bookmaker(bookmaker: Dict, wanted: Optional[set]) -> Optional[Dict]:
+    """Casa apenas com as apostas/valores mantidos (None se não sobrou nada)"""
+    bets = []
+    for bet in bookmaker.get('bets', []):
+        prefix = BET_MARKET_PREFIXES.get(bet.get('name'))
+        if prefix is None:
+            continue
+
+        values = [
+            {'value': str(value['value']), 'odd': str(value['odd'])}
+            for value in bet.get('values', [])
+            if 'odd' in value and (wanted is None or bet_market(bet['name'], prefix, value.get('value')) in wanted)
+        ]
+        if values:
+            bets.append({'name': bet['name'], 'values': values})
+
+    if not bets:
+        return None
+    return {'id': bookmaker.get('id'), 'name': bookmaker.get('name', ''), 'bets': bets}
+
+
+def filter_odds_item(item: Optional[Dict], markets: Optional[Iterable[str]] = None) -> Optional[Dict]:
+    """
+    Reduz um item de /odds aos mercados suportados
+
+    Args:
+        item: Item de /odds (response[0])
+        markets: Mercados mantidos (default: todos os suportados)
+
+    Returns:
+        {'bookmakers': [...]} apenas com as apostas/valores mantidos,
+        ou None se nenhuma casa oferece esses mercados
+    """
+    if not item:
+        return None
+
+    wanted = set(markets) if markets is not None else None
+    return _reduced_payload(_filter_bookmaker(bookmaker, wanted) for bookmaker in item.get('bookmakers', []))
+
+
+def parse_odds_stream(stream: BinaryIO, markets: Optional[Iterable[str]] = None) -> Optional[Dict]:
+    """
+    Lê uma resposta de /odds mantendo apenas os mercados informados
+
+    Com ijson instalado a resposta é lida em blocos de
+    Config.ODDS_STREAM_BUFFER_SIZE e cada casa de apostas é reduzida assim que
+    lida: o pico de memória não cresce com o número de casas. Sem ijson, a
+    resposta é carregada inteira e filtrada com filter_odds_item (mesmo
+    resultado). /odds?fixture= retorna um único item; com mais itens, o parse
+    incremental junta as casas de todos.
+
+    Args:
+        stream: Arquivo binário com o JSON (ex: response.raw)
+        markets: Mercados mantidos (default: todos os suportados)
+
+    Returns:
+        Mesmo formato de filter_odds_item
+    """
+    if ijson is None:
+        response = json.load(stream).get('response')
+        return filter_odds_item(response[0] if response else None, markets)
+
+    wanted = set(markets) if markets is not None else None
+    return _reduced_payload(
+        _filter_bookmaker(bookmaker, wanted)
+        for bookmaker in ijson.items(
+            stream, 'response.item.bookmakers.item', buf_size=Config.ODDS_STREAM_BUFFER_SIZE
+        )
+    )
+
+
+def _reduced_payload(bookmakers: Iterable[Optional[Dict]]) -> Optional[Dict]:
+    """Payload no formato de /odds com as casas que sobraram do filtro"""
+    kept = [bookmaker for bookmaker in bookmakers if bookmaker]
+    return {'bookmakers': kept} if kept else None
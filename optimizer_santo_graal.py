@@ -0,0 +1,568 @@
+"""
+Otimizador de Parâmetros - Santo Graal Bot EV+
+Calibra PROBABILITY_WEIGHTS, multiplicadores de HT 0-0 e limites de aposta
+
+Usa o mesmo histórico do backtest (backtest_santo_graal.py). Os 9 indicadores
+de cada jogo HT 0-0 são calculados uma única vez pelo caminho vetorizado;
+cada candidato vira uma soma ponderada (produto de matrizes), avaliada em
+lotes por um pool de processos.
+
+Os jogos mais recentes (Config.OPTIMIZER_HOLDOUT_FRACTION) ficam fora da
+calibração: pesos, multiplicadores e limites são escolhidos nos mais antigos
+e o log-loss, o Brier e o lucro reportados nos recentes são fora da amostra.
+
+Uso:
+    python optimizer_santo_graal.py arquivos/ --output calibracao.json
+    CALIBRATION_FILE=calibracao.json python santo_graal_bot_ev.py
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backtest_santo_graal import find_archives, final_score, is_halftime_0x0, iter_records, passes_draw_rate
+from config_santo_graal import Config
+from odds_santo_graal import OddsBook
+from probability_calculator_santo_graal import ProbabilityCalculator
+from team_features_santo_graal import TeamFeatures
+
+logger = logging.getLogger(__name__)
+
+
+INDICATOR_KEYS = tuple(Config.PROBABILITY_WEIGHTS)
+PROBABILITY_EPSILON = 1e-6  # Evita log(0) no log-loss
+
+# Dataset do processo (carregado pelo initializer do pool)
+_dataset: Optional[Dict[str, np.ndarray]] = None
+
+
+# ============================================================
+# Dataset
+# ============================================================
+
+def load_shard(task: Tuple[str, int, int]) -> Dict[str, np.ndarray]:
+    """
+    Lê um shard do histórico e calcula os indicadores dos jogos HT 0-0
+
+    Args:
+        task: (caminho, shard_index, shard_count)
+
+    Returns:
+        Arrays do shard (ver load_dataset)
+    """
+    path, shard_index, shard_count = task
+    calculator = ProbabilityCalculator()
+
+    matches, outcomes, odds, timestamps = [], [], [], []
+
+    for record in iter_records(path, shard_index, shard_count):
+        fixture = record.get('fixture') or {}
+        home_goals, away_goals = final_score(fixture)
+        if not is_halftime_0x0(fixture) or home_goals is None or away_goals is None:
+            continue
+
+        home_stats = TeamFeatures.from_stats(record.get('home_stats') or {})
+        away_stats = TeamFeatures.from_stats(record.get('away_stats') or {})
+        if not (passes_draw_rate(home_stats) and passes_draw_rate(away_stats)):
+            continue
+
+        odds_book = OddsBook.from_payload(record.get('odds'), markets=('Over 0.5', 'Over 1.5'))
+        over_05 = odds_book.best('Over 0.5', max_odds=Config.MAX_ODDS_RANGE)
+        over_15 = odds_book.best('Over 1.5', max_odds=Config.MAX_ODDS_RANGE)
+        matches.append({
+            'home_stats': home_stats,
+            'away_stats': away_stats,
+            'h2h': record.get('h2h') or [],
+            'is_ht_0x0': True,
+        })
+        outcomes.append((home_goals + away_goals > 0, home_goals + away_goals > 1))
+        odds.append((over_05[0] if over_05 else math.nan, over_15[0] if over_15 else math.nan))
+        timestamps.append(fixture.get('fixture', {}).get('timestamp') or 0)
+
+    if not matches:
+        return _empty_dataset()
+
+    indicators = calculator.calculate_indicators_batch(matches)
+    outcomes = np.array(outcomes, dtype=bool)
+    odds = np.array(odds, dtype=float)
+
+    return {
+        'indicators_05': np.stack([indicators[key][0] for key in INDICATOR_KEYS]),
+        'indicators_15': np.stack([indicators[key][1] for key in INDICATOR_KEYS]),
+        'over_05': outcomes[:, 0],
+        'over_15': outcomes[:, 1],
+        'odds_05': odds[:, 0],
+        'odds_15': odds[:, 1],
+        'timestamp': np.array(timestamps, dtype=float),
+    }
+
+
+def _empty_dataset() -> Dict[str, np.ndarray]:
+    """Dataset sem jogos"""
+    return {
+        'indicators_05': np.empty((len(INDICATOR_KEYS), 0)),
+        'indicators_15': np.empty((len(INDICATOR_KEYS), 0)),
+        'over_05': np.empty(0, dtype=bool),
+        'over_15': np.empty(0, dtype=bool),
+        'odds_05': np.empty(0),
+        'odds_15': np.empty(0),
+        'timestamp': np.empty(0),
+    }
+
+
+def load_dataset(paths: List[str], workers: int) -> Dict[str, np.ndarray]:
+    """
+    Carrega o histórico em paralelo
+
+    Returns:
+        {
+            'indicators_05'/'indicators_15': indicadores (9 × N, em %),
+            'over_05'/'over_15': resultado do 2º tempo (N),
+            'odds_05'/'odds_15': odds no HT (N, NaN se ausente),
+            'timestamp': kickoff (N, 0 se ausente)
+        }
+    """
+    archives = find_archives(paths)
+    shards_per_file = max(1, math.ceil(workers / max(1, len(archives))))
+    tasks = [(path, i, shards_per_file) for path in archives for i in range(shards_per_file)]
+
+    if workers == 1:
+        shards = list(map(load_shard, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(load_shard, tasks))
+
+    shards.append(_empty_dataset())
+    return {
+        key: np.concatenate([shard[key] for shard in shards], axis=-1)
+        for key in shards[0]
+    }
+
+
+def split_by_time(
+    dataset: Dict[str, np.ndarray],
+    holdout_fraction: float
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Divide o dataset em calibração (jogos mais antigos) e validação (mais recentes)
+
+    Args:
+        dataset: Resultado de load_dataset
+        holdout_fraction: Fração dos jogos reservada para validação (0-1)
+
+    Returns:
+        Tuple (calibração, validação) no formato de load_dataset
+    """
+    order = np.argsort(dataset['timestamp'], kind='stable')
+    cut = len(order) - int(round(len(order) * holdout_fraction))
+
+    def subset(indices):
+        return {key: values[..., indices] for key, values in dataset.items()}
+
+    return subset(order[:cut]), subset(order[cut:])
+
+
+# ============================================================
+# Avaliação de candidatos
+# ============================================================
+
+def _init_worker(dataset: Dict[str, np.ndarray]):
+    """Initializer do pool: o dataset é enviado uma vez por processo"""
+    global _dataset
+    _dataset = dataset
+
+
+def predict(dataset: Dict[str, np.ndarray], candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Probabilidades (0-1) de cada candidato para cada jogo
+
+    Mesma fórmula de calculate_probabilities_batch com is_ht_0x0=True.
+
+    Args:
+        dataset: Resultado de load_dataset
+        candidates: Array (C, 11): 9 pesos + multiplicador Over 0.5 + multiplicador Over 1.5
+
+    Returns:
+        Tuple (prob_over_05, prob_over_15) com shape (C, N)
+    """
+    weights = candidates[:, :len(INDICATOR_KEYS)]
+    prob_over_05 = (weights @ dataset['indicators_05']) * candidates[:, -2:-1]
+    prob_over_15 = (weights @ dataset['indicators_15']) * candidates[:, -1:]
+    return np.clip(prob_over_05, 0, 100) / 100, np.clip(prob_over_15, 0, 100) / 100
+
+
+def score_candidates(candidates: np.ndarray, dataset: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    Log-loss e Brier médios (Over 0.5 e Over 1.5) de cada candidato
+
+    Args:
+        candidates: Array (C, 11)
+        dataset: Dataset (default: o carregado no processo)
+
+    Returns:
+        Array (C, 2) com colunas (log_loss, brier)
+    """
+    dataset = _dataset if dataset is None else dataset
+    scores = np.zeros((len(candidates), 2))
+
+    for probabilities, outcome in zip(predict(dataset, candidates), (dataset['over_05'], dataset['over_15'])):
+        clipped = np.clip(probabilities, PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+        scores[:, 0] -= np.where(outcome, np.log(clipped), np.log1p(-clipped)).mean(axis=1) / 2
+        scores[:, 1] += ((probabilities - outcome) ** 2).mean(axis=1) / 2
+
+    return scores
+
+
+def normalize(candidates: np.ndarray) -> np.ndarray:
+    """Pesos não negativos somando 1 (a escala fica nos multiplicadores)"""
+    candidates = candidates.copy()
+    weights = np.clip(candidates[:, :len(INDICATOR_KEYS)], 0, None)
+    totals = weights.sum(axis=1, keepdims=True)
+    uniform = np.full_like(weights, 1 / len(INDICATOR_KEYS))
+    candidates[:, :len(INDICATOR_KEYS)] = np.where(totals > 0, weights / np.where(totals > 0, totals, 1), uniform)
+    return candidates
+
+
+def current_candidate() -> np.ndarray:
+    """Parâmetros atuais do Config como candidato"""
+    return np.array(
+        [Config.PROBABILITY_WEIGHTS[key] for key in INDICATOR_KEYS]
+        + [Config.HT_0X0_MULTIPLIER_OVER_05, Config.HT_0X0_MULTIPLIER_OVER_15]
+    )
+
+
+class CandidateEvaluator:
+    """Avalia lotes de candidatos em paralelo (ou no próprio processo)"""
+
+    def __init__(self, dataset: Dict[str, np.ndarray], workers: int):
+        self.dataset = dataset
+        self.workers = workers
+        self.evaluated = 0
+        self._executor = None
+        if workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(dataset,)
+            )
+
+    def score(self, candidates: np.ndarray) -> np.ndarray:
+        """Array (C, 2) com (log_loss, brier)"""
+        self.evaluated += len(candidates)
+        size = Config.OPTIMIZER_CANDIDATES_PER_TASK
+
+        chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+
+        if self._executor is None or len(chunks) == 1:
+            return np.concatenate([score_candidates(chunk, self.dataset) for chunk in chunks])
+
+        return np.concatenate(list(self._executor.map(score_candidates, chunks)))
+
+    def close(self):
+        """Encerra o pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+# ============================================================
+# Busca
+# ============================================================
+
+def random_search(evaluator: CandidateEvaluator, samples: int, objective: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Amostragem aleatória: pesos ~ Dirichlet, multiplicadores ~ Uniforme
+
+    Returns:
+        Melhor candidato (inclui os parâmetros atuais na disputa)
+    """
+    low, high = Config.OPTIMIZER_MULTIPLIER_RANGE
+    candidates = np.column_stack([
+        rng.dirichlet(np.ones(len(INDICATOR_KEYS)), samples),
+        rng.uniform(low, high, (samples, 2)),
+    ])
+    candidates = np.vstack([normalize(current_candidate()[np.newaxis]), candidates])
+
+    scores = evaluator.score(candidates)
+    return candidates[np.argmin(scores[:, objective])]
+
+
+def coordinate_search(
+    evaluator: CandidateEvaluator,
+    start: np.ndarray,
+    rounds: int,
+    objective: int
+) -> np.ndarray:
+    """
+    Busca por coordenadas: cada parâmetro varre uma grade em torno do melhor valor
+
+    A grade de todos os parâmetros de uma rodada é avaliada em um único lote;
+    o passo cai pela metade a cada rodada.
+
+    Returns:
+        Melhor candidato
+    """
+    best = start
+    best_score = evaluator.score(best[np.newaxis])[0, objective]
+    step = 0.1
+    offsets = np.linspace(-1, 1, 21)
+
+    for _ in range(rounds):
+        for parameter in range(len(best)):
+            grid = np.repeat(best[np.newaxis], len(offsets), axis=0)
+            grid[:, parameter] += offsets * step * max(abs(best[parameter]), 0.05)
+            grid = normalize(grid)
+
+            scores = evaluator.score(grid)[:, objective]
+            index = int(np.argmin(scores))
+            if scores[index] < best_score:
+                best, best_score = grid[index], scores[index]
+        step /= 2
+
+    return best
+
+
+def _threshold_markets(dataset: Dict[str, np.ndarray], candidate: np.ndarray) -> Tuple:
+    """(chave do limite, probabilidade %, odds, retorno com stake 1) de cada mercado"""
+    prob_over_05, prob_over_15 = (p[0] * 100 for p in predict(dataset, candidate[np.newaxis]))
+    return tuple(
+        (key, probability, odds, np.where(won, np.nan_to_num(odds) - 1, -1.0))
+        for key, probability, odds, won in (
+            ('MIN_PROBABILITY_OVER_05', prob_over_05, dataset['odds_05'], dataset['over_05']),
+            ('MIN_PROBABILITY_OVER_15', prob_over_15, dataset['odds_15'], dataset['over_15']),
+        )
+    )
+
+
+def _eligible(probability: np.ndarray, odds: np.ndarray, min_ev: float) -> np.ndarray:
+    """Jogos com odds dentro do range e EV ≥ min_ev (mesmo filtro do EVDetector)"""
+    with np.errstate(invalid='ignore'):
+        return (
+            (odds >= Config.MIN_ODDS_RANGE) & (odds <= Config.MAX_ODDS_RANGE)
+            & ((probability / 100 * odds - 1) * 100 >= min_ev)
+        )
+
+
+def optimize_thresholds(dataset: Dict[str, np.ndarray], candidate: np.ndarray) -> Dict:
+    """
+    Limites de aposta que maximizam o lucro (stake fixa) com as probabilidades calibradas
+
+    Varre MIN_EV_PERCENT e, para cada valor, o melhor MIN_PROBABILITY de
+    cada mercado com pelo menos Config.OPTIMIZER_MIN_BETS apostas. Lucro
+    dentro da amostra: avaliar os limites em outro período com
+    evaluate_thresholds.
+
+    Returns:
+        {'MIN_PROBABILITY_OVER_05', 'MIN_PROBABILITY_OVER_15', 'MIN_EV_PERCENT', 'profit', 'bets'};
+        se nenhum valor atinge o mínimo de apostas, os limites atuais do
+        Config com profit None
+    """
+    markets = _threshold_markets(dataset, candidate)
+    min_probabilities = np.arange(50.0, 96.0, 1.0)
+
+    best = {
+        'MIN_PROBABILITY_OVER_05': Config.MIN_PROBABILITY_OVER_05,
+        'MIN_PROBABILITY_OVER_15': Config.MIN_PROBABILITY_OVER_15,
+        'MIN_EV_PERCENT': Config.MIN_EV_PERCENT,
+        'profit': None,
+        'bets': 0,
+    }
+
+    for min_ev in np.arange(0.0, 15.5, 0.5):
+        choice = {'MIN_EV_PERCENT': float(min_ev), 'profit': 0.0, 'bets': 0}
+
+        for key, probability, odds, returns in markets:
+            # Grade de limites × jogos
+            bets = _eligible(probability, odds, min_ev) & (probability >= min_probabilities[:, np.newaxis])
+            counts = bets.sum(axis=1)
+            profits = np.where(bets, returns, 0.0).sum(axis=1)
+            profits[counts < Config.OPTIMIZER_MIN_BETS] = -math.inf
+
+            index = int(np.argmax(profits))
+            if not np.isfinite(profits[index]):
+                choice = None
+                break
+
+            choice[key] = float(min_probabilities[index])
+            choice['profit'] += float(profits[index])
+            choice['bets'] += int(counts[index])
+
+        if choice is not None and (best['profit'] is None or choice['profit'] > best['profit']):
+            best.update(choice)
+
+    return best
+
+
+def evaluate_thresholds(dataset: Dict[str, np.ndarray], candidate: np.ndarray, thresholds: Dict) -> Dict:
+    """
+    Lucro (stake fixa) e apostas de limites já escolhidos
+
+    Args:
+        dataset: Jogos avaliados (ex: validação de split_by_time)
+        candidate: Pesos + multiplicadores
+        thresholds: MIN_PROBABILITY_OVER_05, MIN_PROBABILITY_OVER_15 e MIN_EV_PERCENT
+
+    Returns:
+        {'profit', 'bets'}
+    """
+    profit, bets = 0.0, 0
+
+    for key, probability, odds, returns in _threshold_markets(dataset, candidate):
+        placed = _eligible(probability, odds, thresholds['MIN_EV_PERCENT']) & (probability >= thresholds[key])
+        profit += float(returns[placed].sum())
+        bets += int(placed.sum())
+
+    return {'profit': profit, 'bets': bets}
+
+
+def run_optimizer(
+    paths: List[str],
+    workers: Optional[int] = None,
+    samples: int = Config.OPTIMIZER_RANDOM_SAMPLES,
+    rounds: int = Config.OPTIMIZER_COORDINATE_ROUNDS,
+    objective: str = Config.OPTIMIZER_OBJECTIVE,
+    seed: int = 42
+) -> Dict:
+    """
+    Executa a calibração completa
+
+    Args:
+        paths: Arquivos ou diretórios com o histórico
+        workers: Processos (default: nº de CPUs)
+        samples: Candidatos da busca aleatória
+        rounds: Rodadas da busca por coordenadas
+        objective: 'log_loss' ou 'brier'
+        seed: Semente da busca aleatória
+
+    Returns:
+        Calibração no formato aceito por Config.load_calibration, com 'metrics'
+        (holdout_*: fora da amostra, None sem jogos de validação)
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    objective_index = ('log_loss', 'brier').index(objective)
+
+    dataset = load_dataset(paths, workers)
+    fixtures = dataset['over_05'].size
+    if fixtures == 0:
+        raise ValueError("Nenhum jogo HT 0-0 encontrado no histórico")
+
+    train, holdout = split_by_time(dataset, Config.OPTIMIZER_HOLDOUT_FRACTION)
+    if train['over_05'].size == 0:
+        raise ValueError("Nenhum jogo HT 0-0 para calibração fora da validação")
+
+    logger.info(
+        f"📊 {fixtures} jogos HT 0-0 carregados em {time.perf_counter() - start:.1f}s "
+        f"({train['over_05'].size} calibração, {holdout['over_05'].size} validação)"
+    )
+
+    evaluator = CandidateEvaluator(train, workers)
+    try:
+        baseline = current_candidate()
+        best = random_search(evaluator, samples, objective_index, np.random.default_rng(seed))
+        best = coordinate_search(evaluator, best, rounds, objective_index)
+        baseline_score, best_score = evaluator.score(np.vstack([baseline, best]))
+        evaluated = evaluator.evaluated
+    finally:
+        evaluator.close()
+
+    thresholds = optimize_thresholds(train, best)
+    weights = best[:len(INDICATOR_KEYS)]
+
+    # Fora da amostra: calibração vs parâmetros atuais nos jogos mais recentes
+    holdout_metrics = dict.fromkeys((
+        'holdout_log_loss', 'holdout_brier', 'holdout_baseline_log_loss', 'holdout_baseline_brier',
+        'holdout_bets', 'holdout_flat_profit', 'holdout_baseline_bets', 'holdout_baseline_flat_profit',
+    ))
+    if holdout['over_05'].size:
+        holdout_baseline_score, holdout_score = score_candidates(np.vstack([baseline, best]), holdout)
+        calibrated = evaluate_thresholds(holdout, best, thresholds)
+        current = evaluate_thresholds(holdout, baseline, {
+            'MIN_PROBABILITY_OVER_05': Config.MIN_PROBABILITY_OVER_05,
+            'MIN_PROBABILITY_OVER_15': Config.MIN_PROBABILITY_OVER_15,
+            'MIN_EV_PERCENT': Config.MIN_EV_PERCENT,
+        })
+        holdout_metrics.update({
+            'holdout_log_loss': float(holdout_score[0]),
+            'holdout_brier': float(holdout_score[1]),
+            'holdout_baseline_log_loss': float(holdout_baseline_score[0]),
+            'holdout_baseline_brier': float(holdout_baseline_score[1]),
+            'holdout_bets': calibrated['bets'],
+            'holdout_flat_profit': calibrated['profit'],
+            'holdout_baseline_bets': current['bets'],
+            'holdout_baseline_flat_profit': current['profit'],
+        })
+
+    return {
+        'PROBABILITY_WEIGHTS': {key: round(float(w), 6) for key, w in zip(INDICATOR_KEYS, weights)},
+        'HT_0X0_MULTIPLIER_OVER_05': round(float(best[-2]), 6),
+        'HT_0X0_MULTIPLIER_OVER_15': round(float(best[-1]), 6),
+        'MIN_PROBABILITY_OVER_05': thresholds['MIN_PROBABILITY_OVER_05'],
+        'MIN_PROBABILITY_OVER_15': thresholds['MIN_PROBABILITY_OVER_15'],
+        'MIN_EV_PERCENT': thresholds['MIN_EV_PERCENT'],
+        'metrics': {
+            'objective': objective,
+            'fixtures': int(fixtures),
+            'train_fixtures': int(train['over_05'].size),
+            'holdout_fixtures': int(holdout['over_05'].size),
+            'log_loss': float(best_score[0]),
+            'brier': float(best_score[1]),
+            'baseline_log_loss': float(baseline_score[0]),
+            'baseline_brier': float(baseline_score[1]),
+            'threshold_bets': thresholds['bets'],
+            'threshold_flat_profit': thresholds['profit'],
+            **holdout_metrics,
+            'candidates_evaluated': evaluated,
+            'elapsed': time.perf_counter() - start,
+        },
+    }
+
+
+def main() -> int:
+    """Executa o otimizador pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Calibração de pesos e multiplicadores do Santo Graal Bot EV+")
+    parser.add_argument('paths', nargs='+', help="Arquivos .jsonl/.jsonl.gz ou diretórios")
+    parser.add_argument('--workers', type=int, default=None, help="Processos (default: nº de CPUs)")
+    parser.add_argument('--samples', type=int, default=Config.OPTIMIZER_RANDOM_SAMPLES)
+    parser.add_argument('--rounds', type=int, default=Config.OPTIMIZER_COORDINATE_ROUNDS)
+    parser.add_argument('--objective', choices=('log_loss', 'brier'), default=Config.OPTIMIZER_OBJECTIVE)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='calibration_santo_graal.json', help="Arquivo JSON de saída")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+
+    calibration = run_optimizer(args.paths, args.workers, args.samples, args.rounds, args.objective, args.seed)
+    metrics = calibration['metrics']
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(calibration, f, indent=2, ensure_ascii=False)
+
+    print(f"🎛️ {metrics['candidates_evaluated']} candidatos em {metrics['elapsed']:.1f}s ({metrics['fixtures']} jogos)")
+    print(f"📉 Log-loss: {metrics['baseline_log_loss']:.4f} → {metrics['log_loss']:.4f}")
+    print(f"📉 Brier:    {metrics['baseline_brier']:.4f} → {metrics['brier']:.4f}")
+    if metrics['threshold_flat_profit'] is None:
+        print(f"⚠️ Nenhum limite com {Config.OPTIMIZER_MIN_BETS} apostas por mercado: limites atuais mantidos")
+    if metrics['holdout_fixtures']:
+        print(f"🧪 Validação ({metrics['holdout_fixtures']} jogos mais recentes):")
+        print(f"   Log-loss: {metrics['holdout_baseline_log_loss']:.4f} → {metrics['holdout_log_loss']:.4f}")
+        print(f"   Brier:    {metrics['holdout_baseline_brier']:.4f} → {metrics['holdout_brier']:.4f}")
+        print(
+            f"   Lucro (stake 1): {metrics['holdout_baseline_flat_profit']:+.2f} "
+            f"({metrics['holdout_baseline_bets']} apostas) → {metrics['holdout_flat_profit']:+.2f} "
+            f"({metrics['holdout_bets']} apostas)"
+        )
+    print(f"💾 Calibração salva em {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
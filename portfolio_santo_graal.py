@@ -0,0 +1,275 @@
+"""
+Kelly de Portfólio - Santo Graal Bot EV+
+Stakes conjuntos para apostas simultâneas, com limite por aposta e exposição total
+"""
+
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config_santo_graal import Config
+
+
+def project_capped_simplex(x: np.ndarray, upper: np.ndarray, total: float) -> np.ndarray:
+    """
+    Projeção euclidiana em {0 ≤ x ≤ upper, Σx ≤ total}
+
+    Se o simples corte em [0, upper] já respeita o total, é a projeção;
+    senão é clip(x - τ, 0, upper) com Σ = total. A soma é linear por partes
+    em τ, com quebras em x e x - upper: avaliada em todas as quebras de uma
+    vez e interpolada no trecho que cruza o total.
+
+    Args:
+        x: Ponto a projetar
+        upper: Limite de cada coordenada
+        total: Limite da soma
+
+    Returns:
+        Ponto projetado
+    """
+    clipped = np.clip(x, 0.0, upper)
+    if clipped.sum() <= total:
+        return clipped
+
+    taus = np.unique(np.concatenate([[0.0], x, x - upper]))
+    taus = taus[taus >= 0]
+    sums = np.clip(x[None, :] - taus[:, None], 0.0, upper).sum(axis=1)  # Decrescente em τ
+
+    i = np.searchsorted(-sums, -total)  # Primeira quebra com soma ≤ total
+    low, high = taus[i - 1], taus[i]
+    tau = low + (sums[i - 1] - total) * (high - low) / (sums[i - 1] - sums[i])
+    return np.clip(x - tau, 0.0, upper)
+
+
+def scenario_returns(
+    probabilities: np.ndarray,
+    odds: np.ndarray,
+    groups: Sequence,
+    scenarios: int,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Retorno de cada aposta (odds - 1 ou -1) em cenários simulados
+
+    Cada grupo (jogo) recebe um uniforme estratificado por cenário: a taxa
+    de acerto de cada aposta reproduz a probabilidade com erro ≤ 1/cenários.
+    Apostas do mesmo jogo compartilham o uniforme, então linhas Over
+    aninhadas ficam corretamente correlacionadas (Over 1.5 ⇒ Over 0.5).
+
+    Args:
+        probabilities: Probabilidades de acerto (0-1)
+        odds: Odds decimais
+        groups: Jogo de cada aposta
+        scenarios: Número de cenários
+        seed: Semente (resultado determinístico)
+
+    Returns:
+        Matriz cenários × apostas
+    """
+    labels = {group: i for i, group in enumerate(dict.fromkeys(groups))}
+    group_index = np.array([labels[group] for group in groups])
+
+    uniforms = _stratified_uniforms(scenarios, len(labels), seed)
+    wins = uniforms[:, group_index] < probabilities
+    return np.where(wins, odds - 1, -1.0)
+
+
+@lru_cache(maxsize=64)
+def _stratified_uniforms(scenarios: int, columns: int, seed: int) -> np.ndarray:
+    """Uniformes estratificados (cenários × colunas), memoizados: só dependem da forma"""
+    strata = (np.arange(scenarios) + 0.5) / scenarios
+    uniforms = np.random.default_rng(seed).permuted(np.tile(strata[:, None], (1, columns)), axis=0)
+    uniforms.flags.writeable = False
+    return uniforms
+
+
+def allocate_kelly(
+    probabilities: Sequence[float],
+    odds: Sequence[float],
+    groups: Optional[Sequence] = None,
+    open_fractions: Optional[Sequence[float]] = None,
+    open_probabilities: Optional[Sequence[float]] = None,
+    open_odds: Optional[Sequence[float]] = None,
+    open_groups: Optional[Sequence] = None
+) -> np.ndarray:
+    """
+    Kelly fracionário conjunto de várias apostas simultâneas
+
+    Maximiza o crescimento logarítmico esperado da banca sobre cenários
+    simulados (scenario_returns) por gradiente projetado com passo
+    Barzilai-Borwein, partindo do Kelly individual de cada aposta. O Kelly
+    completo é resolvido com limites divididos por Config.KELLY_FRACTION e o
+    resultado é multiplicado pela fração: com uma aposta isolada, coincide
+    com EVDetector.calculate_kelly_stake.
+
+    Limites: Config.MAX_STAKE_PERCENT por aposta e
+    Config.MAX_TOTAL_EXPOSURE_PERCENT somando as apostas abertas, que entram
+    como posições fixas. O laço para em Config.PORTFOLIO_KELLY_MAX_ITERATIONS
+    ou Config.PORTFOLIO_KELLY_TIME_BUDGET segundos, sempre com um ponto viável.
+
+    Args:
+        probabilities: Probabilidades (%) das novas apostas
+        odds: Odds decimais das novas apostas
+        groups: Jogo de cada aposta (default: todas independentes)
+        open_fractions: Frações da banca já apostadas (abertas)
+        open_probabilities: Probabilidades (%) das apostas abertas
+        open_odds: Odds das apostas abertas
+        open_groups: Jogo de cada aposta aberta
+
+    Returns:
+        Fração da banca de cada nova aposta
+    """
+    deadline = time.perf_counter() + Config.PORTFOLIO_KELLY_TIME_BUDGET
+
+    p = np.asarray(probabilities, dtype=float) / 100
+    o = np.asarray(odds, dtype=float)
+    n = len(p)
+    if n == 0:
+        return np.zeros(0)
+
+    fraction = Config.KELLY_FRACTION
+    groups = list(groups) if groups is not None else [('new', i) for i in range(n)]
+
+    open_fractions = np.asarray(open_fractions if open_fractions is not None else [], dtype=float)
+    open_full = open_fractions / fraction
+    m = len(open_full)
+
+    # Espaço do Kelly completo: limites divididos pela fração (perda total < 95% da banca)
+    upper = np.full(n, Config.MAX_STAKE_PERCENT / 100 / fraction)
+    total = min(
+        (Config.MAX_TOTAL_EXPOSURE_PERCENT / 100 - open_fractions.sum()) / fraction,
+        0.95 - open_full.sum()
+    )
+    if total <= 0:
+        return np.zeros(n)
+
+    returns = scenario_returns(
+        np.concatenate([p, np.asarray(open_probabilities if m else [], dtype=float) / 100]),
+        np.concatenate([o, np.asarray(open_odds if m else [], dtype=float)]),
+        groups + (list(open_groups) if m else []),
+        Config.PORTFOLIO_KELLY_SCENARIOS
+    )
+    base = 1.0 + returns[:, n:] @ open_full
+    returns = returns[:, :n]
+
+    def growth_and_gradient(x):
+        wealth = base + returns @ x
+        return np.log(wealth).mean(), returns.T @ (1.0 / wealth) / len(wealth)
+
+    # Ponto inicial: Kelly individual de cada aposta
+    b = o - 1
+    x = project_capped_simplex(np.where(b > 0, (b * p - (1 - p)) / np.where(b > 0, b, 1), 0.0), upper, total)
+    growth, gradient = growth_and_gradient(x)
+    best_x, best_growth = x, growth
+    step = 1.0
+
+    for _ in range(Config.PORTFOLIO_KELLY_MAX_ITERATIONS):
+        if time.perf_counter() >= deadline:
+            break
+
+        x_next = project_capped_simplex(x + step * gradient, upper, total)
+        delta = x_next - x
+        if np.max(np.abs(delta)) < 1e-7:
+            break
+
+        growth_next, gradient_next = growth_and_gradient(x_next)
+        if growth_next > best_growth:
+            best_x, best_growth = x_next, growth_next
+
+        # Passo Barzilai-Borwein (objetivo côncavo: -Δx·Δg > 0)
+        curvature = -delta @ (gradient_next - gradient)
+        step = float(np.clip(delta @ delta / curvature, 1e-3, 10.0)) if curvature > 1e-12 else 10.0
+
+        x, gradient = x_next, gradient_next
+
+    return best_x * fraction
+
+
+class KellyPortfolio:
+    """
+    Apostas notificadas ainda abertas e o dimensionamento das novas (thread-safe)
+
+    Cada lote de oportunidades é dimensionado com allocate_kelly considerando
+    as apostas abertas; as aceitas passam a contar na exposição até
+    Config.PORTFOLIO_OPEN_BET_SECONDS (fim do 2º tempo) ou release().
+    """
+
+    def __init__(self):
+        """Inicializa o portfólio vazio"""
+        self._open: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def allocate(self, fixture_id: int, opportunities: List[Dict], bankroll: Optional[float] = None) -> List[Dict]:
+        """
+        Dimensiona as oportunidades de um jogo e registra as aceitas
+
+        Atualiza 'kelly_stake' e 'stake_percent' de cada oportunidade (guarda
+        o valor individual em 'kelly_stake_independent').
+
+        Args:
+            fixture_id: ID do jogo
+            opportunities: Oportunidades EV+ (com 'market', 'probability', 'odds')
+            bankroll: Banca (default: Config.DEFAULT_BANKROLL)
+
+        Returns:
+            Oportunidades com stake > 0
+        """
+        if bankroll is None:
+            bankroll = Config.DEFAULT_BANKROLL
+        if not opportunities:
+            return []
+
+        with self._lock:
+            now = time.time()
+            self._open = [bet for bet in self._open if bet['expires_at'] > now]
+
+            fractions = allocate_kelly(
+                [opp['probability'] for opp in opportunities],
+                [opp['odds'] for opp in opportunities],
+                groups=[fixture_id] * len(opportunities),
+                open_fractions=[bet['fraction'] for bet in self._open],
+                open_probabilities=[bet['probability'] for bet in self._open],
+                open_odds=[bet['odds'] for bet in self._open],
+                open_groups=[bet['fixture_id'] for bet in self._open]
+            )
+
+            accepted = []
+            for opp, allocated in zip(opportunities, fractions):
+                allocated = float(allocated)
+                opp['kelly_stake_independent'] = opp.get('kelly_stake')
+                opp['kelly_stake'] = bankroll * allocated
+                opp['stake_percent'] = allocated * 100
+
+                if allocated > 0:
+                    accepted.append(opp)
+                    self._open.append({
+                        'fixture_id': fixture_id,
+                        'market': opp['market'],
+                        'probability': opp['probability'],
+                        'odds': opp['odds'],
+                        'fraction': allocated,
+                        'expires_at': now + Config.PORTFOLIO_OPEN_BET_SECONDS,
+                    })
+
+            return accepted
+
+    def release(self, fixture_id: int, market: Optional[str] = None):
+        """Remove as apostas de um jogo (ou só de um mercado) liquidadas ou não realizadas"""
+        with self._lock:
+            self._open = [
+                bet for bet in self._open
+                if bet['fixture_id'] != fixture_id or (market is not None and bet['market'] != market)
+            ]
+
+    def exposure(self) -> float:
+        """Fração da banca em apostas abertas"""
+        with self._lock:
+            now = time.time()
+            return sum(bet['fraction'] for bet in self._open if bet['expires_at'] > now)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._open)
@@ -0,0 +1,180 @@
+"""
+Pipeline de Prefetch para Santo Graal Bot EV+
+Aquece estatísticas, H2H e probabilidades pré-jogo antes do início dos jogos
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config_santo_graal import Config
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchPipeline:
+    """
+    Prepara tudo que não depende do placar antes do kickoff
+
+    Para cada jogo agendado nas próximas Config.PREFETCH_HOURS_AHEAD horas:
+    1. Estatísticas dos dois times (aquecendo o TeamStatsCache)
+    2. Histórico H2H (aquecendo o H2HStore)
+    3. Parte pré-jogo de ProbabilityCalculator.calculate_probabilities
+
+    Quando o jogo chega ao HT 0-0, só resta buscar as odds.
+
+    O loop principal usa start(): o prefetch roda em segundo plano e não
+    atrasa a consulta dos jogos na janela de HT.
+    """
+
+    PENDING_STATUSES = ('TBD', 'NS')
+
+    def __init__(self, bot):
+        """
+        Inicializa o pipeline
+
+        Args:
+            bot: SantoGraalBot (fornece get_team_statistics, get_h2h e o calculador)
+        """
+        self.bot = bot
+        self._prefetched: Dict[int, Dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self, upcoming_fixtures: List[Dict]) -> bool:
+        """
+        Executa run() em uma thread em segundo plano
+
+        Se o ciclo anterior ainda está em andamento, este é ignorado: os jogos
+        que faltarem entram no próximo refresh do calendário.
+
+        Args:
+            upcoming_fixtures: Resultado de get_upcoming_fixtures
+
+        Returns:
+            True se o ciclo foi iniciado
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                logger.info("🔥 Prefetch anterior ainda em andamento: ciclo ignorado")
+                return False
+
+            self._thread = threading.Thread(
+                target=self._run_background, args=(upcoming_fixtures,), name='prefetch', daemon=True
+            )
+            self._thread.start()
+
+        return True
+
+    def _run_background(self, upcoming_fixtures: List[Dict]):
+        """Alvo da thread de start(): erros são registrados, não propagados"""
+        try:
+            self.run(upcoming_fixtures)
+        except Exception as e:
+            logger.error(f"❌ Erro no prefetch: {e}")
+
+    def run(self, upcoming_fixtures: List[Dict]) -> int:
+        """
+        Executa o prefetch para os jogos ainda não preparados (bloqueia até terminar)
+
+        Args:
+            upcoming_fixtures: Resultado de get_upcoming_fixtures
+
+        Returns:
+            Número de jogos preparados neste ciclo
+        """
+        self._prune()
+
+        now = time.time()
+        horizon = now + Config.PREFETCH_HOURS_AHEAD * 3600
+
+        with self._lock:
+            pending = [
+                f for f in upcoming_fixtures
+                if f['fixture']['id'] not in self._prefetched
+                and f['fixture'].get('status', {}).get('short') in self.PENDING_STATUSES
+                and now <= (f['fixture'].get('timestamp') or 0) <= horizon
+            ]
+
+        if not pending:
+            return 0
+
+        logger.info(f"🔥 Prefetch de {len(pending)} jogos antes do início...")
+
+        with ThreadPoolExecutor(max_workers=Config.MAX_CONCURRENT_REQUESTS) as executor:
+            results = list(executor.map(self._prefetch_fixture, pending))
+
+        prepared = sum(1 for ok in results if ok)
+        logger.info(f"✅ Prefetch concluído: {prepared}/{len(pending)} jogos prontos")
+
+        return prepared
+
+    def get(self, fixture_id: int) -> Optional[Dict]:
+        """
+        Retorna os dados preparados de um jogo
+
+        Args:
+            fixture_id: ID do jogo
+
+        Returns:
+            Dicionário com home_stats, away_stats, h2h e prematch, ou None
+        """
+        with self._lock:
+            return self._prefetched.get(fixture_id)
+
+    def _prefetch_fixture(self, fixture: Dict) -> bool:
+        """
+        Prepara um único jogo
+
+        Args:
+            fixture: Dados do jogo
+
+        Returns:
+            True se o jogo foi preparado
+        """
+        try:
+            fixture_id = fixture['fixture']['id']
+            home_team = fixture['teams']['home']
+            away_team = fixture['teams']['away']
+            league_id = fixture['league']['id']
+
+            home_stats = self.bot.get_team_statistics(home_team['id'], league_id)
+            away_stats = self.bot.get_team_statistics(away_team['id'], league_id)
+
+            if not home_stats or not away_stats:
+                return False
+
+            h2h = self.bot.get_h2h(home_team['id'], away_team['id'])
+
+            match_data = {
+                'fixture_id': fixture_id,
+                'home_stats': home_stats,
+                'away_stats': away_stats,
+                'h2h': h2h,
+            }
+            prematch = self.bot.probability_calculator.calculate_prematch_probabilities(match_data)
+
+            with self._lock:
+                self._prefetched[fixture_id] = {
+                    **match_data,
+                    'prematch': prematch,
+                    'kickoff': fixture['fixture'].get('timestamp') or 0,
+                }
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Erro no prefetch do jogo: {e}")
+            return False
+
+    def _prune(self):
+        """Remove jogos cujo kickoff já passou há mais de 3 horas"""
+        cutoff = time.time() - 3 * 3600
+
+        with self._lock:
+            self._prefetched = {
+                fixture_id: data for fixture_id, data in self._prefetched.items()
+                if data['kickoff'] >= cutoff
+            }
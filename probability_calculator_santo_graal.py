@@ -5,7 +5,67 @@ Sistema com 9 indicadores para calcular probabilidades Over 0.5 e Over 1.5
 
 import math
 from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
 from config_santo_graal import Config
+from team_features_santo_graal import TeamFeatures
+from cache_santo_graal import ResultCache
+from poisson_santo_graal import GOAL_LINES, POISSON_TABLE
+from score_matrix_santo_graal import ScoreMatrix
+
+
+class TeamPartials:
+    """
+    Parte de cada indicador que depende de um único time
+
+    Calculada uma vez por linha do TeamStatsCache (memoizada no próprio
+    TeamFeatures); por jogo resta apenas combinar as partes dos dois times.
+    `over_rate` é NaN se o time não tem jogos; `phase_played` vale 10 se
+    ausente; `key` é o to_tuple() usado na chave do ResultCache.
+    """
+
+    __slots__ = (
+        'key',
+        'goals_avg_total',
+        'over_rate',
+        'form_score',
+        'goals_avg_home',
+        'goals_avg_away',
+        'phase_played',
+        'rank',
+    )
+
+    def __init__(self, features: TeamFeatures):
+        played = features.played or 0
+        self.key = features.to_tuple()
+        self.goals_avg_total = features.goals_avg_total
+        self.over_rate = features.goals_for_total / played if played != 0 else math.nan
+        self.form_score = features.form_score
+        self.goals_avg_home = features.goals_avg_home
+        self.goals_avg_away = features.goals_avg_away
+        self.phase_played = 10.0 if features.played is None else features.played
+        self.rank = features.rank
+
+
+def team_partials(features: TeamFeatures) -> TeamPartials:
+    """
+    Partes por time dos indicadores, memoizadas em features.partials
+
+    O TeamStatsCache cria um TeamFeatures novo a cada busca, então a
+    instância identifica a versão da linha (time, liga, temporada,
+    fetched_at): a consulta é um acesso a atributo, sem hash do conteúdo.
+
+    Args:
+        features: Features do time
+
+    Returns:
+        TeamPartials
+    """
+    partials = features.partials
+    if partials is None:
+        partials = features.partials = TeamPartials(features)
+    return partials
 
 
 class ProbabilityCalculator:
@@ -31,6 +91,7 @@ class ProbabilityCalculator:
     def __init__(self):
         """Inicializa o calculador"""
         self.weights = Config.PROBABILITY_WEIGHTS
+        self.result_cache = ResultCache(Config.RESULT_CACHE_MAX_ENTRIES)
     
     def calculate_probabilities(self, match_data: Dict) -> Tuple[float, float]:
         """
@@ -38,18 +99,50 @@ class ProbabilityCalculator:
         
         Args:
             match_data: Dicionário com dados do jogo:
-                - home_stats: Estatísticas do time da casa
-                - away_stats: Estatísticas do time visitante
+                - home_stats: Estatísticas do time da casa (TeamFeatures ou payload da API)
+                - away_stats: Estatísticas do time visitante (TeamFeatures ou payload da API)
                 - h2h: Lista de confrontos diretos
                 - is_ht_0x0: Boolean se está 0-0 no HT
         
         Returns:
             Tuple (prob_over_05, prob_over_15) em percentual (0-100)
         """
-        home_stats = match_data.get('home_stats', {})
-        away_stats = match_data.get('away_stats', {})
+        prob_over_05, prob_over_15 = self.calculate_prematch_probabilities(match_data)
+        
+        return self.apply_ht_adjustment(
+            prob_over_05,
+            prob_over_15,
+            match_data.get('is_ht_0x0', False)
+        )
+    
+    def calculate_prematch_probabilities(self, match_data: Dict) -> Tuple[float, float]:
+        """
+        Calcula a parte pré-jogo (soma ponderada dos 9 indicadores)
+        
+        Depende apenas de estatísticas e H2H, portanto pode ser calculada
+        antes do início do jogo (prefetch) e reaproveitada no HT.
+        
+        Com 'fixture_id' em match_data, o resultado fica no cache LRU
+        (self.result_cache) indexado pelo jogo e pelo conteúdo das entradas:
+        reavaliações com os mesmos dados não recalculam nada.
+        
+        Args:
+            match_data: Dicionário com home_stats, away_stats e h2h
+                (stats como TeamFeatures ou payload bruto da API) e,
+                opcionalmente, fixture_id
+        
+        Returns:
+            Tuple (prob_over_05, prob_over_15) sem ajuste de HT
+        """
+        home_stats = team_partials(TeamFeatures.coerce(match_data.get('home_stats')))
+        away_stats = team_partials(TeamFeatures.coerce(match_data.get('away_stats')))
         h2h = match_data.get('h2h', [])
-        is_ht_0x0 = match_data.get('is_ht_0x0', False)
+        
+        key = self._result_key(match_data.get('fixture_id'), home_stats, away_stats, h2h)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
         
         # Calcular cada indicador
         indicators = {
@@ -75,6 +168,117 @@ class ProbabilityCalculator:
             for key in indicators.keys()
         )
         
+        if key is not None:
+            self.result_cache.set(key, (prob_over_05, prob_over_15))
+        
+        return prob_over_05, prob_over_15
+    
+    @staticmethod
+    def _result_key(
+        fixture_id: Optional[int],
+        home: TeamPartials,
+        away: TeamPartials,
+        h2h: List[Dict]
+    ) -> Optional[Tuple]:
+        """
+        Chave do cache de resultados: jogo + conteúdo usado no cálculo
+        
+        Do H2H entram apenas os placares dos 10 confrontos considerados.
+        Retorna None (sem cache) se não há fixture_id ou o H2H é inválido.
+        """
+        if fixture_id is None:
+            return None
+        
+        try:
+            h2h_scores = tuple(
+                (match['score']['fulltime'].get('home', 0), match['score']['fulltime'].get('away', 0))
+                for match in (h2h or [])[:10]
+            )
+        except (AttributeError, KeyError, TypeError):
+            return None
+        
+        return fixture_id, home.key, away.key, h2h_scores
+    
+    def calculate_poisson_lines(self, match_data: Dict) -> Dict[str, float]:
+        """
+        Probabilidades de Poisson para todas as linhas (Over 0.5 ... 4.5)
+        
+        Uma única consulta à tabela pré-calculada cobre todas as linhas.
+        
+        Args:
+            match_data: Dicionário com home_stats e away_stats
+        
+        Returns:
+            Dicionário mercado → probabilidade em % (ex: {'Over 2.5': 41.3})
+        """
+        home = team_partials(TeamFeatures.coerce(match_data.get('home_stats')))
+        away = team_partials(TeamFeatures.coerce(match_data.get('away_stats')))
+        expected_goals = (home.goals_avg_total + away.goals_avg_total) / 2
+        
+        over_lines = POISSON_TABLE.over_scalar(expected_goals)
+        
+        return {f"Over {line}": prob * 100 for line, prob in zip(GOAL_LINES, over_lines)}
+    
+    def calculate_market_probabilities(
+        self,
+        match_data: Dict,
+        prematch: Optional[Tuple[float, float]] = None,
+        ht_probabilities: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, float]:
+        """
+        Probabilidades de todos os mercados do 2º tempo em uma passada
+        
+        Uma ScoreMatrix é calibrada pelo Over 0.5 e pelo Over 1.5 do modelo
+        de 9 indicadores (reproduzidos pela matriz) e dividida entre os times
+        pelas médias de gols (casa em casa, visitante fora): todas as linhas
+        saem da mesma distribuição e ficam coerentes entre si.
+        
+        Args:
+            match_data: Dicionário com home_stats, away_stats, h2h e is_ht_0x0
+            prematch: Probabilidades pré-jogo já calculadas (prefetch), opcional
+            ht_probabilities: (Over 0.5, Over 1.5) do HT já ajustadas (ex: modelo
+                in-play); dispensa prematch e o ajuste de HT
+        
+        Returns:
+            Dicionário mercado → probabilidade em % (Over/Under 0.5–4.5,
+            BTTS Yes/No)
+        """
+        if ht_probabilities is not None:
+            prob_over_05, prob_over_15 = ht_probabilities
+        else:
+            if prematch is None:
+                prematch = self.calculate_prematch_probabilities(match_data)
+            prob_over_05, prob_over_15 = self.apply_ht_adjustment(
+                *prematch,
+                match_data.get('is_ht_0x0', False)
+            )
+        
+        home = team_partials(TeamFeatures.coerce(match_data.get('home_stats')))
+        away = team_partials(TeamFeatures.coerce(match_data.get('away_stats')))
+        total_avg = home.goals_avg_home + away.goals_avg_away
+        home_share = home.goals_avg_home / total_avg if total_avg > 0 else 0.5
+        if not 0 <= home_share <= 1:  # NaN ou médias inválidas
+            home_share = 0.5
+        
+        return ScoreMatrix.from_over_probabilities(prob_over_05, prob_over_15, home_share).markets()
+    
+    def apply_ht_adjustment(
+        self,
+        prob_over_05: float,
+        prob_over_15: float,
+        is_ht_0x0: bool
+    ) -> Tuple[float, float]:
+        """
+        Aplica multiplicadores de HT 0-0 e limita ao range 0-100
+        
+        Args:
+            prob_over_05: Probabilidade pré-jogo Over 0.5 (%)
+            prob_over_15: Probabilidade pré-jogo Over 1.5 (%)
+            is_ht_0x0: Se o jogo está 0-0 no HT
+        
+        Returns:
+            Tuple (prob_over_05, prob_over_15) em percentual (0-100)
+        """
         # Aplicar multiplicadores se estiver 0-0 no HT
         if is_ht_0x0:
             prob_over_05 *= Config.HT_0X0_MULTIPLIER_OVER_05
@@ -86,105 +290,230 @@ class ProbabilityCalculator:
         
         return prob_over_05, prob_over_15
     
-    def _calculate_poisson_probability(
-        self, 
-        home_stats: Dict, 
-        away_stats: Dict
-    ) -> Tuple[float, float]:
+    def calculate_probabilities_batch(self, matches: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Indicador 1: Distribuição de Poisson (25%)
-        Calcula probabilidade baseada em média de gols
+        Calcula probabilidades Over 0.5 e Over 1.5 para N jogos de uma vez
+        
+        Extrai os dados de todos os jogos para arrays NumPy uma única vez e
+        avalia os 9 indicadores e a soma ponderada como operações vetoriais.
+        Mesmos resultados de calculate_probabilities, jogo a jogo.
+        
+        Args:
+            matches: Lista de match_data (mesmo formato de calculate_probabilities)
+        
+        Returns:
+            Tuple (prob_over_05, prob_over_15) como arrays (0-100) de tamanho N
         """
-        try:
-            # Extrair médias de gols
-            home_goals = home_stats.get('goals', {}).get('for', {}).get('average', {})
-            away_goals = away_stats.get('goals', {}).get('for', {}).get('average', {})
+        features = self._extract_batch_features(matches)
+        indicators = self._calculate_batch_indicators(features)
+        
+        # Calcular probabilidade ponderada
+        prob_over_05 = sum(indicators[key][0] * self.weights[key] for key in indicators)
+        prob_over_15 = sum(indicators[key][1] * self.weights[key] for key in indicators)
+        
+        # Aplicar multiplicadores se estiver 0-0 no HT
+        is_ht_0x0 = features['is_ht_0x0']
+        prob_over_05 = np.where(is_ht_0x0, prob_over_05 * Config.HT_0X0_MULTIPLIER_OVER_05, prob_over_05)
+        prob_over_15 = np.where(is_ht_0x0, prob_over_15 * Config.HT_0X0_MULTIPLIER_OVER_15, prob_over_15)
+        
+        # Garantir que está no range 0-100
+        return np.clip(prob_over_05, 0, 100), np.clip(prob_over_15, 0, 100)
+    
+    def calculate_indicators_batch(self, matches: List[Dict]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Os 9 indicadores de N jogos, antes da ponderação e do ajuste de HT
+        
+        Usado pelo otimizador: os indicadores são calculados uma vez e cada
+        conjunto de pesos/multiplicadores vira apenas uma soma ponderada.
+        
+        Args:
+            matches: Lista de match_data (mesmo formato de calculate_probabilities)
+        
+        Returns:
+            Dicionário indicador → (arrays Over 0.5, Over 1.5) em % de tamanho N
+        """
+        return self._calculate_batch_indicators(self._extract_batch_features(matches))
+    
+    def _extract_batch_features(self, matches: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Extrai os dados usados pelos indicadores para arrays (uma passada)
+        
+        Cada time é convertido para TeamPartials (memoizado, mesmos valores
+        dos métodos escalares); NaN aciona o fallback do indicador.
+        """
+        n = len(matches)
+        columns = (
+            'home_avg', 'away_avg', 'home_avg_home', 'away_avg_away', 'home_phase_played', 'away_phase_played',
+            'home_over_rate', 'away_over_rate', 'home_form', 'away_form',
+            'home_rank', 'away_rank', 'h2h_over_05', 'h2h_over_15'
+        )
+        features = {name: np.empty(n) for name in columns}
+        features['is_ht_0x0'] = np.zeros(n, dtype=bool)
+        
+        for i, match_data in enumerate(matches):
+            home = team_partials(TeamFeatures.coerce(match_data.get('home_stats')))
+            away = team_partials(TeamFeatures.coerce(match_data.get('away_stats')))
+            
+            for side, team in (('home', home), ('away', away)):
+                features[f'{side}_avg'][i] = team.goals_avg_total
+                features[f'{side}_phase_played'][i] = team.phase_played
+                features[f'{side}_over_rate'][i] = team.over_rate
+                features[f'{side}_form'][i] = team.form_score
+                features[f'{side}_rank'][i] = team.rank
+            
+            features['home_avg_home'][i] = home.goals_avg_home
+            features['away_avg_away'][i] = away.goals_avg_away
+            
+            features['h2h_over_05'][i], features['h2h_over_15'][i] = \
+                self._calculate_h2h_probability(match_data.get('h2h', []))
+            features['is_ht_0x0'][i] = bool(match_data.get('is_ht_0x0', False))
+        
+        return features
+    
+    def _calculate_batch_indicators(
+        self,
+        f: Dict[str, np.ndarray]
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Avalia os 9 indicadores como operações vetoriais
+        
+        Returns:
+            Dicionário indicador → (arrays Over 0.5, Over 1.5)
+        """
+        def fallback(invalid, values, default):
+            return np.where(invalid, default, values)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # 1. Poisson
+            expected_goals = (f['home_avg'] + f['away_avg']) / 2
+            over_lines = POISSON_TABLE.over(expected_goals) * 100
+            invalid = np.isnan(over_lines[:, 0])
+            poisson = (
+                fallback(invalid, over_lines[:, 0], 75.0),
+                fallback(invalid, over_lines[:, 1], 55.0),
+            )
             
-            home_avg = float(home_goals.get('total', 1.5))
-            away_avg = float(away_goals.get('total', 1.5))
+            # 2. Taxa histórica
+            hist_05 = (f['home_over_rate'] + f['away_over_rate']) / 2 * 100
+            invalid = np.isnan(hist_05)
+            historical_rate = (fallback(invalid, hist_05, 70.0), fallback(invalid, hist_05 * 0.70, 50.0))
+            
+            # 3. Tendência recente
+            avg_form = (f['home_form'] + f['away_form']) / 30
+            invalid = np.isnan(avg_form)
+            recent_trend = (
+                fallback(invalid, 60 + avg_form * 30, 70.0),
+                fallback(invalid, 40 + avg_form * 30, 50.0),
+            )
             
-            # Média de gols esperados no jogo
-            expected_goals = (home_avg + away_avg) / 2
+            # 4. Head-to-Head (calculado na extração)
+            h2h = (f['h2h_over_05'], f['h2h_over_15'])
             
-            # Poisson: P(X > k) = 1 - P(X <= k)
-            prob_0_goals = math.exp(-expected_goals)
-            prob_1_goal = expected_goals * math.exp(-expected_goals)
+            # 5. Força ofensiva
+            combined = f['home_avg'] + f['away_avg']
+            invalid = np.isnan(combined)
+            offensive_strength = (
+                fallback(invalid, np.minimum(95, 50 + combined * 15), 70.0),
+                fallback(invalid, np.minimum(85, 30 + combined * 15), 50.0),
+            )
             
-            prob_over_05 = (1 - prob_0_goals) * 100
-            prob_over_15 = (1 - prob_0_goals - prob_1_goal) * 100
+            # 6. Tendência ofensiva
+            combined = f['home_avg_home'] + f['away_avg_away']
+            invalid = np.isnan(combined)
+            offensive_trend = (
+                fallback(invalid, np.minimum(95, 50 + combined * 15), 70.0),
+                fallback(invalid, np.minimum(85, 30 + combined * 15), 50.0),
+            )
             
-            return prob_over_05, prob_over_15
+            # 7. Fase da temporada
+            avg_played = (f['home_phase_played'] + f['away_phase_played']) / 2
+            season_phase = (
+                np.select([avg_played < 10, avg_played < 25], [65.0, 75.0], 70.0),
+                np.select([avg_played < 10, avg_played < 25], [45.0, 55.0], 50.0),
+            )
+            
+            # 8. Motivação
+            avg_rank = (f['home_rank'] + f['away_rank']) / 2
+            clear_goals = (avg_rank <= 6) | (avg_rank >= 15)
+            motivation = (np.where(clear_goals, 75.0, 70.0), np.where(clear_goals, 55.0, 50.0))
+            
+            # 9. Importância do jogo
+            balanced = np.abs(f['home_rank'] - f['away_rank']) <= 3
+            match_importance = (np.where(balanced, 75.0, 70.0), np.where(balanced, 55.0, 50.0))
         
-        except Exception:
+        return {
+            'poisson': poisson,
+            'historical_rate': historical_rate,
+            'recent_trend': recent_trend,
+            'h2h': h2h,
+            'offensive_strength': offensive_strength,
+            'offensive_trend': offensive_trend,
+            'season_phase': season_phase,
+            'motivation': motivation,
+            'match_importance': match_importance,
+        }
+    
+    def _calculate_poisson_probability(
+        self, 
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
+    ) -> Tuple[float, float]:
+        """
+        Indicador 1: Distribuição de Poisson (25%)
+        Calcula probabilidade baseada em média de gols
+        """
+        # Média de gols esperados no jogo
+        expected_goals = (home_stats.goals_avg_total + away_stats.goals_avg_total) / 2
+        
+        # Poisson: P(X > k) = 1 - P(X <= k), consultado na tabela pré-calculada
+        over_lines = POISSON_TABLE.over_scalar(expected_goals)
+        
+        if math.isnan(over_lines[0]):
             # Fallback: valores conservadores
             return 75.0, 55.0
+        
+        return over_lines[0] * 100, over_lines[1] * 100
     
     def _calculate_historical_rate(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 2: Taxa histórica Over (15%)
         Baseado em jogos anteriores dos times
         """
-        try:
-            home_fixtures = home_stats.get('fixtures', {}).get('played', {}).get('total', 0)
-            away_fixtures = away_stats.get('fixtures', {}).get('played', {}).get('total', 0)
-            
-            if home_fixtures == 0 or away_fixtures == 0:
-                return 70.0, 50.0
-            
-            # Contar jogos com Over 0.5 e Over 1.5
-            home_goals_total = home_stats.get('goals', {}).get('for', {}).get('total', {}).get('total', 0)
-            away_goals_total = away_stats.get('goals', {}).get('for', {}).get('total', {}).get('total', 0)
-            
-            # Taxa Over 0.5 (jogos com pelo menos 1 gol)
-            home_over_05_rate = (home_goals_total / home_fixtures) if home_fixtures > 0 else 0.7
-            away_over_05_rate = (away_goals_total / away_fixtures) if away_fixtures > 0 else 0.7
-            
-            prob_over_05 = ((home_over_05_rate + away_over_05_rate) / 2) * 100
-            
-            # Taxa Over 1.5 (estimativa: ~70% da taxa Over 0.5)
-            prob_over_15 = prob_over_05 * 0.70
-            
-            return prob_over_05, prob_over_15
+        # Taxa Over 0.5 (jogos com pelo menos 1 gol)
+        prob_over_05 = ((home_stats.over_rate + away_stats.over_rate) / 2) * 100
         
-        except Exception:
+        # Time sem jogos (ou dados inválidos)
+        if math.isnan(prob_over_05):
             return 70.0, 50.0
+        
+        # Taxa Over 1.5 (estimativa: ~70% da taxa Over 0.5)
+        prob_over_15 = prob_over_05 * 0.70
+        
+        return prob_over_05, prob_over_15
     
     def _calculate_recent_trend(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 3: Tendência recente (10%)
-        Últimos 5 jogos dos times
+        Últimos 5 jogos dos times (W = 3 pontos, D = 1 ponto, L = 0 pontos)
         """
-        try:
-            # Usar forma recente (últimos 5 jogos)
-            home_form = home_stats.get('form', 'WWDWW')[-5:]
-            away_form = away_stats.get('form', 'WWDWW')[-5:]
-            
-            # W = 3 pontos, D = 1 ponto, L = 0 pontos
-            def form_score(form_str):
-                points = {'W': 3, 'D': 1, 'L': 0}
-                return sum(points.get(c, 1) for c in form_str)
-            
-            home_form_score = form_score(home_form)
-            away_form_score = form_score(away_form)
-            
-            # Times em boa forma tendem a marcar mais
-            avg_form = (home_form_score + away_form_score) / 30  # Máximo 30 pontos (5W+5W)
-            
-            prob_over_05 = 60 + (avg_form * 30)  # Range: 60-90%
-            prob_over_15 = 40 + (avg_form * 30)  # Range: 40-70%
-            
-            return prob_over_05, prob_over_15
+        # Times em boa forma tendem a marcar mais
+        avg_form = (home_stats.form_score + away_stats.form_score) / 30  # Máximo 30 pontos (5W+5W)
         
-        except Exception:
+        if math.isnan(avg_form):
             return 70.0, 50.0
+        
+        prob_over_05 = 60 + (avg_form * 30)  # Range: 60-90%
+        prob_over_15 = 40 + (avg_form * 30)  # Range: 40-70%
+        
+        return prob_over_05, prob_over_15
     
     def _calculate_h2h_probability(self, h2h_matches: List[Dict]) -> Tuple[float, float]:
         """
@@ -229,141 +558,104 @@ class ProbabilityCalculator:
     
     def _calculate_offensive_strength(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 5: Força ofensiva (10%)
         Capacidade de marcar gols dos times
         """
-        try:
-            home_goals_avg = float(
-                home_stats.get('goals', {}).get('for', {}).get('average', {}).get('total', 1.5)
-            )
-            away_goals_avg = float(
-                away_stats.get('goals', {}).get('for', {}).get('average', {}).get('total', 1.5)
-            )
-            
-            combined_avg = home_goals_avg + away_goals_avg
-            
-            # Normalizar para 0-100
-            # Média alta (>3.0) = alta probabilidade
-            prob_over_05 = min(95, 50 + (combined_avg * 15))
-            prob_over_15 = min(85, 30 + (combined_avg * 15))
-            
-            return prob_over_05, prob_over_15
+        combined_avg = home_stats.goals_avg_total + away_stats.goals_avg_total
         
-        except Exception:
+        if math.isnan(combined_avg):
             return 70.0, 50.0
+        
+        # Normalizar para 0-100
+        # Média alta (>3.0) = alta probabilidade
+        prob_over_05 = min(95, 50 + (combined_avg * 15))
+        prob_over_15 = min(85, 30 + (combined_avg * 15))
+        
+        return prob_over_05, prob_over_15
     
     def _calculate_offensive_trend(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 6: Tendência ofensiva (8%)
         Se os times estão marcando mais/menos recentemente
         """
-        try:
-            # Comparar gols home vs away
-            home_goals_home = float(
-                home_stats.get('goals', {}).get('for', {}).get('average', {}).get('home', 1.5)
-            )
-            away_goals_away = float(
-                away_stats.get('goals', {}).get('for', {}).get('average', {}).get('away', 1.5)
-            )
-            
-            # Casa marca mais em casa + Visitante marca fora = bom sinal
-            combined = home_goals_home + away_goals_away
-            
-            prob_over_05 = min(95, 50 + (combined * 15))
-            prob_over_15 = min(85, 30 + (combined * 15))
-            
-            return prob_over_05, prob_over_15
+        # Casa marca mais em casa + Visitante marca fora = bom sinal
+        combined = home_stats.goals_avg_home + away_stats.goals_avg_away
         
-        except Exception:
+        if math.isnan(combined):
             return 70.0, 50.0
+        
+        prob_over_05 = min(95, 50 + (combined * 15))
+        prob_over_15 = min(85, 30 + (combined * 15))
+        
+        return prob_over_05, prob_over_15
     
     def _calculate_season_phase(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 7: Fase da temporada (8%)
         Início/meio/fim da temporada afeta comportamento
         """
-        try:
-            home_played = home_stats.get('fixtures', {}).get('played', {}).get('total', 10)
-            away_played = away_stats.get('fixtures', {}).get('played', {}).get('total', 10)
-            
-            avg_played = (home_played + away_played) / 2
-            
-            # Início temporada (< 10 jogos): times mais cautelosos
-            # Meio temporada (10-25 jogos): jogos mais abertos
-            # Final temporada (> 25 jogos): depende de objetivos
-            
-            if avg_played < 10:
-                return 65.0, 45.0  # Início: mais cauteloso
-            elif avg_played < 25:
-                return 75.0, 55.0  # Meio: mais aberto
-            else:
-                return 70.0, 50.0  # Final: médio
+        avg_played = (home_stats.phase_played + away_stats.phase_played) / 2
         
-        except Exception:
-            return 70.0, 50.0
+        # Início temporada (< 10 jogos): times mais cautelosos
+        # Meio temporada (10-25 jogos): jogos mais abertos
+        # Final temporada (> 25 jogos): depende de objetivos
+        
+        if avg_played < 10:
+            return 65.0, 45.0  # Início: mais cauteloso
+        elif avg_played < 25:
+            return 75.0, 55.0  # Meio: mais aberto
+        else:
+            return 70.0, 50.0  # Final (ou dados inválidos): médio
     
     def _calculate_motivation(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 8: Motivação dos times (7%)
         Times lutando por objetivos jogam diferente
         """
-        try:
-            # Baseado na posição na tabela (aproximação)
-            home_rank = home_stats.get('league', {}).get('rank', 10)
-            away_rank = away_stats.get('league', {}).get('rank', 10)
-            
-            # Times brigando por título/rebaixamento: mais intenso
-            # Times meio de tabela: menos intenso
-            
-            avg_rank = (home_rank + away_rank) / 2
-            
-            if avg_rank <= 6 or avg_rank >= 15:
-                # Times com objetivos claros: mais gols
-                return 75.0, 55.0
-            else:
-                # Meio de tabela: médio
-                return 70.0, 50.0
+        # Baseado na posição na tabela (aproximação)
+        # Times brigando por título/rebaixamento: mais intenso
+        # Times meio de tabela: menos intenso
         
-        except Exception:
+        avg_rank = (home_stats.rank + away_stats.rank) / 2
+        
+        if avg_rank <= 6 or avg_rank >= 15:
+            # Times com objetivos claros: mais gols
+            return 75.0, 55.0
+        else:
+            # Meio de tabela (ou dados inválidos): médio
             return 70.0, 50.0
     
     def _calculate_match_importance(
         self, 
-        home_stats: Dict, 
-        away_stats: Dict
+        home_stats: TeamPartials, 
+        away_stats: TeamPartials
     ) -> Tuple[float, float]:
         """
         Indicador 9: Importância do jogo (5%)
         Derbies, clássicos, jogos decisivos
         """
-        try:
-            # Simplificado: baseado na diferença de ranking
-            home_rank = home_stats.get('league', {}).get('rank', 10)
-            away_rank = away_stats.get('league', {}).get('rank', 10)
-            
-            rank_diff = abs(home_rank - away_rank)
-            
-            # Times equilibrados (rank_diff pequeno): jogo mais disputado
-            if rank_diff <= 3:
-                return 75.0, 55.0
-            else:
-                return 70.0, 50.0
+        # Simplificado: baseado na diferença de ranking
+        rank_diff = abs(home_stats.rank - away_stats.rank)
         
-        except Exception:
+        # Times equilibrados (rank_diff pequeno): jogo mais disputado
+        if rank_diff <= 3:
+            return 75.0, 55.0
+        else:
             return 70.0, 50.0
+
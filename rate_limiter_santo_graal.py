@@ -0,0 +1,106 @@
+"""
+Rate Limiter para Santo Graal Bot EV+
+Token bucket compartilhado entre threads, corrigido pelos headers da API-Football
+"""
+
+import logging
+import threading
+import time
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket seguro para uso entre threads.
+
+    - Capacidade e taxa de reposição iniciais: `rate_per_minute`
+      (Config.API_RATE_LIMIT)
+    - Cada requisição consome 1 token; sem tokens, aguarda a reposição
+    - Corrigido continuamente pelos headers de resposta da API:
+        X-RateLimit-Limit            → requisições/minuto do plano
+        X-RateLimit-Remaining        → tokens restantes no minuto atual
+        x-ratelimit-requests-remaining → quota diária restante
+    """
+
+    def __init__(self, rate_per_minute: int):
+        """
+        Inicializa o limitador
+
+        Args:
+            rate_per_minute: Requisições permitidas por minuto
+        """
+        self.capacity = float(max(1, rate_per_minute))
+        self.refill_rate = self.capacity / 60.0  # Tokens por segundo
+        self.tokens = self.capacity
+        self.daily_remaining: Optional[int] = None
+
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver um token disponível e o consome"""
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.refill_rate
+
+            time.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Ajusta o bucket com os headers x-ratelimit-* da resposta
+
+        Args:
+            headers: Headers HTTP da resposta (case-insensitive)
+        """
+        limit = self._header_int(headers, 'X-RateLimit-Limit')
+        remaining = self._header_int(headers, 'X-RateLimit-Remaining')
+        daily_remaining = self._header_int(headers, 'x-ratelimit-requests-remaining')
+
+        with self._lock:
+            self._refill()
+
+            if limit and limit != self.capacity:
+                logger.info(f"⚙️ Rate limit ajustado pela API: {limit} req/min")
+                self.capacity = float(limit)
+                self.refill_rate = self.capacity / 60.0
+
+            # O servidor é a fonte de verdade: nunca ficar acima do que ele permite
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+                if daily_remaining <= 0:
+                    logger.warning("⚠️ Quota diária da API esgotada")
+
+            self.tokens = min(self.tokens, self.capacity)
+
+    def throttled(self):
+        """Registra uma resposta 429: esvazia o bucket"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+    def _refill(self):
+        """Repõe tokens pelo tempo decorrido (chamar com lock adquirido)"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+
+    @staticmethod
+    def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+        """Lê um header numérico (None se ausente ou inválido)"""
+        value = headers.get(name)
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
@@ -9,17 +9,30 @@ import time
 import requests
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 # Imports para HTTP endpoint (Render Web Service)
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Imports locais
 from config_santo_graal import Config
 from probability_calculator_santo_graal import ProbabilityCalculator
 from ev_detector_santo_graal import EVDetector
+from rate_limiter_santo_graal import TokenBucketRateLimiter
+from api_client_santo_graal import APIFootballClient
+from cache_santo_graal import TeamStatsCache, H2HStore
+from team_features_santo_graal import TeamFeatures
+from prefetch_santo_graal import PrefetchPipeline
+from scheduler_santo_graal import HalftimeScheduler
+from live_tracker_santo_graal import LiveSnapshotTracker
+from in_play_santo_graal import InPlayState, InPlayTracker
+from odds_santo_graal import OddsBook, extract_market_odds, parse_odds_stream
+from score_matrix_santo_graal import MARKETS as SCORE_MATRIX_MARKETS
+from live_odds_santo_graal import LiveOddsWatcher, parse_live_odds_stream
+from portfolio_santo_graal import KellyPortfolio
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -167,16 +180,47 @@ class SantoGraalBot:
             raise ValueError("❌ API_FOOTBALL_KEY não encontrada no .env")
         
         self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {
-            'x-apisports-key': self.api_key
-        }
+        
+        # Token bucket compartilhado entre todas as threads de requisição
+        self.rate_limiter = TokenBucketRateLimiter(Config.API_RATE_LIMIT)
+        
+        # Cliente HTTP único (keep-alive, retry, timeout)
+        self.api = APIFootballClient(self.api_key, self.base_url, self.rate_limiter)
         
         self.probability_calculator = ProbabilityCalculator()
         self.ev_detector = EVDetector()
         
+        # Cache persistente de estatísticas de times (SQLite)
+        self.team_stats_cache = TeamStatsCache()
+        
+        # Histórico H2H persistente (apenas incrementado)
+        self.h2h_store = H2HStore()
+        
+        # Prefetch pré-jogo (stats, H2H e probabilidades)
+        self.prefetch = PrefetchPipeline(self)
+        
+        # Agenda das janelas de HT (baseada nos kickoffs)
+        self.ht_scheduler = HalftimeScheduler()
+        
+        # Snapshot anterior dos jogos ao vivo (emite apenas mudanças)
+        self.live_tracker = LiveSnapshotTracker()
+        self.in_play = InPlayTracker()
+        
+        # Jogos HT 0-0 acompanhados no 2º tempo via /odds/live
+        self.live_odds = LiveOddsWatcher()
+        
+        # Apostas notificadas em aberto (stakes conjuntos, exposição total limitada)
+        self.portfolio = KellyPortfolio()
+        
+        # Jogos HT 0-0 ainda sem análise concluída (refeita a cada ciclo)
+        self.pending_ht: Dict[int, Dict] = {}
+        
         # Cache para evitar notificações duplicadas
         self.notified_fixtures = set()
         
+        # EV- é educativo: enviar uma vez por jogo/mercado, mesmo com HT consultado a cada minuto
+        self.ev_negative_notified = set()
+        
         logger.info("Santo Graal Bot EV+ inicializado")
     
     def get_upcoming_fixtures(self, hours_ahead: int = 24) -> List[Dict]:
@@ -197,7 +241,7 @@ class SantoGraalBot:
         
         for league_id in Config.get_active_leagues():
             try:
-                url = f"{self.base_url}/fixtures"
+                endpoint = '/fixtures'
                 params = {
                     'league': league_id,
                     'season': Config.SEASON,
@@ -205,7 +249,7 @@ class SantoGraalBot:
                     'to': date_to
                 }
                 
-                response = requests.get(url, headers=self.headers, params=params, timeout=10)
+                response = self.api.get(endpoint, params)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -214,46 +258,149 @@ class SantoGraalBot:
                 else:
                     logger.warning(f"⚠️ Erro ao buscar fixtures da liga {league_id}: {response.status_code}")
                 
-                time.sleep(0.5)  # Rate limiting
-                
             except Exception as e:
                 logger.error(f"❌ Exceção ao buscar fixtures da liga {league_id}: {e}")
         
         return fixtures
     
-    def get_live_fixtures(self) -> List[Dict]:
+    def get_live_fixtures(self) -> Optional[List[Dict]]:
         """
         Busca jogos ao vivo nas ligas configuradas
         ⚠️ CRÍTICO: NÃO usar 'season' com 'live'!
         
+        Modo definido por Config.LIVE_FETCH_MODE:
+        - 'batch': uma única requisição, filtrada localmente
+        - 'concurrent': todas as ligas em paralelo (pool limitado)
+        - 'sequential': uma liga por vez
+        
+        Returns:
+            Lista de fixtures ao vivo, ou None se alguma requisição falhou
+            (resultado incompleto: não serve como snapshot)
+        """
+        leagues = Config.get_active_leagues()
+        
+        if Config.LIVE_FETCH_MODE == 'batch':
+            return self._get_live_fixtures_batch(leagues)
+        
+        if Config.LIVE_FETCH_MODE == 'concurrent' and len(leagues) > 1:
+            workers = min(Config.MAX_CONCURRENT_REQUESTS, len(leagues))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._get_live_fixtures_for_league, leagues))
+        else:
+            results = [self._get_live_fixtures_for_league(league_id) for league_id in leagues]
+        
+        if any(league_fixtures is None for league_fixtures in results):
+            return None
+        return [f for league_fixtures in results for f in league_fixtures]
+    
+    def _get_live_fixtures_batch(self, leagues: List[int]) -> Optional[List[Dict]]:
+        """
+        Busca jogos ao vivo de todas as ligas em uma única requisição
+        
+        Usa o formato live=id-id-id (ou live=all) e filtra localmente
+        pelas ligas ativas.
+        
+        Args:
+            leagues: IDs das ligas ativas
+        
         Returns:
-            Lista de fixtures ao vivo
+            Lista de fixtures ao vivo das ligas ativas, ou None se a requisição falhou
+        """
+        active = set(leagues)
+        
+        try:
+            endpoint = '/fixtures'
+            if Config.LIVE_BATCH_BY_LEAGUE_IDS:
+                live = '-'.join(str(league_id) for league_id in leagues)
+            else:
+                live = 'all'
+            params = {'live': live}
+            
+            response = self.api.get(endpoint, params)
+            
+            if response.status_code == 200:
+                data = response.json()
+                fixtures = [
+                    f for f in data.get('response') or []
+                    if f.get('league', {}).get('id') in active
+                ]
+                logger.info(f"✅ {len(fixtures)} jogos ao vivo em {len(active)} ligas (1 requisição)")
+                return fixtures
+            else:
+                logger.warning(f"⚠️ Erro ao buscar live fixtures em lote: {response.status_code}")
+        
+        except Exception as e:
+            logger.error(f"❌ Exceção ao buscar live fixtures em lote: {e}")
+        
+        return None
+    
+    def _get_live_fixtures_for_league(self, league_id: int) -> Optional[List[Dict]]:
+        """
+        Busca jogos ao vivo de uma única liga
+        
+        Args:
+            league_id: ID da liga
+        
+        Returns:
+            Lista de fixtures ao vivo da liga, ou None se a requisição falhou
+        """
+        try:
+            endpoint = '/fixtures'
+            params = {
+                'league': league_id,
+                # NÃO INCLUIR 'season' aqui! API não aceita com 'live'
+                'live': 'all'
+            }
+            
+            response = self.api.get(endpoint, params)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('response'):
+                    logger.info(f"✅ Liga {league_id}: {len(data['response'])} jogos ao vivo")
+                    return data['response']
+                return []
+            else:
+                logger.warning(f"⚠️ Erro ao buscar live fixtures da liga {league_id}: {response.status_code}")
+        
+        except Exception as e:
+            logger.error(f"❌ Exceção ao buscar live fixtures da liga {league_id}: {e}")
+        
+        return None
+    
+    def get_fixtures_by_ids(self, fixture_ids: List[int]) -> Optional[List[Dict]]:
+        """
+        Busca o estado atual de jogos específicos (ids=id-id-id)
+        
+        Args:
+            fixture_ids: IDs dos jogos
+        
+        Returns:
+            Lista de fixtures, ou None se alguma requisição falhou
         """
         fixtures = []
+        chunk_size = Config.FIXTURE_IDS_PER_REQUEST
         
-        for league_id in Config.get_active_leagues():
+        for start in range(0, len(fixture_ids), chunk_size):
+            chunk = fixture_ids[start:start + chunk_size]
             try:
-                url = f"{self.base_url}/fixtures"
-                params = {
-                    'league': league_id,
-                    # NÃO INCLUIR 'season' aqui! API não aceita com 'live'
-                    'live': 'all'
-                }
+                endpoint = '/fixtures'
+                params = {'ids': '-'.join(str(fixture_id) for fixture_id in chunk)}
                 
-                response = requests.get(url, headers=self.headers, params=params, timeout=10)
+                response = self.api.get(endpoint, params)
                 
                 if response.status_code == 200:
                     data = response.json()
                     if data.get('response'):
                         fixtures.extend(data['response'])
-                        logger.info(f"✅ Liga {league_id}: {len(data['response'])} jogos ao vivo")
+                    continue
                 else:
-                    logger.warning(f"⚠️ Erro ao buscar live fixtures da liga {league_id}: {response.status_code}")
-                
-                time.sleep(0.5)  # Rate limiting
-                
+                    logger.warning(f"⚠️ Erro ao buscar jogos por ID: {response.status_code}")
+            
             except Exception as e:
-                logger.error(f"❌ Exceção ao buscar live fixtures da liga {league_id}: {e}")
+                logger.error(f"❌ Exceção ao buscar jogos por ID: {e}")
+            
+            return None
         
         return fixtures
     
@@ -268,10 +415,10 @@ class SantoGraalBot:
             Dicionário com estatísticas ou None
         """
         try:
-            url = f"{self.base_url}/fixtures/statistics"
+            endpoint = '/fixtures/statistics'
             params = {'fixture': fixture_id}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.api.get(endpoint, params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -285,31 +432,78 @@ class SantoGraalBot:
         
         return None
     
-    def get_team_statistics(self, team_id: int, league_id: int) -> Optional[Dict]:
+    def poll_in_play_stats(self, fixtures: List[Dict]):
+        """
+        Atualiza o modelo in-play dos jogos ainda 0-0 no 1º tempo
+        
+        Uma requisição de /fixtures/statistics por jogo, em paralelo; cada
+        snapshot é incorporado em O(1) à média móvel do jogo.
+        
+        Args:
+            fixtures: Jogos ao vivo (os que não estão 0-0 no 1º tempo são ignorados)
+        """
+        first_half_0x0 = [
+            f for f in fixtures
+            if f['fixture'].get('status', {}).get('short') == '1H'
+            and f.get('goals', {}).get('home') == 0 and f.get('goals', {}).get('away') == 0
+        ]
+        if not first_half_0x0:
+            return
+        
+        with ThreadPoolExecutor(max_workers=Config.MAX_CONCURRENT_REQUESTS) as executor:
+            list(executor.map(self.update_in_play, first_half_0x0))
+        logger.info(f"📈 Estatísticas in-play atualizadas: {len(first_half_0x0)} jogos 0-0 no 1º tempo")
+    
+    def update_in_play(self, fixture: Dict) -> InPlayState:
+        """
+        Busca as estatísticas ao vivo e atualiza o estado in-play do jogo
+        
+        Args:
+            fixture: Dados do jogo (ao vivo)
+        
+        Returns:
+            Estado in-play atualizado
+        """
+        fixture_id = fixture['fixture']['id']
+        minute = fixture['fixture'].get('status', {}).get('elapsed')
+        statistics = self.get_fixture_statistics(fixture_id)
+        
+        return self.in_play.update(fixture_id, statistics, minute, fixture['teams']['home']['id'])
+    
+    def get_team_statistics(self, team_id: int, league_id: int) -> Optional[TeamFeatures]:
         """
         Busca estatísticas de um time na temporada
         
+        O payload da API é convertido uma única vez em TeamFeatures,
+        que é o que o calculador consome e o cache armazena.
+        
         Args:
             team_id: ID do time
             league_id: ID da liga
         
         Returns:
-            Dicionário com estatísticas ou None
+            TeamFeatures com as estatísticas ou None
         """
+        cached = self.team_stats_cache.get(team_id, league_id, Config.SEASON)
+        if cached is not None:
+            return cached
+        
         try:
-            url = f"{self.base_url}/teams/statistics"
+            endpoint = '/teams/statistics'
             params = {
                 'team': team_id,
                 'league': league_id,
                 'season': Config.SEASON
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.api.get(endpoint, params)
             
             if response.status_code == 200:
                 data = response.json()
                 if data.get('response'):
-                    return data['response']
+                    features = TeamFeatures.from_stats(data['response'])
+                    self.team_stats_cache.set(team_id, league_id, Config.SEASON, features)
+                    return features
             else:
                 logger.warning(f"⚠️ Erro ao buscar estatísticas do time {team_id}: {response.status_code}")
             
@@ -322,6 +516,9 @@ class SantoGraalBot:
         """
         Busca histórico de confrontos diretos
         
+        Servido do H2HStore local; a API só é consultada quando o par
+        nunca foi sincronizado ou a sincronização expirou.
+        
         Args:
             team1_id: ID do primeiro time
             team2_id: ID do segundo time
@@ -330,95 +527,115 @@ class SantoGraalBot:
         Returns:
             Lista de confrontos
         """
+        if not self.h2h_store.needs_sync(team1_id, team2_id):
+            return self.h2h_store.get(team1_id, team2_id, last_n)
+        
         try:
-            url = f"{self.base_url}/fixtures/headtohead"
+            endpoint = '/fixtures/headtohead'
             params = {
                 'h2h': f"{team1_id}-{team2_id}",
                 'last': last_n
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.api.get(endpoint, params)
             
             if response.status_code == 200:
                 data = response.json()
-                if data.get('response'):
-                    return data['response']
+                new_matches = self.h2h_store.append(team1_id, team2_id, data.get('response') or [])
+                if new_matches:
+                    logger.info(f"💾 H2H {team1_id}-{team2_id}: {new_matches} novos confrontos armazenados")
             else:
                 logger.warning(f"⚠️ Erro ao buscar H2H {team1_id}-{team2_id}: {response.status_code}")
             
         except Exception as e:
             logger.error(f"❌ Exceção ao buscar H2H {team1_id}-{team2_id}: {e}")
         
-        return []
+        # Em caso de falha, usar o que já estiver armazenado
+        return self.h2h_store.get(team1_id, team2_id, last_n)
     
-    def get_odds(self, fixture_id: int) -> Optional[Dict]:
+    def get_odds(self, fixture_id: int, markets: Optional[List[str]] = None) -> Optional[Dict]:
         """
-        Busca odds de um jogo específico
+        Busca odds de um jogo específico (todas as casas de apostas)
+        
+        A resposta é lida de forma incremental (parse_odds_stream) e só os
+        mercados precificados são mantidos em memória.
         
         Args:
             fixture_id: ID do jogo
+            markets: Mercados mantidos (default: Config.HT_MARKETS)
         
         Returns:
-            Dicionário com odds ou None
+            Dicionário com odds (apenas os mercados pedidos) ou None
         """
         try:
-            url = f"{self.base_url}/odds"
-            params = {
-                'fixture': fixture_id,
-                'bookmaker': Config.BOOKMAKER_ID
-            }
+            endpoint = '/odds'
+            params = {'fixture': fixture_id}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.api.get(endpoint, params, stream=True)
             
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('response'):
-                    return data['response'][0] if data['response'] else None
-            else:
+            try:
+                if response.status_code == 200:
+                    return parse_odds_stream(response.raw, markets or Config.HT_MARKETS)
                 logger.warning(f"⚠️ Erro ao buscar odds do jogo {fixture_id}: {response.status_code}")
+            finally:
+                response.close()
             
         except Exception as e:
             logger.error(f"❌ Exceção ao buscar odds do jogo {fixture_id}: {e}")
         
         return None
     
-    def extract_over_odds(self, odds_data: Dict) -> Tuple[Optional[float], Optional[float]]:
+    def get_live_odds(self, queries: List[Dict], fixture_ids: List[int]) -> List[Dict]:
         """
-        Extrai odds de Over 0.5 e Over 1.5 dos dados da API
+        Busca odds ao vivo dos jogos observados
+        
+        Uma consulta por jogo ou por liga (LiveOddsWatcher.queries), nunca
+        /odds/live sem filtro; a resposta é lida de forma incremental e só os
+        itens dos jogos observados são mantidos (parse_live_odds_stream).
         
         Args:
-            odds_data: Dados de odds da API
+            queries: Parâmetros de cada consulta
+            fixture_ids: IDs dos jogos observados
         
         Returns:
-            Tuple (over_05_odds, over_15_odds)
+            Itens de /odds/live dos jogos pedidos
         """
-        over_05 = None
-        over_15 = None
+        items = []
+        endpoint = '/odds/live'
         
-        if not odds_data or 'bookmakers' not in odds_data:
-            return over_05, over_15
-        
-        try:
-            bookmakers = odds_data['bookmakers']
+        for params in queries:
+            try:
+                response = self.api.get(endpoint, params, stream=True)
+                try:
+                    if response.status_code == 200:
+                        items.extend(parse_live_odds_stream(response.raw, fixture_ids))
+                    else:
+                        logger.warning(f"⚠️ Erro ao buscar odds ao vivo ({params}): {response.status_code}")
+                finally:
+                    response.close()
             
-            for bookmaker in bookmakers:
-                if 'bets' not in bookmaker:
-                    continue
-                
-                for bet in bookmaker['bets']:
-                    if bet['name'] == 'Goals Over/Under':
-                        for value in bet['values']:
-                            if value['value'] == 'Over 0.5':
-                                over_05 = float(value['odd'])
-                            elif value['value'] == 'Over 1.5':
-                                over_15 = float(value['odd'])
+            except Exception as e:
+                logger.error(f"❌ Exceção ao buscar odds ao vivo ({params}): {e}")
         
-        except Exception as e:
-            logger.error(f"❌ Erro ao extrair odds: {e}")
+        return items
+    
+    def extract_market_odds(self, odds_data: Dict, markets: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Extrai as melhores odds de cada mercado entre todas as casas
+        
+        Preços acima de Config.MAX_ODDS_RANGE são ignorados (mesmo critério
+        de process_fixture), para não descartar o mercado por um outlier.
         
-        return over_05, over_15
+        Args:
+            odds_data: Dados de odds da API
+            markets: Mercados extraídos (default: todos os da ScoreMatrix)
+        
+        Returns:
+            Dicionário mercado → odds (apenas mercados com preço)
+        """
+        return extract_market_odds(odds_data, markets or SCORE_MATRIX_MARKETS, max_odds=Config.MAX_ODDS_RANGE)
     
-    def check_0x0_draw_rate(self, team1_stats: Dict, team2_stats: Dict) -> bool:
+    def check_0x0_draw_rate(self, team1_stats: TeamFeatures, team2_stats: TeamFeatures) -> bool:
         """
         Verifica se ambos os times têm taxa de empate 0-0 <= 15%
         
@@ -431,24 +648,20 @@ class SantoGraalBot:
         """
         try:
             # Time 1
-            fixtures1 = team1_stats.get('fixtures', {})
-            draws1 = fixtures1.get('draws', {}).get('total', 0)
-            total1 = fixtures1.get('played', {}).get('total', 0)
+            total1 = team1_stats.played or 0
             
             if total1 == 0:
                 return False
             
-            draw_rate1 = (draws1 / total1) * 100
+            draw_rate1 = (team1_stats.draws / total1) * 100
             
             # Time 2
-            fixtures2 = team2_stats.get('fixtures', {})
-            draws2 = fixtures2.get('draws', {}).get('total', 0)
-            total2 = fixtures2.get('played', {}).get('total', 0)
+            total2 = team2_stats.played or 0
             
             if total2 == 0:
                 return False
             
-            draw_rate2 = (draws2 / total2) * 100
+            draw_rate2 = (team2_stats.draws / total2) * 100
             
             logger.info(f"📊 Taxa empate 0-0: Time1={draw_rate1:.1f}%, Time2={draw_rate2:.1f}%")
             
@@ -488,19 +701,24 @@ class SantoGraalBot:
             logger.error(f"❌ Erro ao verificar HT 0-0: {e}")
             return False
     
-    def process_fixture(self, fixture: Dict):
+    def process_fixture(self, fixture: Dict) -> bool:
         """
         Processa um jogo e detecta oportunidades EV+
         
         Args:
             fixture: Dados do jogo
+        
+        Returns:
+            True se a análise foi concluída; False se faltaram dados
+            (estatísticas, odds ainda não publicadas) ou houve erro,
+            e o jogo deve ser analisado de novo no próximo ciclo
         """
         try:
             fixture_id = fixture['fixture']['id']
             
             # Evitar processar múltiplas vezes
             if fixture_id in self.notified_fixtures:
-                return
+                return True
             
             home_team = fixture['teams']['home']
             away_team = fixture['teams']['away']
@@ -508,60 +726,110 @@ class SantoGraalBot:
             
             logger.info(f"🔍 Processando: {home_team['name']} vs {away_team['name']}")
             
-            # Buscar estatísticas dos times
-            home_stats = self.get_team_statistics(home_team['id'], league['id'])
-            away_stats = self.get_team_statistics(away_team['id'], league['id'])
+            prefetched = self.prefetch.get(fixture_id)
+            
+            if prefetched:
+                # Dados preparados antes do kickoff: sem chamadas de rede
+                home_stats = prefetched['home_stats']
+                away_stats = prefetched['away_stats']
+            else:
+                # Buscar estatísticas dos times
+                home_stats = self.get_team_statistics(home_team['id'], league['id'])
+                away_stats = self.get_team_statistics(away_team['id'], league['id'])
             
             if not home_stats or not away_stats:
                 logger.warning("⚠️ Não foi possível obter estatísticas dos times")
-                return
+                return False
             
             # Verificar taxa de empate 0-0
             if not self.check_0x0_draw_rate(home_stats, away_stats):
                 logger.info("❌ Times não atendem critério de taxa de empate 0-0")
-                return
-            
-            # Buscar H2H
-            h2h_matches = self.get_h2h(home_team['id'], away_team['id'])
+                return True
             
-            # Calcular probabilidades
             match_data = {
+                'fixture_id': fixture_id,
                 'home_stats': home_stats,
                 'away_stats': away_stats,
-                'h2h': h2h_matches,
+                'h2h': prefetched['h2h'] if prefetched else None,
                 'is_ht_0x0': True  # Sabemos que está 0-0 no HT
             }
             
-            prob_over_05, prob_over_15 = self.probability_calculator.calculate_probabilities(match_data)
+            # Calcular probabilidades
+            if prefetched:
+                prematch = prefetched['prematch']
+            else:
+                # Buscar H2H
+                match_data['h2h'] = self.get_h2h(home_team['id'], away_team['id'])
+                prematch = self.probability_calculator.calculate_prematch_probabilities(match_data)
+            
+            prob_over_05, prob_over_15 = self.probability_calculator.apply_ht_adjustment(
+                *prematch,
+                is_ht_0x0=True
+            )
+            
+            # Ajustar pelo 1º tempo (finalizações, escanteios, xG): estado já
+            # acumulado por poll_in_play_stats, sem requisição no intervalo
+            in_play = self.in_play.get(fixture_id) if Config.IN_PLAY_ENABLED else None
+            if in_play is not None and in_play.snapshots:
+                factor = in_play.expected_goals_factor()
+                prob_over_05, prob_over_15 = in_play.adjust(prob_over_05, prob_over_15)
+                logger.info(f"📈 Fator in-play: {factor:.2f} ({in_play.snapshots} snapshots)")
+            
+            probabilities = {'Over 0.5': prob_over_05, 'Over 1.5': prob_over_15}
+            
+            # Demais mercados: uma única matriz de placar por jogo
+            if any(market not in probabilities for market in Config.HT_MARKETS):
+                probabilities = self.probability_calculator.calculate_market_probabilities(
+                    match_data,
+                    ht_probabilities=(prob_over_05, prob_over_15)
+                )
             
             logger.info(f"📊 Probabilidades: Over 0.5 = {prob_over_05:.1f}%, Over 1.5 = {prob_over_15:.1f}%")
             
+            # Acompanhar as odds ao vivo no 2º tempo (mesmo sem EV+ agora)
+            if Config.LIVE_ODDS_ENABLED:
+                self.live_odds.watch(fixture, probabilities)
+            
             # Buscar odds
             odds_data = self.get_odds(fixture_id)
             
             if not odds_data:
                 logger.warning("⚠️ Não foi possível obter odds")
-                return
+                return False
             
-            over_05_odds, over_15_odds = self.extract_over_odds(odds_data)
+            # Livro com todas as casas: melhor preço por mercado
+            odds_book = OddsBook.from_payload(odds_data, markets=Config.HT_MARKETS)
+            best_prices = {
+                market: odds_book.best(market, max_odds=Config.MAX_ODDS_RANGE)
+                for market in Config.HT_MARKETS
+            }
+            available = [market for market, price in best_prices.items() if price]
             
-            if not over_05_odds or not over_15_odds:
-                logger.warning("⚠️ Odds Over 0.5/1.5 não disponíveis")
-                return
+            if not available:
+                logger.warning(f"⚠️ Odds não disponíveis para {', '.join(Config.HT_MARKETS)}")
+                return False
             
-            logger.info(f"💰 Odds: Over 0.5 = {over_05_odds}, Over 1.5 = {over_15_odds}")
+            logger.info("💰 Melhores odds: " + ", ".join(
+                f"{market} = {best_prices[market][0]} ({best_prices[market][2]})" for market in available
+            ))
             
             # Detectar EV+
-            opportunities = self.ev_detector.detect_ev_opportunities(
-                prob_over_05=prob_over_05,
-                prob_over_15=prob_over_15,
-                over_05_odds=over_05_odds,
-                over_15_odds=over_15_odds
+            opportunities = self.ev_detector.detect_book_opportunities(
+                probabilities=probabilities,
+                odds_book=odds_book,
+                markets=available
             )
             
-            # Processar oportunidades EV+
+            # Stakes conjuntos com as apostas já abertas
+            sized = self.size_opportunities(fixture_id, [opp for opp in opportunities if opp['is_ev_positive']])
+            
+            # Processar oportunidades EV+ (falha no envio: analisar de novo no próximo ciclo)
+            completed = True
             for opp in opportunities:
                 if opp['is_ev_positive']:
+                    if id(opp) not in sized:
+                        continue
+                    
                     message = self.ev_detector.format_ev_message(
                         fixture=fixture,
                         opportunity=opp
@@ -570,52 +838,238 @@ class SantoGraalBot:
                     if send_telegram_notification(message):
                         logger.info("✅ Notificação EV+ enviada!")
                         self.notified_fixtures.add(fixture_id)
+                        self.live_odds.unwatch(fixture_id)
                     else:
                         logger.error("❌ Falha ao enviar notificação EV+")
+                        self.portfolio.release(fixture_id, opp['market'])
+                        completed = False
                 
                 # Enviar notificação EV- se configurado
-                elif Config.SEND_EV_NEGATIVE:
+                elif Config.SEND_EV_NEGATIVE and (fixture_id, opp['market']) not in self.ev_negative_notified:
                     message = self.ev_detector.format_ev_negative_message(
                         fixture=fixture,
                         opportunity=opp
                     )
                     
-                    send_telegram_notification(message)
+                    if send_telegram_notification(message):
+                        self.ev_negative_notified.add((fixture_id, opp['market']))
                     logger.info("📚 Notificação EV- (educativa) enviada")
+            
+            return completed
         
         except Exception as e:
             logger.error(f"❌ Erro ao processar fixture: {e}")
+            return False
+    
+    def size_opportunities(self, fixture_id: int, opportunities: List[Dict]) -> Set[int]:
+        """
+        Recalcula os stakes das oportunidades EV+ em conjunto com as apostas abertas
+        
+        Com Config.PORTFOLIO_KELLY_ENABLED, 'kelly_stake'/'stake_percent' passam
+        a ser os do Kelly de portfólio (limite por aposta e exposição total);
+        oportunidades sem espaço na banca ficam com stake 0 e não são notificadas.
+        
+        Args:
+            fixture_id: ID do jogo
+            opportunities: Oportunidades EV+ do jogo
+        
+        Returns:
+            id() das oportunidades a notificar
+        """
+        if not Config.PORTFOLIO_KELLY_ENABLED or not opportunities:
+            return {id(opp) for opp in opportunities}
+        
+        accepted = {id(opp) for opp in self.portfolio.allocate(fixture_id, opportunities)}
+        
+        for opp in opportunities:
+            if id(opp) not in accepted:
+                logger.info(
+                    f"🏦 {opp['market']} (jogo {fixture_id}) sem stake: exposição total "
+                    f"{self.portfolio.exposure() * 100:.1f}% / {Config.MAX_TOTAL_EXPOSURE_PERCENT:.0f}%"
+                )
+        
+        return accepted
+    
+    def poll_live_odds(self):
+        """
+        Consulta /odds/live e reavalia apenas os jogos com preço alterado
+        
+        Probabilidades do HT reescaladas pelo tempo restante; só os mercados
+        cujo preço mudou são passados ao EVDetector.
+        """
+        fixture_ids = self.live_odds.fixture_ids()
+        if not fixture_ids:
+            return
+        
+        changes = self.live_odds.update(self.get_live_odds(self.live_odds.queries(), fixture_ids))
+        logger.info(f"📡 Odds ao vivo: {len(fixture_ids)} jogos observados, {len(changes)} com preço alterado")
+        
+        for change in changes:
+            fixture_id = change['fixture_id']
+            if fixture_id in self.notified_fixtures:
+                self.live_odds.unwatch(fixture_id)
+                continue
+            
+            opportunities = self.ev_detector.detect_market_opportunities(
+                probabilities=change['probabilities'],
+                market_odds=change['prices'],
+                markets=change['changed']
+            )
+            sized = self.size_opportunities(fixture_id, [opp for opp in opportunities if opp['is_ev_positive']])
+            
+            for opp in opportunities:
+                if id(opp) not in sized:
+                    continue
+                
+                opp['bookmaker'] = f"ao vivo, {change['elapsed']}'"
+                message = self.ev_detector.format_ev_message(
+                    fixture=change['fixture'],
+                    opportunity=opp
+                )
+                
+                if send_telegram_notification(message):
+                    logger.info(f"✅ Notificação EV+ (odds ao vivo) enviada: jogo {fixture_id}, {opp['market']}")
+                    self.notified_fixtures.add(fixture_id)
+                    self.live_odds.unwatch(fixture_id)
+                else:
+                    logger.error("❌ Falha ao enviar notificação EV+")
+                    self.portfolio.release(fixture_id, opp['market'])
+    
+    def process_fixtures_concurrently(self, fixtures: List[Dict]) -> Dict[int, float]:
+        """
+        Analisa vários jogos HT 0-0 em paralelo
+        
+        As requisições continuam passando pelo rate limiter global.
+        
+        Jogos com análise concluída saem de pending_ht; os demais são
+        analisados de novo no próximo ciclo.
+        
+        Args:
+            fixtures: Jogos a processar
+        
+        Returns:
+            Latência de conclusão (segundos desde o início do lote) por fixture_id
+        """
+        batch_start = time.perf_counter()
+        latencies = {}
+        workers = min(Config.MAX_ANALYSIS_WORKERS, len(fixtures))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.process_fixture, fixture): fixture
+                for fixture in fixtures
+            }
+            
+            for future in as_completed(futures):
+                fixture = futures[future]
+                fixture_id = fixture['fixture']['id']
+                latencies[fixture_id] = time.perf_counter() - batch_start
+                
+                if future.result():
+                    self.pending_ht.pop(fixture_id, None)
+                    logger.info(f"⏱️ Jogo {fixture_id} analisado em {latencies[fixture_id]:.2f}s")
+                else:
+                    logger.info(f"🔁 Jogo {fixture_id} sem análise concluída: nova tentativa no próximo ciclo")
+        
+        logger.info(
+            f"⏱️ {len(fixtures)} jogos analisados em {max(latencies.values()):.2f}s "
+            f"({workers} workers)"
+        )
+        
+        return latencies
     
     def run(self):
         """Executa o loop principal do bot"""
         logger.info("🚀 Santo Graal Bot EV+ iniciado!")
         
+        next_calendar_refresh = 0.0
+        next_in_play_poll = 0.0
+        next_check = 0.0
+        next_live_odds_poll = 0.0
+        
         while True:
             try:
-                # Verificar jogos próximos (próximas 24h)
-                logger.info("⏰ Verificando jogos nas próximas 24h...")
-                upcoming = self.get_upcoming_fixtures(hours_ahead=24)
-                logger.info(f"Encontrados {len(upcoming)} jogos próximos")
-                
-                # Verificar jogos ao vivo 0-0 no HT
-                logger.info("🔴 Verificando jogos ao vivo...")
-                live = self.get_live_fixtures()
-                
-                logger.info(f"📊 Total de jogos ao vivo retornados: {len(live)}")
-                
-                # Filtrar apenas jogos 0-0 no HT
-                ht_0x0_fixtures = [f for f in live if self.is_halftime_0x0(f)]
-                
-                logger.info(f"Encontrados {len(ht_0x0_fixtures)} jogos ao vivo 0-0")
+                # Verificação dos jogos (calendário, janela de HT, análise) no próprio ritmo
+                if time.time() >= next_check:
+                    if time.time() >= next_calendar_refresh:
+                        # Verificar jogos próximos (próximas 24h)
+                        logger.info("⏰ Verificando jogos nas próximas 24h...")
+                        upcoming = self.get_upcoming_fixtures(hours_ahead=24)
+                        logger.info(f"Encontrados {len(upcoming)} jogos próximos")
+                        
+                        # Preparar jogos que começam em breve (em segundo plano:
+                        # não atrasa a consulta dos jogos na janela de HT)
+                        self.prefetch.start(upcoming)
+                        
+                        self.ht_scheduler.update_calendar(upcoming)
+                        next_calendar_refresh = time.time() + Config.CALENDAR_REFRESH_INTERVAL
+                        
+                        cache_stats = self.probability_calculator.result_cache.stats()
+                        logger.info(
+                            f"🧮 Cache de resultados: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                            f"({cache_stats['hit_rate']:.0f}%), {cache_stats['size']}/{cache_stats['max_entries']} entradas"
+                        )
+                    
+                    if Config.USE_HT_SCHEDULER:
+                        # Confirmar horário dos jogos prestes a começar (uma consulta por ID)
+                        to_confirm = self.ht_scheduler.kickoffs_to_confirm()
+                        if to_confirm:
+                            self.ht_scheduler.confirm(to_confirm, self.get_fixtures_by_ids(to_confirm))
+                            logger.info(f"🕒 Kickoff de {len(to_confirm)} jogos confirmado")
+                        
+                        # Consultar apenas jogos dentro da janela de HT
+                        due = self.ht_scheduler.due_fixtures()
+                        live = self.get_fixtures_by_ids(due) if due else []
+                        self.ht_scheduler.observe(live or [])
+                        logger.info(f"🔴 {len(due)} jogos na janela de HT consultados")
+                    else:
+                        # Verificar jogos ao vivo 0-0 no HT
+                        logger.info("🔴 Verificando jogos ao vivo...")
+                        live = self.get_live_fixtures()
+                        if live is not None:
+                            logger.info(f"📊 Total de jogos ao vivo retornados: {len(live)}")
+                    
+                    # Reagir apenas a mudanças desde a última consulta
+                    events, entered = self.update_pending_ht(live)
+                    live = live or []
+                    
+                    # Estatísticas ao vivo do 1º tempo, a cada IN_PLAY_POLL_INTERVAL
+                    # (com o agendador: jogos da janela in-play, consultados por ID)
+                    if Config.IN_PLAY_ENABLED and Config.IN_PLAY_POLL_LIVE_STATS and time.time() >= next_in_play_poll:
+                        first_half = live
+                        if Config.USE_HT_SCHEDULER:
+                            in_play_ids = self.ht_scheduler.in_play_fixtures()
+                            first_half = (self.get_fixtures_by_ids(in_play_ids) or []) + live if in_play_ids else live
+                        self.poll_in_play_stats(first_half)
+                        next_in_play_poll = time.time() + Config.IN_PLAY_POLL_INTERVAL
+                    
+                    ht_0x0_fixtures = list(self.pending_ht.values())
+                    
+                    logger.info(
+                        f"{len(events)} mudanças, {len(entered)} jogos entraram no HT 0-0, "
+                        f"{len(ht_0x0_fixtures)} pendentes de análise"
+                    )
+                    
+                    # Processar jogos 0-0 no HT (em paralelo)
+                    if ht_0x0_fixtures:
+                        self.process_fixtures_concurrently(ht_0x0_fixtures)
+                    
+                    next_check = time.time() + self._seconds_until_next_check(
+                        next_calendar_refresh, next_in_play_poll
+                    )
                 
-                # Processar jogos 0-0 no HT
-                for fixture in ht_0x0_fixtures:
-                    self.process_fixture(fixture)
-                    time.sleep(1)  # Rate limiting
+                # Odds ao vivo em timer próprio: reavaliar jogos observados cujo preço mudou
+                if Config.LIVE_ODDS_ENABLED and len(self.live_odds) and time.time() >= next_live_odds_poll:
+                    self.poll_live_odds()
+                    next_live_odds_poll = time.time() + Config.LIVE_ODDS_POLL_INTERVAL
                 
-                # Aguardar antes do próximo ciclo
-                logger.info(f"💤 Aguardando {Config.CHECK_INTERVAL} segundos até próxima verificação...")
-                time.sleep(Config.CHECK_INTERVAL)
+                # Aguardar até o próximo evento (verificação dos jogos ou odds ao vivo)
+                wake = next_check
+                if Config.LIVE_ODDS_ENABLED and len(self.live_odds):
+                    wake = min(wake, next_live_odds_poll)
+                wait = max(1.0, wake - time.time())
+                logger.info(f"💤 Aguardando {wait:.0f} segundos até próxima verificação...")
+                time.sleep(wait)
             
             except KeyboardInterrupt:
                 logger.info("⚠️ Bot interrompido pelo usuário")
@@ -624,6 +1078,79 @@ class SantoGraalBot:
             except Exception as e:
                 logger.error(f"❌ Erro no loop principal: {e}")
                 time.sleep(60)  # Aguardar 1 minuto em caso de erro
+    
+    def update_pending_ht(self, live: Optional[List[Dict]]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Registra a consulta de jogos ao vivo e atualiza os jogos pendentes de análise
+        
+        Jogos que entram no HT 0-0 ficam em pending_ht até a análise ser
+        concluída (process_fixtures_concurrently) e saem antes se o status
+        ou o placar mudar ou se o jogo sumir da consulta. Consulta com falha
+        (None) não é um snapshot: os jogos não "sumiram" e nada muda.
+        
+        Args:
+            live: Jogos retornados pela consulta (None se falhou)
+        
+        Returns:
+            Tuple (eventos desde a última consulta, jogos que entraram no HT 0-0)
+        """
+        if live is None:
+            logger.warning("⚠️ Consulta de jogos ao vivo falhou: snapshot anterior mantido")
+            return [], []
+        
+        events = self.live_tracker.update(live)
+        
+        for event in events:
+            if event['type'] == 'removed':
+                self.in_play.remove(event['fixture_id'])
+            if event['type'] in ('status_change', 'score_change', 'removed'):
+                self.pending_ht.pop(event['fixture_id'], None)
+        
+        entered = [
+            fixture for fixture in LiveSnapshotTracker.entered_status(events, 'HT')
+            if self.is_halftime_0x0(fixture)
+        ]
+        for fixture in entered:
+            self.pending_ht[fixture['fixture']['id']] = fixture
+        
+        return events, entered
+    
+    def _seconds_until_next_check(self, next_calendar_refresh: float, next_in_play_poll: float) -> float:
+        """
+        Calcula quanto dormir até a próxima verificação
+        
+        Com o agendador: HT_CHECK_INTERVAL se há jogos na janela de HT,
+        senão até a próxima janela abrir, a próxima confirmação pré-kickoff,
+        o próximo snapshot in-play (jogos no 1º tempo) ou a atualização do
+        calendário (CALENDAR_REFRESH_INTERVAL). As odds ao vivo têm timer
+        próprio (LIVE_ODDS_POLL_INTERVAL) e não antecipam esta verificação.
+        
+        Args:
+            next_calendar_refresh: Timestamp da próxima atualização do calendário
+            next_in_play_poll: Timestamp da próxima consulta das estatísticas in-play
+        
+        Returns:
+            Segundos a aguardar
+        """
+        if not Config.USE_HT_SCHEDULER:
+            wait = Config.CHECK_INTERVAL
+        elif self.ht_scheduler.due_fixtures():
+            wait = Config.HT_CHECK_INTERVAL
+        else:
+            now = time.time()
+            wait = next_calendar_refresh - now
+            in_play_due = (
+                Config.IN_PLAY_ENABLED and Config.IN_PLAY_POLL_LIVE_STATS and self.ht_scheduler.in_play_fixtures()
+            )
+            for next_event in (
+                self.ht_scheduler.seconds_until_next_window(),
+                self.ht_scheduler.seconds_until_next_confirmation(),
+                next_in_play_poll - now if in_play_due else None,
+            ):
+                if next_event is not None:
+                    wait = min(wait, next_event)
+        
+        return max(1.0, wait)
 
 
 # ============================================================
@@ -638,6 +1165,10 @@ def main():
     health_thread.start()
     logger.info(f"✅ Health check endpoint ativo na porta {os.getenv('PORT', 10000)}")
     
+    if Config.CALIBRATION_FILE:
+        Config.load_calibration(Config.CALIBRATION_FILE)
+        logger.info(f"🎛️ Calibração carregada de {Config.CALIBRATION_FILE}")
+    
     bot = SantoGraalBot()
     
     try:
@@ -0,0 +1,248 @@
+"""
+Agendador de Intervalo (HT) para Santo Graal Bot EV+
+Usa os horários de kickoff para prever a janela de intervalo de cada jogo
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from config_santo_graal import Config
+
+
+class HalftimeScheduler:
+    """
+    Prevê a janela de HT de cada jogo a partir do kickoff
+
+    Janela: de kickoff + Config.HT_WINDOW_START_MINUTE até
+    kickoff + Config.HT_WINDOW_END_MINUTE (ou até o 2º tempo começar).
+    Somente jogos dentro da janela são consultados, a cada
+    Config.HT_CHECK_INTERVAL segundos; ligas sem jogos não geram requisições.
+
+    Antes dela, a janela in-play (de Config.IN_PLAY_WINDOW_START_MINUTE até a
+    janela de HT) lista os jogos do 1º tempo cujas estatísticas ao vivo
+    alimentam o modelo in-play (in_play_fixtures).
+
+    O calendário completo é atualizado só a cada Config.CALENDAR_REFRESH_INTERVAL;
+    mudanças de horário são pegas pela confirmação por ID poucos minutos antes
+    do kickoff (kickoffs_to_confirm) e pelas consultas da janela (observe).
+    Confirmação que falha é repetida a cada Config.PRE_KICKOFF_CONFIRM_RETRY
+    segundos, no máximo Config.PRE_KICKOFF_CONFIRM_MAX_TRIES vezes; depois
+    vale o horário do calendário.
+    """
+
+    # Jogo já passou do intervalo (ou não vai acontecer): parar de acompanhar
+    DONE_STATUSES = ('2H', 'ET', 'BT', 'P', 'FT', 'AET', 'PEN', 'SUSP', 'INT', 'PST', 'CANC', 'ABD', 'AWD', 'WO')
+
+    # Jogo ainda não começou: o horário informado pode ter mudado
+    NOT_STARTED_STATUSES = ('NS', 'TBD')
+
+    def __init__(self):
+        """Inicializa o agendador"""
+        self._kickoffs: Dict[int, int] = {}
+        self._confirmed: Set[int] = set()
+        self._confirm_attempts: Dict[int, Tuple[int, float]] = {}  # id → (falhas, próxima tentativa)
+        self._lock = threading.Lock()
+
+    def update_calendar(self, fixtures: List[Dict]):
+        """
+        Atualiza o calendário com os jogos agendados/em andamento
+
+        Args:
+            fixtures: Resultado de get_upcoming_fixtures
+        """
+        with self._lock:
+            for fixture in fixtures:
+                info = fixture.get('fixture', {})
+                fixture_id = info.get('id')
+                kickoff = info.get('timestamp')
+
+                if fixture_id is None or not kickoff:
+                    continue
+
+                if info.get('status', {}).get('short') in self.DONE_STATUSES:
+                    self._forget(fixture_id)
+                    continue
+
+                self._kickoffs[fixture_id] = kickoff
+
+            self._prune()
+
+    def due_fixtures(self, now: Optional[float] = None) -> List[int]:
+        """
+        Jogos dentro da janela de HT neste momento
+
+        Args:
+            now: Timestamp atual (default: time.time())
+
+        Returns:
+            IDs dos jogos a consultar
+        """
+        start, end = self._window_offsets()
+        return self._fixtures_between(start, end, now)
+
+    def in_play_fixtures(self, now: Optional[float] = None) -> List[int]:
+        """
+        Jogos no 1º tempo, antes da janela de HT (acompanhamento in-play)
+
+        Args:
+            now: Timestamp atual (default: time.time())
+
+        Returns:
+            IDs dos jogos cujas estatísticas ao vivo devem ser consultadas
+        """
+        start, _ = self._window_offsets()
+        return self._fixtures_between(Config.IN_PLAY_WINDOW_START_MINUTE * 60, start, now, include_end=False)
+
+    def _fixtures_between(self, start: float, end: float, now: Optional[float], include_end: bool = True) -> List[int]:
+        """Jogos com kickoff + start ≤ now ≤ kickoff + end (segundos após o kickoff)"""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            return [
+                fixture_id for fixture_id, kickoff in self._kickoffs.items()
+                if kickoff + start <= now and (now <= kickoff + end if include_end else now < kickoff + end)
+            ]
+
+    def seconds_until_next_window(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Tempo até a próxima janela de HT (ou in-play, se acompanhada) abrir
+
+        Args:
+            now: Timestamp atual (default: time.time())
+
+        Returns:
+            Segundos até a próxima janela, ou None se não houver jogos agendados
+        """
+        now = time.time() if now is None else now
+        starts = [self._window_offsets()[0]]
+        if Config.IN_PLAY_ENABLED and Config.IN_PLAY_POLL_LIVE_STATS:
+            starts.append(Config.IN_PLAY_WINDOW_START_MINUTE * 60)
+
+        with self._lock:
+            upcoming = [
+                kickoff + start - now for kickoff in self._kickoffs.values() for start in starts
+                if kickoff + start > now
+            ]
+
+        return min(upcoming) if upcoming else None
+
+    def kickoffs_to_confirm(self, now: Optional[float] = None) -> List[int]:
+        """
+        Jogos a menos de Config.PRE_KICKOFF_CHECK_MINUTES do kickoff ainda não confirmados
+
+        Args:
+            now: Timestamp atual (default: time.time())
+
+        Returns:
+            IDs a consultar uma vez (get_fixtures_by_ids) antes do kickoff
+        """
+        now = time.time() if now is None else now
+        lead = Config.PRE_KICKOFF_CHECK_MINUTES * 60
+
+        with self._lock:
+            return [
+                fixture_id for fixture_id, kickoff in self._kickoffs.items()
+                if fixture_id not in self._confirmed and now <= kickoff <= now + lead
+                and self._confirm_attempts.get(fixture_id, (0, 0.0))[1] <= now
+            ]
+
+    def confirm(self, fixture_ids: List[int], fixtures: Optional[List[Dict]], now: Optional[float] = None):
+        """
+        Registra a confirmação pré-kickoff (horário e status atuais)
+
+        IDs sem retorno (consulta falhou ou jogo ausente da resposta) contam
+        uma tentativa e só voltam a kickoffs_to_confirm após
+        Config.PRE_KICKOFF_CONFIRM_RETRY segundos; após
+        Config.PRE_KICKOFF_CONFIRM_MAX_TRIES falhas ficam confirmados com o
+        horário do calendário.
+
+        Args:
+            fixture_ids: IDs consultados
+            fixtures: Jogos retornados (None = consulta falhou)
+            now: Timestamp atual (default: time.time())
+        """
+        now = time.time() if now is None else now
+
+        if fixtures:
+            self.update_calendar(fixtures)
+        returned = {fixture.get('fixture', {}).get('id') for fixture in fixtures or []}
+
+        with self._lock:
+            for fixture_id in fixture_ids:
+                if fixture_id in returned:
+                    self._confirmed.add(fixture_id)
+                    self._confirm_attempts.pop(fixture_id, None)
+                    continue
+
+                failures = self._confirm_attempts.get(fixture_id, (0, 0.0))[0] + 1
+                if failures >= Config.PRE_KICKOFF_CONFIRM_MAX_TRIES:
+                    self._confirmed.add(fixture_id)
+                    self._confirm_attempts.pop(fixture_id, None)
+                else:
+                    self._confirm_attempts[fixture_id] = (failures, now + Config.PRE_KICKOFF_CONFIRM_RETRY)
+
+    def seconds_until_next_confirmation(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Tempo até o próximo jogo entrar no prazo de confirmação pré-kickoff
+
+        Jogos cuja confirmação falhou contam a partir da próxima tentativa.
+
+        Returns:
+            Segundos, ou None se não há jogos a confirmar
+        """
+        now = time.time() if now is None else now
+        lead = Config.PRE_KICKOFF_CHECK_MINUTES * 60
+
+        with self._lock:
+            upcoming = [
+                max(kickoff - lead, self._confirm_attempts.get(fixture_id, (0, 0.0))[1]) - now
+                for fixture_id, kickoff in self._kickoffs.items()
+                if fixture_id not in self._confirmed and kickoff > now
+            ]
+
+        return max(0.0, min(upcoming)) if upcoming else None
+
+    def observe(self, fixtures: List[Dict]):
+        """
+        Registra o status atual dos jogos consultados
+
+        Jogos que já iniciaram o 2º tempo (ou terminaram) saem da agenda;
+        jogos ainda não iniciados têm o kickoff atualizado (atraso/remarcação).
+
+        Args:
+            fixtures: Jogos retornados pela consulta por IDs
+        """
+        with self._lock:
+            for fixture in fixtures:
+                info = fixture.get('fixture', {})
+                fixture_id = info.get('id')
+                status = info.get('status', {}).get('short')
+
+                if status in self.DONE_STATUSES:
+                    self._forget(fixture_id)
+                elif status in self.NOT_STARTED_STATUSES and info.get('timestamp') and fixture_id in self._kickoffs:
+                    self._kickoffs[fixture_id] = info['timestamp']
+
+    @staticmethod
+    def _window_offsets():
+        """Início e fim da janela de HT em segundos após o kickoff"""
+        return Config.HT_WINDOW_START_MINUTE * 60, Config.HT_WINDOW_END_MINUTE * 60
+
+    def _prune(self):
+        """Remove jogos cuja janela já fechou (chamar com lock adquirido)"""
+        _, end = self._window_offsets()
+        now = time.time()
+
+        expired = [
+            fixture_id for fixture_id, kickoff in self._kickoffs.items()
+            if kickoff + end < now
+        ]
+        for fixture_id in expired:
+            self._forget(fixture_id)
+
+    def _forget(self, fixture_id: int):
+        """Tira o jogo da agenda (chamar com lock adquirido)"""
+        self._kickoffs.pop(fixture_id, None)
+        self._confirmed.discard(fixture_id)
+        self._confirm_attempts.pop(fixture_id, None)
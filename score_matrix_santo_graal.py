@@ -0,0 +1,164 @@
+"""
+Matriz de Placar do 2º Tempo - Santo Graal Bot EV+
+Uma matriz de probabilidades casa × fora por jogo gera todos os mercados
+"""
+
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+from config_santo_graal import Config
+from poisson_santo_graal import GOAL_LINES
+
+
+# Mercados gerados por ScoreMatrix.markets()
+MARKETS = (
+    [f"{side} {line}" for line in GOAL_LINES for side in ('Over', 'Under')]
+    + ['BTTS Yes', 'BTTS No', 'Next Goal Home', 'Next Goal Away', 'Next Goal None']
+)
+
+
+class ScoreMatrix:
+    """
+    Probabilidades de gols no 2º tempo: matriz[i, j] = P(casa marca i, fora marca j)
+
+    Gols de cada time ~ Poisson independentes (λ casa, λ fora). A partir de
+    uma única matriz são derivados, em uma passada:
+    - Over/Under de todas as linhas (placar final = placar atual + 2º tempo)
+    - Ambos Marcam (BTTS) Sim/Não
+    - Próximo gol: Casa / Fora / Nenhum
+    """
+
+    def __init__(
+        self,
+        home_lambda: float,
+        away_lambda: float,
+        current_score: Tuple[int, int] = (0, 0),
+        max_goals: int = Config.SCORE_MATRIX_MAX_GOALS
+    ):
+        """
+        Monta a matriz
+
+        Args:
+            home_lambda: Gols esperados do mandante no 2º tempo
+            away_lambda: Gols esperados do visitante no 2º tempo
+            current_score: Placar no intervalo (casa, fora)
+            max_goals: Máximo de gols por time considerados na matriz
+        """
+        self.home_lambda = home_lambda
+        self.away_lambda = away_lambda
+        self.current_score = current_score
+
+        goals = np.arange(max_goals + 1)
+        factorials = np.array([math.factorial(k) for k in goals], dtype=float)
+        home_pmf = np.exp(-home_lambda) * home_lambda ** goals / factorials
+        away_pmf = np.exp(-away_lambda) * away_lambda ** goals / factorials
+
+        self.matrix = np.outer(home_pmf, away_pmf)
+
+    @classmethod
+    def from_over_probabilities(
+        cls,
+        prob_over_05: float,
+        prob_over_15: float,
+        home_share: float = 0.5,
+        current_score: Tuple[int, int] = (0, 0)
+    ) -> 'ScoreMatrix':
+        """
+        Calibra a matriz pelas probabilidades de Over 0.5 e Over 1.5 do modelo
+
+        Total de gols do 2º tempo em modelo hurdle: P(0) = 1 - P(Over 0.5) e,
+        com pelo menos 1 gol, Poisson truncada em zero com λ tal que
+        P(1 gol | ≥ 1) = 1 - P(Over 1.5) / P(Over 0.5). As duas linhas do
+        modelo são reproduzidas e as demais ficam coerentes com elas
+        (Over 0.5 ≥ Over 1.5 ≥ Over 2.5 ...). Dado o total, os gols se
+        dividem entre os times por home_share, como em Poissons independentes.
+
+        Args:
+            prob_over_05: Probabilidade de pelo menos 1 gol no 2º tempo (%)
+            prob_over_15: Probabilidade de pelo menos 2 gols no 2º tempo (%)
+            home_share: Fração dos gols esperados do mandante (0-1)
+            current_score: Placar no intervalo (casa, fora)
+
+        Returns:
+            ScoreMatrix
+        """
+        prob_goal = min(max(prob_over_05 / 100, 1e-6), 0.9999)
+        prob_one = 1 - min(max(prob_over_15 / 100 / prob_goal, 1e-6), 1 - 1e-6)  # P(1 gol | ≥ 1)
+        total_lambda = _truncated_poisson_lambda(prob_one)
+
+        score_matrix = cls(total_lambda * home_share, total_lambda * (1 - home_share), current_score)
+        score_matrix.matrix *= prob_goal / -math.expm1(-total_lambda)
+        score_matrix.matrix[0, 0] = 1 - prob_goal
+
+        return score_matrix
+
+    def markets(self) -> Dict[str, float]:
+        """
+        Deriva todos os mercados da matriz
+
+        Returns:
+            Dicionário mercado → probabilidade em % (ex: {'Over 2.5': 38.2, 'BTTS Yes': 41.0})
+        """
+        home_goals, away_goals = np.indices(self.matrix.shape)
+        current_home, current_away = self.current_score
+        current_total = current_home + current_away
+
+        # Distribuição do total de gols do 2º tempo (soma das antidiagonais)
+        total_pmf = np.bincount((home_goals + away_goals).ravel(), weights=self.matrix.ravel())
+        total_cdf = np.cumsum(total_pmf)
+
+        probabilities = {}
+
+        for line in GOAL_LINES:
+            needed = int(line) - current_total  # Gols do 2º tempo até ficar no Under
+            under = float(total_cdf[min(needed, len(total_cdf) - 1)]) if needed >= 0 else 0.0
+            probabilities[f"Over {line}"] = (1 - under) * 100
+            probabilities[f"Under {line}"] = under * 100
+
+        # Ambos marcam: considerar gols já marcados no 1º tempo
+        home_scores = (home_goals + current_home) > 0
+        away_scores = (away_goals + current_away) > 0
+        btts = float(self.matrix[home_scores & away_scores].sum())
+        probabilities['BTTS Yes'] = btts * 100
+        probabilities['BTTS No'] = (1 - btts) * 100
+
+        # Próximo gol: sem gol com P(0, 0); havendo gol, dividido pelos λ
+        total_lambda = self.home_lambda + self.away_lambda
+        no_goal = float(self.matrix[0, 0])
+        if total_lambda > 0:
+            probabilities['Next Goal Home'] = (1 - no_goal) * self.home_lambda / total_lambda * 100
+            probabilities['Next Goal Away'] = (1 - no_goal) * self.away_lambda / total_lambda * 100
+        else:
+            probabilities['Next Goal Home'] = probabilities['Next Goal Away'] = 0.0
+        probabilities['Next Goal None'] = no_goal * 100
+
+        return probabilities
+
+
+def _truncated_poisson_lambda(prob_one: float) -> float:
+    """
+    λ da Poisson truncada em zero com P(X = 1 | X ≥ 1) = λ / (e^λ - 1) = prob_one
+
+    A razão é decrescente em λ: Newton em log, protegido por bisseção.
+    """
+    target = math.log(prob_one)
+    low, high = 0.0, 50.0
+    lam = min(max(2 * (1 - prob_one) / prob_one, 1e-6), high)
+
+    for _ in range(50):
+        error = math.log(lam) - math.log(math.expm1(lam)) - target
+        if abs(error) < 1e-12:
+            break
+        if error > 0:
+            low = lam
+        else:
+            high = lam
+
+        derivative = 1 / lam - 1 / -math.expm1(-lam)  # d/dλ [ln λ - ln(e^λ - 1)] < 0
+        lam -= error / derivative
+        if not low < lam < high:
+            lam = (low + high) / 2
+
+    return lam
@@ -0,0 +1,130 @@
+"""
+Features compactas de times para Santo Graal Bot EV+
+Extrai uma única vez os campos usados do payload de /teams/statistics
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+
+class TeamFeatures:
+    """
+    Registro compacto (__slots__) com os dados de um time usados nos cálculos
+
+    Substitui o JSON de vários KB de /teams/statistics: cada campo é lido e
+    convertido uma única vez. Campos ausentes recebem os mesmos defaults que
+    os indicadores usavam; valores inválidos viram NaN (acionam o fallback).
+    `played` é None quando ausente, pois cada indicador usa um default próprio.
+
+    Cada linha do TeamStatsCache (time, liga, temporada, fetched_at) é uma
+    instância, tratada como imutável: `partials` guarda o que os cálculos
+    derivam do time (ProbabilityCalculator) e vale enquanto a linha valer.
+    """
+
+    FIELDS = (
+        'goals_avg_total',
+        'goals_avg_home',
+        'goals_avg_away',
+        'goals_for_total',
+        'played',
+        'draws',
+        'form_score',
+        'rank',
+    )
+    __slots__ = FIELDS + ('partials',)
+
+    def __init__(
+        self,
+        goals_avg_total: float = 1.5,
+        goals_avg_home: float = 1.5,
+        goals_avg_away: float = 1.5,
+        goals_for_total: float = 0.0,
+        played: Optional[float] = None,
+        draws: float = 0.0,
+        form_score: float = 11.0,  # 'WWDWW'
+        rank: float = 10.0
+    ):
+        self.goals_avg_total = goals_avg_total
+        self.goals_avg_home = goals_avg_home
+        self.goals_avg_away = goals_avg_away
+        self.goals_for_total = goals_for_total
+        self.played = played
+        self.draws = draws
+        self.form_score = form_score
+        self.rank = rank
+        self.partials = None
+
+    @classmethod
+    def from_stats(cls, stats: Dict) -> 'TeamFeatures':
+        """
+        Extrai as features do payload de /teams/statistics
+
+        Args:
+            stats: Resposta da API (ou dicionário vazio)
+
+        Returns:
+            TeamFeatures
+        """
+        goals_for = stats.get('goals', {}).get('for', {})
+        average = goals_for.get('average', {})
+        fixtures = stats.get('fixtures', {})
+        played = fixtures.get('played', {}).get('total', _MISSING)
+
+        return cls(
+            goals_avg_total=_to_float(average.get('total', 1.5)),
+            goals_avg_home=_to_float(average.get('home', 1.5)),
+            goals_avg_away=_to_float(average.get('away', 1.5)),
+            goals_for_total=_to_float(goals_for.get('total', {}).get('total', 0)),
+            played=None if played is _MISSING else _to_float(played),
+            draws=_to_float(fixtures.get('draws', {}).get('total', 0)),
+            form_score=_form_score(stats.get('form', 'WWDWW')),
+            rank=_to_float(stats.get('league', {}).get('rank', 10)),
+        )
+
+    @classmethod
+    def coerce(cls, stats) -> 'TeamFeatures':
+        """Aceita TeamFeatures ou payload bruto da API"""
+        if isinstance(stats, cls):
+            return stats
+        return cls.from_stats(stats or {})
+
+    def to_tuple(self) -> Tuple:
+        """Serialização compacta (para caches)"""
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    @classmethod
+    def from_tuple(cls, values) -> 'TeamFeatures':
+        """Reconstrói a partir de to_tuple()"""
+        return cls(*values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TeamFeatures):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.to_tuple())
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"TeamFeatures({fields})"
+
+
+_MISSING = object()
+
+
+def _to_float(value) -> float:
+    """Converte para float (NaN se inválido, acionando o fallback do indicador)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _form_score(form) -> float:
+    """Pontuação dos últimos 5 jogos (W=3, D=1, L=0; NaN se inválido)"""
+    try:
+        points = {'W': 3, 'D': 1, 'L': 0}
+        return float(sum(points.get(c, 1) for c in form[-5:]))
+    except TypeError:
+        return math.nan
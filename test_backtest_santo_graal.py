@@ -0,0 +1,115 @@
+"""
+Testes do backtest histórico (liquidação, métricas e execução ponta a ponta)
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from backtest_santo_graal import run_backtest, settle, summarize
+
+
+def make_record(fixture_id, halftime, fulltime, over_05_odds, over_15_odds):
+    """Monta um jogo arquivado com times de muitos gols"""
+    stats = {
+        'form': 'WWWWW',
+        'league': {'rank': 2},
+        'fixtures': {'played': {'total': 20}, 'draws': {'total': 1}},
+        'goals': {'for': {'total': {'total': 60}, 'average': {'total': '3.0', 'home': '3.2', 'away': '2.8'}}},
+    }
+    return {
+        'fixture': {
+            'fixture': {'id': fixture_id, 'timestamp': 1700000000 + fixture_id},
+            'league': {'id': 39},
+            'score': {
+                'halftime': {'home': halftime[0], 'away': halftime[1]},
+                'fulltime': {'home': fulltime[0], 'away': fulltime[1]},
+            },
+        },
+        'home_stats': stats,
+        'away_stats': stats,
+        'h2h': [{'score': {'fulltime': {'home': 2, 'away': 2}}}] * 5,
+        'odds': {'bookmakers': [{'bets': [{'name': 'Goals Over/Under', 'values': [
+            {'value': 'Over 0.5', 'odd': str(over_05_odds)},
+            {'value': 'Over 1.5', 'odd': str(over_15_odds)},
+        ]}]}]},
+    }
+
+
+def test_settle_and_metrics():
+    """Testa liquidação e métricas (hit rate, yield, ROI, drawdown)"""
+    print("\n" + "=" * 60)
+    print("📏 TESTE: Liquidação e métricas")
+    print("=" * 60)
+
+    assert settle('Over 1.5', 1, 1) is True
+    assert settle('Over 1.5', 1, 0) is False
+    assert settle('Under 2.5', 1, 1) is True
+    assert settle('BTTS Yes', 2, 0) is False
+    assert settle('Next Goal Home', 1, 0) is None, "Mercado sem liquidação deveria retornar None"
+
+    bets = [
+        (3, 39, 'Over 0.5', 2.0, 10.0, 10.0),
+        (1, 39, 'Over 0.5', 2.0, 10.0, 10.0),
+        (2, 39, 'Over 0.5', 2.0, 10.0, -10.0),
+        (4, 39, 'Over 0.5', 2.0, 10.0, -10.0),
+    ]
+    metrics = summarize(bets, bankroll=100.0)
+
+    assert metrics['bets'] == 4 and metrics['wins'] == 2
+    assert metrics['hit_rate'] == 50.0
+    assert metrics['profit'] == 0.0 and metrics['yield'] == 0.0
+    # Ordem cronológica: +10, -10, +10, -10 → queda máxima de 10
+    assert metrics['max_drawdown'] == 10.0 and metrics['max_drawdown_percent'] == 10.0
+
+    print("   ✅ Métricas corretas")
+    return True
+
+
+def test_run_backtest():
+    """Testa o backtest ponta a ponta em um arquivo temporário"""
+    print("\n" + "=" * 60)
+    print("📈 TESTE: Backtest ponta a ponta")
+    print("=" * 60)
+
+    records = [
+        make_record(1, (0, 0), (2, 1), 1.60, 2.50),  # HT 0-0, green nos dois
+        make_record(2, (0, 0), (1, 0), 1.60, 2.50),  # HT 0-0, green só no Over 0.5
+        make_record(3, (1, 0), (3, 0), 1.60, 2.50),  # Não está 0-0 no HT
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'season.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        report = run_backtest([directory], workers=1, bankroll=1000.0)
+
+    assert report['counts'] == {'fixtures': 3, 'ht_0x0': 2, 'analysed': 2}, report['counts']
+    assert set(report['by_market']) == {'Over 0.5', 'Over 1.5'}, report['by_market']
+    assert report['by_market']['Over 0.5']['wins'] == 2
+    assert report['by_market']['Over 1.5']['wins'] == 1
+    assert set(report['by_league']) == {39}
+
+    print(f"   ✅ {report['overall']['bets']} apostas, yield {report['overall']['yield']:.1f}%")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_settle_and_metrics() and test_run_backtest():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Testes do cache persistente (SQLite) do Santo Graal Bot EV+
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from cache_santo_graal import TeamStatsCache, H2HStore, ResultCache
+from probability_calculator_santo_graal import ProbabilityCalculator
+from team_features_santo_graal import TeamFeatures
+
+
+def _temp_db():
+    return os.path.join(tempfile.mkdtemp(), 'cache_test.db')
+
+
+def test_team_stats_cache():
+    """Testa leitura, persistência, TTL e eviction do cache de times"""
+    print("=" * 60)
+    print("🗄️ TESTE: Cache de estatísticas de times")
+    print("=" * 60)
+
+    db_path = _temp_db()
+    stats = TeamFeatures.from_stats({'form': 'WWDLW', 'league': {'rank': 3}})
+
+    cache = TeamStatsCache(db_path, ttl=60, max_entries=2)
+    assert cache.get(33, 39, 2024) is None, "Cache vazio deveria retornar None"
+
+    cache.set(33, 39, 2024, stats)
+    assert cache.get(33, 39, 2024) == stats, "Deveria retornar estatísticas armazenadas"
+    assert cache.get(33, 39, 2023) is None, "Temporada faz parte da chave"
+
+    # Persistência entre instâncias (reinício do bot)
+    reopened = TeamStatsCache(db_path, ttl=60, max_entries=2)
+    assert reopened.get(33, 39, 2024) == stats, "Deveria sobreviver a reinício"
+    print("   ✅ Persistência OK")
+
+    # Eviction: mantém apenas as 2 entradas mais recentes
+    cache.set(34, 39, 2024, stats)
+    time.sleep(0.01)
+    cache.set(35, 39, 2024, stats)
+    assert cache.get(33, 39, 2024) is None, "Entrada mais antiga deveria ser removida"
+    assert cache.get(35, 39, 2024) == stats
+    print("   ✅ Eviction OK")
+
+    # TTL
+    expired = TeamStatsCache(db_path, ttl=0)
+    time.sleep(0.01)
+    assert expired.get(35, 39, 2024) is None, "Entrada expirada deveria retornar None"
+    print("   ✅ TTL OK")
+
+    print(f"\n✅ Todos os testes de cache de times passaram!")
+    return True
+
+
+def _h2h_match(fixture_id, timestamp, status='FT', home=1, away=0):
+    return {
+        'fixture': {'id': fixture_id, 'timestamp': timestamp, 'status': {'short': status}},
+        'score': {'fulltime': {'home': home, 'away': away}}
+    }
+
+
+def test_h2h_store():
+    """Testa o histórico H2H incremental por par de times"""
+    print("\n" + "=" * 60)
+    print("🤝 TESTE: Store de confrontos diretos")
+    print("=" * 60)
+
+    db_path = _temp_db()
+    store = H2HStore(db_path, sync_interval=3600)
+
+    assert store.needs_sync(40, 50), "Par nunca sincronizado precisa de sync"
+
+    inserted = store.append(40, 50, [
+        _h2h_match(1, 1000),
+        _h2h_match(2, 2000),
+        _h2h_match(3, 3000, status='NS'),  # Não finalizado: ignorar
+    ])
+    assert inserted == 2, f"Deveria inserir 2 jogos finalizados, inseriu {inserted}"
+    assert not store.needs_sync(50, 40), "Par é não ordenado"
+
+    # Apenas confrontos novos são acrescentados
+    inserted = store.append(50, 40, [_h2h_match(2, 2000), _h2h_match(4, 4000)])
+    assert inserted == 1, "Apenas o confronto novo deveria ser inserido"
+
+    matches = H2HStore(db_path).get(40, 50, last_n=2)
+    assert [m['fixture']['id'] for m in matches] == [4, 2], "Mais recentes primeiro"
+    print("   ✅ Append incremental e leitura do disco OK")
+
+    print(f"\n✅ Todos os testes de H2H passaram!")
+    return True
+
+
+def test_result_cache():
+    """Testa o cache LRU de resultados e a chave por conteúdo"""
+    print("\n" + "=" * 60)
+    print("🧮 TESTE: Cache de resultados (LRU)")
+    print("=" * 60)
+
+    cache = ResultCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' passa a ser o mais recente
+    cache.set('c', 3)
+    assert cache.get('b') is None, "Menos usado recentemente deveria sair"
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    calculator = ProbabilityCalculator()
+    match_data = {
+        'fixture_id': 99,
+        'home_stats': TeamFeatures(goals_avg_total=2.1, played=20),
+        'away_stats': TeamFeatures(goals_avg_total=1.4, played=20),
+        'h2h': [_h2h_match(1, 1000, home=2, away=1)],
+    }
+    first = calculator.calculate_prematch_probabilities(match_data)
+    assert calculator.calculate_prematch_probabilities(dict(match_data)) == first
+    assert calculator.result_cache.stats()['hits'] == 1, "Mesmos dados deveriam vir do cache"
+
+    # Conteúdo diferente (novo confronto) invalida a chave
+    changed = dict(match_data, h2h=match_data['h2h'] + [_h2h_match(2, 2000, home=0, away=0)])
+    assert calculator.calculate_prematch_probabilities(changed) != first
+    assert calculator.result_cache.stats()['misses'] == 2
+    print("   ✅ LRU, hits/misses e chave por conteúdo OK")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_team_stats_cache() and test_h2h_store() and test_result_cache():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Testes do EVDetector (caminhos escalar e vetorizado)
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from config_santo_graal import Config
+from ev_detector_santo_graal import EVDetector
+from portfolio_santo_graal import KellyPortfolio, allocate_kelly, project_capped_simplex
+
+
+MARKETS = ['Over 0.5', 'Over 1.5', 'Over 2.5']
+
+
+def test_evaluate_batch_matches_scalar():
+    """Testa se evaluate_batch reproduz detect_market_opportunities"""
+    print("\n" + "=" * 60)
+    print("🧮 TESTE: evaluate_batch vs escalar")
+    print("=" * 60)
+
+    detector = EVDetector()
+    rng = random.Random(11)
+    n = 500
+
+    probabilities = np.array([[rng.uniform(30, 99) for _ in MARKETS] for _ in range(n)])
+    odds = np.array([[rng.choice([rng.uniform(1.01, 3.5), np.nan]) for _ in MARKETS] for _ in range(n)])
+
+    result = detector.evaluate_batch(probabilities, odds, markets=MARKETS)
+    assert result.shape == (n, len(MARKETS))
+
+    for i in range(n):
+        market_odds = {market: odds[i, j] for j, market in enumerate(MARKETS) if not np.isnan(odds[i, j])}
+        opportunities = {
+            opp['market']: opp for opp in detector.detect_market_opportunities(
+                dict(zip(MARKETS, probabilities[i])), market_odds, markets=MARKETS
+            )
+        }
+
+        for j, market in enumerate(MARKETS):
+            row = result[i, j]
+            opp = opportunities.get(market)
+            assert bool(row['eligible']) == (opp is not None), f"Filtro diverge no jogo {i}, {market}"
+            if opp is None:
+                assert row['stake'] == 0 and not row['is_ev_positive']
+                continue
+            assert abs(row['ev'] - opp['ev']) < 1e-12
+            assert abs(row['stake'] - opp['kelly_stake']) < 1e-9
+            assert abs(row['kelly_fraction'] * 100 - opp['stake_percent']) < 1e-9
+            assert bool(row['is_ev_positive']) == opp['is_ev_positive']
+
+    print(f"   ✅ {result['eligible'].sum()} de {result.size} registros elegíveis, idênticos ao escalar")
+
+    # Broadcast: uma probabilidade por mercado para vários preços
+    prices = detector.evaluate_batch([85.0, 65.0], [[1.30, 1.80], [1.50, 2.20]], markets=MARKETS[:2])
+    assert prices.shape == (2, 2) and prices['is_ev_positive'][1].all()
+    return True
+
+
+def test_portfolio_kelly():
+    """Testa o Kelly conjunto: limites, apostas abertas e tempo de solução"""
+    print("\n" + "=" * 60)
+    print("🏦 TESTE: Kelly de portfólio")
+    print("=" * 60)
+
+    detector = EVDetector()
+    bankroll = Config.DEFAULT_BANKROLL
+
+    # Aposta isolada: igual ao Kelly individual
+    for probability, odds in ((62.0, 1.70), (55.0, 1.90), (80.0, 1.30), (85.0, 1.45)):
+        allocated = allocate_kelly([probability], [odds])[0] * bankroll
+        assert abs(allocated - detector.calculate_kelly_stake(probability, odds)) < 1e-6, (probability, odds)
+
+    projected = project_capped_simplex(np.array([0.5, 0.3, -0.1, 0.05]), np.full(4, 0.2), 0.3)
+    assert abs(projected.sum() - 0.3) < 1e-12 and projected.max() <= 0.2 and projected.min() >= 0
+
+    # 10 jogos no HT ao mesmo tempo: soma limitada à exposição total
+    rng = np.random.default_rng(5)
+    probabilities = rng.uniform(75, 90, 10)
+    odds = 100 / probabilities * 1.15
+    independent = sum(detector.calculate_kelly_stake(p, o) for p, o in zip(probabilities, odds)) / bankroll
+    fractions = allocate_kelly(probabilities, odds, groups=list(range(10)))
+    assert independent > Config.MAX_TOTAL_EXPOSURE_PERCENT / 100
+    assert fractions.sum() <= Config.MAX_TOTAL_EXPOSURE_PERCENT / 100 + 1e-9
+    assert fractions.max() <= Config.MAX_STAKE_PERCENT / 100 + 1e-9
+    print(f"   ✅ Exposição: independente {independent * 100:.1f}% → conjunta {fractions.sum() * 100:.1f}%")
+
+    # Apostas abertas ocupam a exposição
+    portfolio = KellyPortfolio()
+    for fixture_id in range(4):
+        opportunities = [{'market': 'Over 0.5', 'probability': 85.0, 'odds': 1.45, 'kelly_stake': 50.0}]
+        portfolio.allocate(fixture_id, opportunities)
+    assert portfolio.exposure() <= Config.MAX_TOTAL_EXPOSURE_PERCENT / 100 + 1e-9
+    assert opportunities[0]['kelly_stake'] < opportunities[0]['kelly_stake_independent']
+    portfolio.release(0)
+    assert len(portfolio) == 2, "Quarta aposta não cabe na banca; release remove a primeira"
+
+    # ~50 apostas simultâneas dentro do orçamento de tempo
+    probabilities = rng.uniform(60, 90, 50)
+    odds = 100 / probabilities * rng.uniform(0.98, 1.08, 50)
+    groups = [i // 2 for i in range(50)]
+    allocate_kelly(probabilities, odds, groups=groups)
+    start = time.perf_counter()
+    allocate_kelly(probabilities, odds, groups=groups)
+    elapsed = time.perf_counter() - start
+    assert elapsed < Config.PORTFOLIO_KELLY_TIME_BUDGET * 4, f"Solver lento: {elapsed * 1000:.1f} ms"
+
+    print(f"   ✅ 50 apostas dimensionadas em {elapsed * 1000:.1f} ms")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_evaluate_batch_matches_scalar() and test_portfolio_kelly():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Testes do detector de mudanças ao vivo e dos jogos pendentes de análise no HT
+"""
+
+import sys
+
+from in_play_santo_graal import InPlayTracker
+from live_tracker_santo_graal import LiveSnapshotTracker
+from santo_graal_bot_ev import SantoGraalBot
+
+
+def make_fixture(fixture_id, status, goals=(0, 0)):
+    """Item de /fixtures com status e placar (no HT o placar do intervalo é o atual)"""
+    score = {'home': goals[0], 'away': goals[1]}
+    return {
+        'fixture': {'id': fixture_id, 'status': {'short': status}},
+        'goals': dict(score),
+        'score': {'halftime': dict(score) if status != '1H' else {'home': None, 'away': None}},
+    }
+
+
+def make_bot():
+    """Bot sem rede: só o estado usado por update_pending_ht"""
+    bot = SantoGraalBot.__new__(SantoGraalBot)
+    bot.live_tracker = LiveSnapshotTracker()
+    bot.in_play = InPlayTracker()
+    bot.pending_ht = {}
+    return bot
+
+
+def event_types(events):
+    """(tipo, fixture_id) de cada evento, ordenados"""
+    return sorted((event['type'], event['fixture_id']) for event in events)
+
+
+def test_snapshot_events():
+    """Testa os eventos emitidos entre duas consultas"""
+    print("\n" + "=" * 60)
+    print("📡 TESTE: Eventos entre consultas")
+    print("=" * 60)
+
+    tracker = LiveSnapshotTracker()
+
+    events = tracker.update([make_fixture(1, '1H'), make_fixture(2, '1H')])
+    assert event_types(events) == [('new', 1), ('new', 2)]
+    assert tracker.update([make_fixture(1, '1H'), make_fixture(2, '1H')]) == [], "Sem mudanças, sem eventos"
+
+    events = tracker.update([make_fixture(1, 'HT'), make_fixture(2, '1H', goals=(1, 0)), make_fixture(3, 'HT')])
+    assert event_types(events) == [('new', 3), ('score_change', 2), ('status_change', 1)]
+    assert [f['fixture']['id'] for f in LiveSnapshotTracker.entered_status(events, 'HT')] == [1, 3]
+
+    events = tracker.update([make_fixture(1, 'HT')])
+    assert event_types(events) == [('removed', 2), ('removed', 3)]
+    assert events[0]['fixture'] is None and events[0]['previous_score'] == (1, 0)
+
+    print("   ✅ new, status_change, score_change e removed corretos")
+    return True
+
+
+def test_pending_ht():
+    """Testa a entrada e a saída de jogos em pending_ht"""
+    print("\n" + "=" * 60)
+    print("⏸️ TESTE: Jogos pendentes no HT 0-0")
+    print("=" * 60)
+
+    bot = make_bot()
+    bot.update_pending_ht([make_fixture(1, '1H'), make_fixture(2, '1H'), make_fixture(3, '1H', goals=(1, 0))])
+    assert bot.pending_ht == {}
+
+    # Jogos 1 e 2 entram no HT 0-0; o 3 entra no HT, mas não está 0-0
+    _, entered = bot.update_pending_ht([
+        make_fixture(1, 'HT'), make_fixture(2, 'HT'), make_fixture(3, 'HT', goals=(1, 0)),
+    ])
+    assert [f['fixture']['id'] for f in entered] == [1, 2]
+    assert sorted(bot.pending_ht) == [1, 2]
+
+    # Consulta com falha: sem 'removed', pendentes mantidos
+    assert bot.update_pending_ht(None) == ([], [])
+    assert sorted(bot.pending_ht) == [1, 2]
+    events, entered = bot.update_pending_ht([
+        make_fixture(1, 'HT'), make_fixture(2, 'HT'), make_fixture(3, 'HT', goals=(1, 0)),
+    ])
+    assert events == [] and entered == [], "Snapshot anterior deve ser mantido após a falha"
+    assert sorted(bot.pending_ht) == [1, 2]
+
+    # Mudança de status (2º tempo começou) e de placar (gol revisado no HT) tiram da fila
+    events, _ = bot.update_pending_ht([
+        make_fixture(1, '2H'), make_fixture(2, 'HT', goals=(0, 1)), make_fixture(3, 'HT', goals=(1, 0)),
+    ])
+    assert event_types(events) == [('score_change', 2), ('status_change', 1)]
+    assert bot.pending_ht == {}
+
+    # Jogo que some da consulta também sai
+    bot.pending_ht[3] = make_fixture(3, 'HT', goals=(1, 0))
+    events, _ = bot.update_pending_ht([make_fixture(1, '2H'), make_fixture(2, 'HT', goals=(0, 1))])
+    assert event_types(events) == [('removed', 3)] and bot.pending_ht == {}
+
+    print("   ✅ Entrada no HT 0-0, falha de consulta e saída por mudança corretas")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_snapshot_events() and test_pending_ht():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Testes do livro de odds e do parse incremental de /odds
+"""
+
+import io
+import json
+import sys
+
+import live_odds_santo_graal
+import odds_santo_graal
+from live_odds_santo_graal import LiveOddsWatcher, live_market_odds, parse_live_odds_stream
+from odds_santo_graal import OddsBook, extract_market_odds, filter_odds_item, parse_odds_stream
+from score_matrix_santo_graal import MARKETS as SCORE_MATRIX_MARKETS
+
+
+def make_odds_item():
+    """Item de /odds com duas casas e mercados que não precificamos"""
+    def bookmaker(bookmaker_id, name, over_05, over_15):
+        return {
+            'id': bookmaker_id,
+            'name': name,
+            'bets': [
+                {'id': 1, 'name': 'Match Winner', 'values': [
+                    {'value': 'Home', 'odd': '2.10'}, {'value': 'Draw', 'odd': '3.30'},
+                ]},
+                {'id': 5, 'name': 'Goals Over/Under', 'values': [
+                    {'value': 'Over 0.5', 'odd': over_05},
+                    {'value': 'Under 0.5', 'odd': '9.00'},
+                    {'value': 'Over 1.5', 'odd': over_15},
+                    {'value': 'Over 2.5', 'odd': '3.40'},
+                ]},
+                {'id': 10, 'name': 'Exact Score', 'values': [
+                    {'value': '1:0', 'odd': '7.50'}, {'value': '0:0', 'odd': '11.00'},
+                ]},
+            ],
+        }
+
+    return {
+        'fixture': {'id': 123, 'timezone': 'UTC'},
+        'league': {'id': 39, 'name': 'Premier League'},
+        'update': '2026-10-18T15:00:00+00:00',
+        'bookmakers': [
+            bookmaker(8, 'Bet365', '1.40', '3.50'),
+            bookmaker(6, 'Bwin', '1.45', '2.20'),
+        ],
+    }
+
+
+def test_odds_book():
+    """Testa melhor preço entre casas e o limite de odds"""
+    print("\n" + "=" * 60)
+    print("📚 TESTE: Livro de odds")
+    print("=" * 60)
+
+    book = OddsBook.from_payload(make_odds_item())
+
+    assert book.best('Over 0.5') == (1.45, 6, 'Bwin'), book.best('Over 0.5')
+    assert book.best('Over 1.5') == (3.50, 8, 'Bet365')
+    assert book.best('Over 1.5', max_odds=3.00) == (2.20, 6, 'Bwin'), "Preço acima do limite deveria ser ignorado"
+    assert book.best('BTTS Yes') is None
+    assert book.best_odds()['Over 2.5'] == 3.40
+
+    filtered = OddsBook.from_payload(make_odds_item(), markets=['Over 0.5'])
+    assert filtered.markets() == ['Over 0.5'], filtered.markets()
+
+    book.add('Over 0.5', 1.50, 8, 'Bet365')
+    assert [price[1] for price in book.prices('Over 0.5')] == [8, 6], "Um preço por casa, maior primeiro"
+
+    print("   ✅ Melhor preço por mercado correto")
+    return True
+
+
+def test_parse_odds_stream():
+    """Testa o parse de /odds mantendo só os mercados pedidos"""
+    print("\n" + "=" * 60)
+    print("🌊 TESTE: Parse incremental de /odds")
+    print("=" * 60)
+
+    item = make_odds_item()
+    raw = json.dumps({'get': 'odds', 'results': 1, 'response': [item]}).encode('utf-8')
+    markets = ['Over 0.5', 'Over 1.5']
+
+    expected = filter_odds_item(item, markets)
+    assert [bet['name'] for bet in expected['bookmakers'][0]['bets']] == ['Goals Over/Under']
+    assert [v['value'] for v in expected['bookmakers'][0]['bets'][0]['values']] == markets
+
+    # Mesmo resultado com e sem ijson
+    backends = [odds_santo_graal.ijson, None] if odds_santo_graal.ijson else [None]
+    for backend in backends:
+        original, odds_santo_graal.ijson = odds_santo_graal.ijson, backend
+        try:
+            parsed = parse_odds_stream(io.BytesIO(raw), markets)
+        finally:
+            odds_santo_graal.ijson = original
+
+        assert parsed['bookmakers'] == expected['bookmakers'], parsed['bookmakers']
+        print(f"   ✅ {'ijson' if backend else 'json'}: {len(parsed['bookmakers'])} casas")
+
+    book = OddsBook.from_payload(parse_odds_stream(io.BytesIO(raw), markets))
+    assert book.best_odds() == {'Over 0.5': 1.45, 'Over 1.5': 3.50}
+
+    assert parse_odds_stream(io.BytesIO(b'{"response": []}'), markets) is None
+    assert parse_odds_stream(io.BytesIO(raw), ['BTTS Yes']) is None, "Sem casas com o mercado → None"
+    return True
+
+
+def test_extract_market_odds():
+    """Testa a extração de todos os mercados da ScoreMatrix (inclusive próximo gol)"""
+    print("\n" + "=" * 60)
+    print("🧮 TESTE: Odds de todos os mercados da matriz")
+    print("=" * 60)
+
+    item = make_odds_item()
+    item['bookmakers'][0]['bets'].append({'id': 14, 'name': 'Team To Score First', 'values': [
+        {'value': 'Home', 'odd': '1.80'}, {'value': 'Draw', 'odd': '4.50'}, {'value': 'Away', 'odd': '2.60'},
+    ]})
+
+    # Preços acima do limite ignorados; mercado sem preço válido fica de fora
+    odds = extract_market_odds(item, SCORE_MATRIX_MARKETS, max_odds=3.00)
+    assert odds == {'Over 0.5': 1.45, 'Over 1.5': 2.20, 'Next Goal Home': 1.80, 'Next Goal Away': 2.60}, odds
+
+    # 'Draw' (nenhum gol) vira 'Next Goal None', também no filtro do parse
+    assert extract_market_odds(item)['Next Goal None'] == 4.50
+    filtered = filter_odds_item(item, ['Next Goal None'])
+    assert filtered['bookmakers'][0]['bets'][0]['values'] == [{'value': 'Draw', 'odd': '4.50'}]
+    assert extract_market_odds(filtered) == {'Next Goal None': 4.50}
+
+    print(f"   ✅ {len(odds)} mercados precificados")
+    return True
+
+
+def make_live_item(fixture_id, elapsed, over_05, over_15, goals=(0, 0), suspended=False):
+    """Item de /odds/live com a linha principal de gols"""
+    return {
+        'fixture': {'id': fixture_id, 'status': {'long': 'Second Half', 'elapsed': elapsed}},
+        'teams': {'home': {'id': 1, 'goals': goals[0]}, 'away': {'id': 2, 'goals': goals[1]}},
+        'status': {'stopped': False, 'blocked': False, 'finished': False},
+        'odds': [
+            {'id': 36, 'name': 'Over/Under Line', 'values': [
+                {'value': 'Over', 'odd': over_05, 'handicap': '0.5', 'main': True, 'suspended': suspended},
+                {'value': 'Under', 'odd': '3.10', 'handicap': '0.5', 'main': True, 'suspended': False},
+            ]},
+            {'id': 25, 'name': 'Match Goals', 'values': [
+                {'value': 'Over', 'odd': over_15, 'handicap': '1.5', 'suspended': False},
+            ]},
+            {'id': 59, 'name': 'Fulltime Result', 'values': [{'value': 'Draw', 'odd': '2.50'}]},
+        ],
+    }
+
+
+def test_live_odds_watcher():
+    """Testa a reavaliação disparada só por mudança de preço"""
+    print("\n" + "=" * 60)
+    print("📡 TESTE: Monitor de odds ao vivo")
+    print("=" * 60)
+
+    prices = live_market_odds(make_live_item(1, 50, '1.30', '2.40'))
+    assert prices == {'Over 0.5': 1.30, 'Under 0.5': 3.10, 'Over 1.5': 2.40}, prices
+    assert 'Over 0.5' not in live_market_odds(make_live_item(1, 50, '1.30', '2.40', suspended=True))
+
+    watcher = LiveOddsWatcher()
+    fixture = {'fixture': {'id': 10}}
+    assert watcher.watch(fixture, {'Over 0.5': 80.0, 'Over 1.5': 55.0})
+    assert not watcher.watch({'fixture': {'id': 11}}, {'BTTS Yes': 50.0}), "Sem mercados observáveis"
+
+    changes = watcher.update([make_live_item(10, 45, '1.30', '2.40'), make_live_item(99, 60, '1.50', '3.00')])
+    assert [c['fixture_id'] for c in changes] == [10], "Jogo não observado deveria ser ignorado"
+    assert sorted(changes[0]['changed']) == ['Over 0.5', 'Over 1.5']
+    assert changes[0]['probabilities']['Over 0.5'] == 80.0, "No intervalo: probabilidades do HT"
+
+    assert watcher.update([make_live_item(10, 52, '1.30', '2.40')]) == [], "Preço igual não reavalia"
+
+    changes = watcher.update([make_live_item(10, 60, '1.45', '2.40')])
+    assert changes[0]['changed'] == ['Over 0.5']
+    assert changes[0]['prices'] == {'Over 0.5': 1.45, 'Over 1.5': 2.40}
+    decayed = changes[0]['probabilities']
+    assert decayed['Over 0.5'] < 80.0 and decayed['Over 1.5'] < 55.0, "Menos tempo → menos gols esperados"
+
+    assert watcher.update([make_live_item(10, 65, '1.60', '2.60', goals=(1, 0))]) == []
+    assert len(watcher) == 0, "Gol encerra a observação"
+
+    print(f"   ✅ Aos 60': Over 0.5 {decayed['Over 0.5']:.1f}%, Over 1.5 {decayed['Over 1.5']:.1f}%")
+    return True
+
+
+def test_live_odds_queries():
+    """Testa o filtro de /odds/live no servidor (jogo/liga) e no parse"""
+    print("\n" + "=" * 60)
+    print("🛰️ TESTE: Consultas filtradas de /odds/live")
+    print("=" * 60)
+
+    watcher = LiveOddsWatcher()
+    probabilities = {'Over 0.5': 80.0, 'Over 1.5': 55.0}
+    for fixture_id, league_id in ((10, 39), (11, 39), (12, 140), (13, None)):
+        watcher.watch({'fixture': {'id': fixture_id}, 'league': {'id': league_id}}, probabilities)
+
+    queries = watcher.queries()
+    assert sorted(queries, key=str) == sorted([{'league': 39}, {'fixture': 12}, {'fixture': 13}], key=str), queries
+    assert all(query for query in queries), "Nunca consultar /odds/live sem filtro"
+
+    items = [make_live_item(10, 50, '1.30', '2.40'), make_live_item(99, 60, '1.50', '3.00'),
+             make_live_item(11, 55, '1.35', '2.50')]
+    raw = json.dumps({'get': 'odds/live', 'response': items}).encode('utf-8')
+
+    backends = [live_odds_santo_graal.ijson, None] if live_odds_santo_graal.ijson else [None]
+    for backend in backends:
+        original, live_odds_santo_graal.ijson = live_odds_santo_graal.ijson, backend
+        try:
+            parsed = parse_live_odds_stream(io.BytesIO(raw), [10, 11])
+        finally:
+            live_odds_santo_graal.ijson = original
+
+        assert [item['fixture']['id'] for item in parsed] == [10, 11], "Jogo não observado deveria ser descartado"
+        assert [bet['name'] for bet in parsed[0]['odds']] == ['Over/Under Line', 'Match Goals']
+        assert live_market_odds(parsed[0]) == {'Over 0.5': 1.30, 'Under 0.5': 3.10, 'Over 1.5': 2.40}
+        assert isinstance(parsed[0]['fixture']['status']['elapsed'], (int, float))
+        print(f"   ✅ {'ijson' if backend else 'json'}: {len(parsed)} de {len(items)} jogos mantidos")
+
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_odds_book() and test_parse_odds_stream() and test_extract_market_odds() \
+                and test_live_odds_watcher() and test_live_odds_queries():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
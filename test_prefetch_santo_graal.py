@@ -0,0 +1,88 @@
+"""
+Testes do prefetch em segundo plano (não bloqueia o loop principal)
+"""
+
+import sys
+import threading
+import time
+
+from prefetch_santo_graal import PrefetchPipeline
+
+
+class SlowBot:
+    """Bot falso: estatísticas só respondem depois de release.set()"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.probability_calculator = self
+        self.calls = 0
+
+    def get_team_statistics(self, team_id, league_id):
+        self.calls += 1
+        self.release.wait(5)
+        return {'team': team_id}
+
+    def get_h2h(self, team1_id, team2_id):
+        return []
+
+    def calculate_prematch_probabilities(self, match_data):
+        return 80.0, 60.0
+
+
+def make_fixture(fixture_id, kickoff):
+    """Jogo agendado com o mínimo usado pelo prefetch"""
+    return {
+        'fixture': {'id': fixture_id, 'timestamp': int(kickoff), 'status': {'short': 'NS'}},
+        'teams': {'home': {'id': fixture_id * 10}, 'away': {'id': fixture_id * 10 + 1}},
+        'league': {'id': 39},
+    }
+
+
+def test_background_prefetch():
+    """Testa que start() retorna na hora e não sobrepõe ciclos"""
+    print("\n" + "=" * 60)
+    print("🔥 TESTE: Prefetch em segundo plano")
+    print("=" * 60)
+
+    bot = SlowBot()
+    pipeline = PrefetchPipeline(bot)
+    upcoming = [make_fixture(1, time.time() + 1800), make_fixture(2, time.time() + 1800)]
+
+    started = time.perf_counter()
+    assert pipeline.start(upcoming) is True
+    assert time.perf_counter() - started < 0.5, "start() não deve esperar as requisições"
+    assert pipeline.get(1) is None
+
+    assert pipeline.start(upcoming) is False, "Ciclo em andamento: novo ciclo ignorado"
+
+    bot.release.set()
+    pipeline._thread.join(5)
+    assert not pipeline._thread.is_alive()
+    assert pipeline.get(1)['prematch'] == (80.0, 60.0) and pipeline.get(2) is not None
+
+    # Jogos já preparados não geram novas requisições
+    calls = bot.calls
+    assert pipeline.start(upcoming) is True
+    pipeline._thread.join(5)
+    assert bot.calls == calls
+
+    print("   ✅ Loop principal não espera o prefetch")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_background_prefetch():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Testes do ProbabilityCalculator (caminhos escalar e vetorizado)
+"""
+
+import json
+import random
+import sys
+
+import numpy as np
+
+from poisson_santo_graal import POISSON_TABLE, PoissonTable
+from probability_calculator_santo_graal import ProbabilityCalculator
+from in_play_santo_graal import InPlayState
+from config_santo_graal import Config
+from optimizer_santo_graal import (
+    INDICATOR_KEYS, current_candidate, evaluate_thresholds, optimize_thresholds, predict, split_by_time
+)
+from score_matrix_santo_graal import ScoreMatrix
+
+
+def make_team_stats(rng):
+    """Gera estatísticas no formato de /teams/statistics"""
+    played = rng.choice([rng.randint(0, 38), rng.randint(0, 38), None])
+    return {
+        'form': ''.join(rng.choice('WDL') for _ in range(rng.randint(0, 10))),
+        'league': {'rank': rng.randint(1, 20)},
+        'fixtures': {
+            'played': {'total': played},
+            'draws': {'total': rng.randint(0, played or 0)},
+        },
+        'goals': {
+            'for': {
+                'total': {'total': rng.randint(0, 80)},
+                'average': {
+                    'total': f"{rng.uniform(0.3, 3.0):.1f}",
+                    'home': f"{rng.uniform(0.3, 3.0):.1f}",
+                    'away': f"{rng.uniform(0.3, 3.0):.1f}",
+                },
+            }
+        },
+    }
+
+
+def make_h2h(rng):
+    """Gera confrontos diretos no formato de /fixtures/headtohead"""
+    return [
+        {'score': {'fulltime': {'home': rng.randint(0, 4), 'away': rng.randint(0, 4)}}}
+        for _ in range(rng.randint(0, 12))
+    ]
+
+
+def make_matches(n, seed=42):
+    """Gera N match_data aleatórios (inclui estatísticas vazias)"""
+    rng = random.Random(seed)
+    matches = []
+    for i in range(n):
+        matches.append({
+            'home_stats': make_team_stats(rng) if i % 7 else {},
+            'away_stats': make_team_stats(rng),
+            'h2h': make_h2h(rng),
+            'is_ht_0x0': rng.random() < 0.5,
+        })
+    return matches
+
+
+def test_batch_matches_scalar():
+    """Testa se o modo batch reproduz o cálculo jogo a jogo"""
+    print("=" * 60)
+    print("🧮 TESTE: calculate_probabilities_batch vs escalar")
+    print("=" * 60)
+
+    calculator = ProbabilityCalculator()
+    matches = make_matches(200)
+
+    batch_05, batch_15 = calculator.calculate_probabilities_batch(matches)
+
+    for i, match_data in enumerate(matches):
+        prob_05, prob_15 = calculator.calculate_probabilities(match_data)
+        assert abs(batch_05[i] - prob_05) < 1e-9, f"Over 0.5 diverge no jogo {i}"
+        assert abs(batch_15[i] - prob_15) < 1e-9, f"Over 1.5 diverge no jogo {i}"
+
+    print(f"   ✅ {len(matches)} jogos idênticos ao cálculo escalar")
+    return True
+
+
+def test_poisson_table():
+    """Testa a tabela de Poisson contra o cálculo exato"""
+    print("\n" + "=" * 60)
+    print("📐 TESTE: Tabela de Poisson (Over 0.5 ... 4.5)")
+    print("=" * 60)
+
+    lambdas = np.random.default_rng(1).uniform(0, 12, 5000)
+    table = POISSON_TABLE.over(lambdas)
+    exact = PoissonTable.exact_over(lambdas)
+
+    assert table.shape == (5000, 5), "Deveria retornar as 5 linhas por λ"
+    assert np.abs(table - exact).max() < 1e-6, "Interpolação fora da tolerância"
+    assert np.all(np.diff(table, axis=1) <= 0), "P(Over) deve cair com a linha"
+
+    for lam in lambdas[:100]:
+        scalar = POISSON_TABLE.over_scalar(lam)
+        assert np.allclose(scalar, PoissonTable.exact_over(lam), atol=1e-6)
+
+    assert np.isnan(POISSON_TABLE.over_scalar(float('nan'))[0]), "λ inválido deve retornar NaN"
+    print("   ✅ Tabela idêntica ao cálculo exato (< 1e-6)")
+    return True
+
+
+def test_score_matrix():
+    """Mercados da matriz de placar consistentes com Poisson"""
+    print("\n" + "=" * 60)
+    print("🎯 TESTE: Matriz de placar (todos os mercados)")
+    print("=" * 60)
+
+    matrix = ScoreMatrix(0.8, 0.6)
+    markets = matrix.markets()
+    exact = PoissonTable.exact_over(1.4) * 100
+
+    for index, line in enumerate((0.5, 1.5, 2.5, 3.5, 4.5)):
+        assert abs(markets[f"Over {line}"] - exact[index]) < 1e-6, f"Over {line} diverge do Poisson"
+        assert abs(markets[f"Over {line}"] + markets[f"Under {line}"] - 100) < 1e-9
+
+    btts = (1 - np.exp(-0.8)) * (1 - np.exp(-0.6)) * 100
+    assert abs(markets['BTTS Yes'] - btts) < 1e-6, "BTTS diverge do cálculo exato"
+
+    next_goal = markets['Next Goal Home'] + markets['Next Goal Away'] + markets['Next Goal None']
+    assert abs(next_goal - 100) < 1e-9, "Próximo gol deve somar 100%"
+
+    # Placar 1-0 no intervalo: Over 0.5 já decidido
+    assert ScoreMatrix(0.8, 0.6, current_score=(1, 0)).markets()['Over 0.5'] == 100
+
+    # Calibração pelas duas linhas do modelo: reproduzidas e linhas coerentes
+    for over_05, over_15, home_share in ((75.0, 45.0, 0.6), (92.0, 35.0, 0.5), (60.0, 58.0, 0.3), (99.0, 90.0, 0.5)):
+        calibrated = ScoreMatrix.from_over_probabilities(over_05, over_15, home_share).markets()
+        assert abs(calibrated['Over 0.5'] - over_05) < 1e-6 and abs(calibrated['Over 1.5'] - over_15) < 1e-6
+        overs = [calibrated[f"Over {line}"] for line in (0.5, 1.5, 2.5, 3.5, 4.5)]
+        assert all(a >= b for a, b in zip(overs, overs[1:])), f"Linhas incoerentes: {overs}"
+        assert calibrated['BTTS Yes'] <= over_15 + 1e-9, "BTTS exige pelo menos 2 gols"
+        assert abs(calibrated['Next Goal None'] - (100 - over_05)) < 1e-6, "Sem gol = Under 0.5"
+        assert abs(calibrated['Next Goal Home'] - over_05 * home_share) < 1e-6, "Próximo gol dividido por home_share"
+
+    print("   ✅ Over/Under, BTTS e próximo gol consistentes")
+    return True
+
+
+def test_optimizer_predict_matches_batch():
+    """Soma ponderada do otimizador reproduz calculate_probabilities_batch"""
+    print("\n" + "=" * 60)
+    print("🎛️ TESTE: Otimizador usa a mesma fórmula do caminho vetorizado")
+    print("=" * 60)
+
+    calculator = ProbabilityCalculator()
+    matches = make_matches(500, seed=11)
+    for match in matches:
+        match['is_ht_0x0'] = True
+
+    indicators = calculator.calculate_indicators_batch(matches)
+    dataset = {
+        'indicators_05': np.stack([indicators[key][0] for key in INDICATOR_KEYS]),
+        'indicators_15': np.stack([indicators[key][1] for key in INDICATOR_KEYS]),
+    }
+    prob_over_05, prob_over_15 = predict(dataset, current_candidate()[np.newaxis])
+    batch_05, batch_15 = calculator.calculate_probabilities_batch(matches)
+
+    assert np.allclose(prob_over_05[0] * 100, batch_05, atol=1e-9), "Over 0.5 diverge"
+    assert np.allclose(prob_over_15[0] * 100, batch_15, atol=1e-9), "Over 1.5 diverge"
+
+    print("   ✅ Probabilidades idênticas")
+    return True
+
+
+def test_optimizer_thresholds_out_of_sample():
+    """Limites escolhidos nos jogos antigos e avaliados nos recentes"""
+    print("\n" + "=" * 60)
+    print("🧪 TESTE: Limites do otimizador fora da amostra")
+    print("=" * 60)
+
+    calculator = ProbabilityCalculator()
+    matches = make_matches(400, seed=5)
+    for match in matches:
+        match['is_ht_0x0'] = True
+
+    rng = np.random.default_rng(5)
+    n = len(matches)
+    indicators = calculator.calculate_indicators_batch(matches)
+    over_05 = rng.random(n) < 0.8
+    dataset = {
+        'indicators_05': np.stack([indicators[key][0] for key in INDICATOR_KEYS]),
+        'indicators_15': np.stack([indicators[key][1] for key in INDICATOR_KEYS]),
+        'over_05': over_05,
+        'over_15': over_05 & (rng.random(n) < 0.6),
+        'odds_05': rng.uniform(1.10, 1.60, n),
+        'odds_15': rng.uniform(1.50, 2.80, n),
+        'timestamp': rng.permutation(n).astype(float),
+    }
+
+    train, holdout = split_by_time(dataset, 0.25)
+    assert train['over_05'].size == 300 and holdout['indicators_05'].shape == (len(INDICATOR_KEYS), 100)
+    assert train['timestamp'].max() < holdout['timestamp'].min(), "Validação deve ter os jogos mais recentes"
+
+    candidate = current_candidate()
+    thresholds = optimize_thresholds(train, candidate)
+    assert thresholds['profit'] is not None
+    assert evaluate_thresholds(train, candidate, thresholds) == {
+        'profit': thresholds['profit'], 'bets': thresholds['bets']
+    }, "Lucro dentro da amostra deve bater com a avaliação dos limites"
+    out_of_sample = evaluate_thresholds(holdout, candidate, thresholds)
+
+    # Nenhum limite atinge o mínimo de apostas: limites atuais e JSON válido
+    original, Config.OPTIMIZER_MIN_BETS = Config.OPTIMIZER_MIN_BETS, n + 1
+    try:
+        fallback = optimize_thresholds(train, candidate)
+    finally:
+        Config.OPTIMIZER_MIN_BETS = original
+    assert fallback['profit'] is None and fallback['MIN_EV_PERCENT'] == Config.MIN_EV_PERCENT
+    json.dumps(fallback, allow_nan=False)
+
+    print(
+        f"   ✅ Dentro da amostra: {thresholds['profit']:+.1f} ({thresholds['bets']} apostas), "
+        f"fora: {out_of_sample['profit']:+.1f} ({out_of_sample['bets']} apostas)"
+    )
+    return True
+
+
+def make_fixture_statistics(home_shots_on, away_shots_on, corners=0):
+    """Resposta de /fixtures/statistics (sem expected_goals)"""
+    def team(team_id, shots_on):
+        return {'team': {'id': team_id}, 'statistics': [
+            {'type': 'Shots on Goal', 'value': shots_on},
+            {'type': 'Shots off Goal', 'value': None},
+            {'type': 'Corner Kicks', 'value': corners},
+            {'type': 'Ball Possession', 'value': '50%'},
+        ]}
+    return [team(1, home_shots_on), team(2, away_shots_on)]
+
+
+def test_in_play_adjustment():
+    """Estado in-play incremental ajusta as probabilidades do HT"""
+    print("\n" + "=" * 60)
+    print("📈 TESTE: Modelo in-play incremental")
+    print("=" * 60)
+
+    assert InPlayState(1).adjust(80.0, 60.0) == (80.0, 60.0), "Sem snapshots não deve ajustar"
+
+    busy, quiet = InPlayState(1), InPlayState(2)
+    for minute, shots in ((15, 2), (30, 5), (45, 8)):
+        assert busy.update(make_fixture_statistics(shots, shots, corners=shots), minute, home_team_id=1)
+        quiet.update(make_fixture_statistics(0, 0), minute, home_team_id=1)
+
+    # Consulta repetida no intervalo não altera o estado
+    assert not busy.update(make_fixture_statistics(8, 8, corners=8), 45, home_team_id=1)
+    assert busy.snapshots == 3
+
+    assert busy.expected_goals_factor() > 1 > quiet.expected_goals_factor()
+
+    busy_05, busy_15 = busy.adjust(80.0, 60.0)
+    quiet_05, quiet_15 = quiet.adjust(80.0, 60.0)
+    assert busy_05 > 80.0 > quiet_05 and busy_15 > 60.0 > quiet_15, "Ajuste na direção errada"
+    assert 0 <= quiet_15 <= quiet_05 <= 100
+
+    print(f"   ✅ Fatores: intenso {busy.expected_goals_factor():.2f}, parado {quiet.expected_goals_factor():.2f}")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_batch_matches_scalar() and test_poisson_table() and test_score_matrix() \
+                and test_optimizer_predict_matches_batch() and test_optimizer_thresholds_out_of_sample() \
+                and test_in_play_adjustment():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Testes do token bucket e dos retries do cliente HTTP (relógio e respostas falsos)
+"""
+
+import sys
+
+from requests.structures import CaseInsensitiveDict
+
+import api_client_santo_graal
+import rate_limiter_santo_graal
+from api_client_santo_graal import APIFootballClient
+from config_santo_graal import Config
+from rate_limiter_santo_graal import TokenBucketRateLimiter
+
+
+class FakeClock:
+    """Substitui o módulo time: sleep() apenas avança o relógio"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    """Resposta HTTP mínima usada por APIFootballClient.get"""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Sessão que devolve as respostas na ordem e registra o relógio de cada chamada"""
+
+    def __init__(self, clock, responses):
+        self.clock = clock
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.calls.append(self.clock.now)
+        return self.responses.pop(0)
+
+
+def with_fake_clock(test):
+    """Executa o teste com o relógio falso nos dois módulos"""
+    def run():
+        clock = FakeClock()
+        originals = rate_limiter_santo_graal.time, api_client_santo_graal.time
+        rate_limiter_santo_graal.time = api_client_santo_graal.time = clock
+        try:
+            return test(clock)
+        finally:
+            rate_limiter_santo_graal.time, api_client_santo_graal.time = originals
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@with_fake_clock
+def test_header_correction(clock):
+    """Testa a correção do bucket pelos headers x-ratelimit-*"""
+    print("\n" + "=" * 60)
+    print("🪣 TESTE: Bucket corrigido pelos headers")
+    print("=" * 60)
+
+    limiter = TokenBucketRateLimiter(30)
+    limiter.update_from_headers(CaseInsensitiveDict({
+        'x-ratelimit-limit': '10',
+        'x-ratelimit-remaining': '4',
+        'X-RateLimit-Requests-Remaining': '500',
+    }))
+
+    assert limiter.capacity == 10 and abs(limiter.refill_rate - 10 / 60) < 1e-12, "Capacidade do plano"
+    assert limiter.tokens == 4, "Remaining da API limita os tokens"
+    assert limiter.daily_remaining == 500
+
+    # Remaining acima do local não cria tokens; header inválido é ignorado
+    limiter.update_from_headers({'X-RateLimit-Remaining': '9', 'X-RateLimit-Limit': 'abc'})
+    assert limiter.tokens == 4 and limiter.capacity == 10
+
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.sleeps == [], "Tokens disponíveis não esperam"
+
+    limiter.acquire()
+    assert abs(sum(clock.sleeps) - 6.0) < 1e-9, f"Sem tokens: esperar 60/10 s ({clock.sleeps})"
+
+    print(f"   ✅ Capacidade {limiter.capacity:.0f}/min, espera de {sum(clock.sleeps):.1f}s sem tokens")
+    return True
+
+
+@with_fake_clock
+def test_throttled(clock):
+    """Testa que uma resposta 429 esvazia o bucket"""
+    print("\n" + "=" * 60)
+    print("🛑 TESTE: 429 esvazia o bucket")
+    print("=" * 60)
+
+    limiter = TokenBucketRateLimiter(60)
+    assert limiter.tokens == 60
+
+    limiter.throttled()
+    assert limiter.tokens == 0
+
+    limiter.acquire()
+    assert abs(clock.now - 1001.0) < 1e-9, "Próximo token só após a reposição (1 s a 60/min)"
+
+    print("   ✅ Bucket vazio após 429")
+    return True
+
+
+@with_fake_clock
+def test_retry_after(clock):
+    """Testa o retry em 429 com Retry-After, cada tentativa consumindo um token"""
+    print("\n" + "=" * 60)
+    print("🔁 TESTE: Retry-After em 429")
+    print("=" * 60)
+
+    limiter = TokenBucketRateLimiter(6)  # 1 token a cada 10 s
+    acquired = []
+    original_acquire = limiter.acquire
+    limiter.acquire = lambda: (original_acquire(), acquired.append(clock.now))
+
+    client = APIFootballClient('test-key', rate_limiter=limiter)
+    throttled = [FakeResponse(429, {'Retry-After': '2'}), FakeResponse(429, {'Retry-After': '3'})]
+    client.session = FakeSession(clock, throttled + [FakeResponse(200, {'X-RateLimit-Remaining': '3'})])
+
+    response = client.get('/fixtures', {'live': 'all'})
+
+    assert response.status_code == 200
+    assert all(r.closed for r in throttled), "Respostas descartadas devem ser fechadas"
+    assert len(acquired) == 3, "Cada tentativa consome um token"
+
+    # 429 esvazia o bucket: após o Retry-After ainda espera o próximo token
+    # t=0 → 429 → Retry-After 2s → token em t=10 → 429 → Retry-After 3s → token em t=20
+    assert [round(t - 1000.0, 6) for t in client.session.calls] == [0.0, 10.0, 20.0], client.session.calls
+    assert [round(s, 6) for s in clock.sleeps] == [2.0, 8.0, 3.0, 7.0], clock.sleeps
+    assert limiter.tokens == 0
+
+    # Todas as tentativas com 429: devolve a última resposta
+    last = FakeResponse(429)
+    client.session = FakeSession(clock, [FakeResponse(429) for _ in range(Config.API_MAX_RETRIES)] + [last])
+    assert client.get('/fixtures') is last and not last.closed
+    assert len(client.session.calls) == Config.API_MAX_RETRIES + 1
+
+    print("   ✅ Retry-After respeitado e um token por tentativa")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_header_correction() and test_throttled() and test_retry_after():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Testes do agendador de HT (janelas, confirmação pré-kickoff e observe)
+"""
+
+import sys
+import time
+
+from config_santo_graal import Config
+from scheduler_santo_graal import HalftimeScheduler
+
+
+def make_fixture(fixture_id, kickoff, status='NS'):
+    """Item de /fixtures com o mínimo usado pelo agendador"""
+    return {'fixture': {'id': fixture_id, 'timestamp': int(kickoff), 'status': {'short': status}}}
+
+
+def test_windows():
+    """Testa as janelas in-play e de HT a partir do kickoff"""
+    print("\n" + "=" * 60)
+    print("🕐 TESTE: Janelas in-play e de HT")
+    print("=" * 60)
+
+    now = time.time()
+    kickoff = int(now) + 600
+    scheduler = HalftimeScheduler()
+    scheduler.update_calendar([make_fixture(1, kickoff), make_fixture(2, kickoff, status='FT')])
+
+    ht_start = kickoff + Config.HT_WINDOW_START_MINUTE * 60
+    ht_end = kickoff + Config.HT_WINDOW_END_MINUTE * 60
+    in_play_start = kickoff + Config.IN_PLAY_WINDOW_START_MINUTE * 60
+
+    assert scheduler.due_fixtures(now) == [], "Jogo não começou"
+    assert scheduler.due_fixtures(ht_start) == [1] and scheduler.due_fixtures(ht_end) == [1]
+    assert scheduler.due_fixtures(ht_end + 1) == []
+
+    # In-play: até a janela de HT abrir (sem sobreposição)
+    assert scheduler.in_play_fixtures(in_play_start) == [1]
+    assert scheduler.in_play_fixtures(ht_start - 1) == [1] and scheduler.in_play_fixtures(ht_start) == []
+
+    expected = in_play_start if Config.IN_PLAY_ENABLED and Config.IN_PLAY_POLL_LIVE_STATS else ht_start
+    assert scheduler.seconds_until_next_window(now) == expected - now, "Jogo encerrado não entra na agenda"
+
+    print("   ✅ Janelas corretas")
+    return True
+
+
+def test_confirmation():
+    """Testa a confirmação pré-kickoff, inclusive consulta que falha"""
+    print("\n" + "=" * 60)
+    print("📋 TESTE: Confirmação pré-kickoff")
+    print("=" * 60)
+
+    now = time.time()
+    kickoff = int(now) + 300
+    lead = Config.PRE_KICKOFF_CHECK_MINUTES * 60
+    retry = Config.PRE_KICKOFF_CONFIRM_RETRY
+
+    scheduler = HalftimeScheduler()
+    scheduler.update_calendar([make_fixture(1, kickoff), make_fixture(2, kickoff + 3600)])
+
+    assert scheduler.kickoffs_to_confirm(now) == [1], "Só o jogo dentro do prazo"
+    assert scheduler.seconds_until_next_confirmation(now) == 0.0
+
+    # Jogo adiado: confirmado com o novo horário
+    scheduler.confirm([1], [make_fixture(1, kickoff + 900)], now)
+    assert scheduler.kickoffs_to_confirm(now) == []
+    assert scheduler.due_fixtures(kickoff + 900 + Config.HT_WINDOW_START_MINUTE * 60) == [1]
+    assert scheduler.seconds_until_next_confirmation(now) == kickoff + 3600 - lead - now
+
+    # Consulta falhou: nova tentativa só após o intervalo, não a cada ciclo
+    scheduler = HalftimeScheduler()
+    scheduler.update_calendar([make_fixture(1, kickoff)])
+    for attempt in range(Config.PRE_KICKOFF_CONFIRM_MAX_TRIES - 1):
+        at = now + attempt * retry
+        assert scheduler.kickoffs_to_confirm(at) == [1], f"Tentativa {attempt + 1}"
+        scheduler.confirm([1], None if attempt % 2 else [], at)
+        assert scheduler.kickoffs_to_confirm(at) == []
+        assert abs(scheduler.seconds_until_next_confirmation(at) - retry) < 1e-6
+
+    # Última tentativa sem o jogo na resposta: fica com o horário do calendário
+    at = now + (Config.PRE_KICKOFF_CONFIRM_MAX_TRIES - 1) * retry
+    scheduler.confirm([1], [make_fixture(2, kickoff, status='FT')], at)
+    assert scheduler.kickoffs_to_confirm(at) == [] and scheduler.seconds_until_next_confirmation(at) is None
+    assert scheduler.due_fixtures(kickoff + Config.HT_WINDOW_START_MINUTE * 60) == [1]
+
+    print(f"   ✅ Falha repetida a cada {retry}s, no máximo {Config.PRE_KICKOFF_CONFIRM_MAX_TRIES} vezes")
+    return True
+
+
+def test_observe():
+    """Testa a atualização da agenda pelas consultas da janela"""
+    print("\n" + "=" * 60)
+    print("👀 TESTE: Status observado na janela")
+    print("=" * 60)
+
+    kickoff = int(time.time()) - Config.HT_WINDOW_START_MINUTE * 60
+    scheduler = HalftimeScheduler()
+    scheduler.update_calendar([make_fixture(1, kickoff), make_fixture(2, kickoff), make_fixture(3, kickoff)])
+    now = time.time()
+    assert sorted(scheduler.due_fixtures(now)) == [1, 2, 3]
+
+    scheduler.observe([
+        make_fixture(1, kickoff, status='HT'),
+        make_fixture(2, kickoff, status='2H'),  # Já passou do intervalo
+        make_fixture(3, kickoff + 1800, status='NS'),  # Atrasado
+    ])
+
+    assert scheduler.due_fixtures(now) == [1]
+    assert scheduler.due_fixtures(kickoff + 1800 + Config.HT_WINDOW_START_MINUTE * 60) == [3]
+
+    print("   ✅ Jogos encerrados saem e atrasados são remarcados")
+    return True
+
+
+def main():
+    """Executa testes"""
+    try:
+        if test_windows() and test_confirmation() and test_observe():
+            print("\n🎉 TODOS OS TESTES PASSARAM!")
+            return 0
+        return 1
+    except Exception as e:
+        print(f"\n❌ ERRO: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())